@@ -1,10 +1,9 @@
 """
 LEPT AI Reviewer (PH) - Main Application Entry Point
-OPTIMIZED: Single connection, cached queries, minimal reruns
+OPTIMIZED: Pooled connections, cached queries, minimal reruns
 """
 
 import streamlit as st
-from pathlib import Path
 
 # Page configuration - MUST be first Streamlit command
 st.set_page_config(
@@ -18,165 +17,39 @@ st.set_page_config(
 )
 
 # Import components - minimal imports at top level
-from components.auth import init_session_state, check_authentication, show_login_form, get_current_user, is_admin, logout_user, logout_admin
-from config.settings import COLORS, PLAN_FREE, PLAN_PRO, PLAN_PREMIUM, EMAIL_SHARING_WARNING
+from components.auth import (
+    init_session_state, check_authentication, show_login_form, is_admin, logout_user, logout_admin, set_current_page,
+    check_admin_password
+)
+from components.styles import STYLE_TAG
+from pages import get_page_renderer
+from services.usage_tracker import get_cached_user_status
+from database.pubsub import start_invalidation_listener
+from config.settings import COLORS, PLAN_COLORS, PLAN_FREE, EMAIL_SHARING_WARNING
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
-def load_css_file():
-    """Load and cache CSS file content."""
-    css_path = Path(__file__).parent / "assets" / "style.css"
-    if css_path.exists():
-        with open(css_path) as f:
-            return f.read()
-    return ""
+def load_custom_css():
+    """Load custom CSS styles - single style tag built at import, no file I/O or formatting per rerun."""
+    st.markdown(STYLE_TAG, unsafe_allow_html=True)
 
 
-def load_custom_css():
-    """Load custom CSS styles - cached CSS file + inline styles."""
-    css_content = load_css_file()
-    
-    # Combined CSS string (cached file + inline)
-    inline_css = f"""
-    /* ========== HIDE STREAMLIT DEFAULTS ========== */
-    #MainMenu {{visibility: hidden;}}
-    footer {{visibility: hidden;}}
-    header {{visibility: hidden;}}
-    
-    /* ========== HIDE SIDEBAR ========== */
-    [data-testid="stSidebar"] {{display: none !important;}}
-    
-    /* ========== DARK TECHY BACKGROUND ========== */
-    .stApp {{
-        background: linear-gradient(135deg, #0F172A 0%, #1E1B4B 50%, #0F172A 100%);
-        background-attachment: fixed;
-    }}
-    
-    .stApp::before {{
-        content: '';
-        position: fixed;
-        top: 0;
-        left: 0;
-        right: 0;
-        bottom: 0;
-        background: 
-            radial-gradient(ellipse at 20% 20%, rgba(99, 102, 241, 0.15) 0%, transparent 50%),
-            radial-gradient(ellipse at 80% 80%, rgba(6, 182, 212, 0.1) 0%, transparent 50%);
-        pointer-events: none;
-        z-index: 0;
-    }}
-    
-    .main .block-container {{
-        position: relative;
-        z-index: 1;
-        padding-top: 1rem;
-    }}
-    
-    /* ========== TYPOGRAPHY ========== */
-    h1, h2, h3, h4, h5, h6 {{color: {COLORS['text']} !important;}}
-    p, span, label {{color: {COLORS['text_muted']} !important;}}
-    
-    /* ========== BUTTONS ========== */
-    .stButton > button {{
-        border-radius: 12px !important;
-        font-weight: 600 !important;
-        transition: all 0.2s ease !important;
-    }}
-    
-    .stButton > button[data-testid="baseButton-primary"] {{
-        background: linear-gradient(135deg, {COLORS['primary']} 0%, {COLORS['accent']} 100%) !important;
-        border: none !important;
-    }}
-    
-    .stButton > button[data-testid="baseButton-secondary"] {{
-        background: {COLORS['background_light']} !important;
-        border: 1px solid {COLORS['border']} !important;
-        color: {COLORS['text']} !important;
-    }}
-    
-    /* ========== INPUTS ========== */
-    .stTextInput > div > div > input,
-    .stTextArea > div > div > textarea {{
-        background: {COLORS['background_light']} !important;
-        border: 1px solid {COLORS['border']} !important;
-        border-radius: 12px !important;
-        color: {COLORS['text']} !important;
-    }}
-    
-    .stSelectbox > div > div {{
-        background: {COLORS['background_light']} !important;
-        border: 1px solid {COLORS['border']} !important;
-        border-radius: 12px !important;
-    }}
-    
-    /* ========== FILE UPLOADER ========== */
-    .stFileUploader > div {{
-        background: {COLORS['background_light']} !important;
-        border: 2px dashed {COLORS['border']} !important;
-        border-radius: 16px !important;
-    }}
-    
-    /* ========== TABS ========== */
-    .stTabs [data-baseweb="tab-list"] {{
-        gap: 8px;
-        background: {COLORS['background_light']};
-        border-radius: 12px;
-        padding: 4px;
-    }}
-    
-    .stTabs [data-baseweb="tab"] {{
-        border-radius: 8px;
-        color: {COLORS['text_muted']} !important;
-        background: transparent;
-    }}
-    
-    .stTabs [aria-selected="true"] {{
-        background: linear-gradient(135deg, {COLORS['primary']} 0%, {COLORS['accent']} 100%) !important;
-        color: white !important;
-    }}
-    
-    /* ========== ALERTS ========== */
-    [data-testid="stAlert"] {{
-        background: {COLORS['background_light']} !important;
-        border-radius: 12px !important;
-    }}
-    
-    /* ========== FORM ========== */
-    [data-testid="stForm"] {{
-        background: {COLORS['background_light']};
-        border: 1px solid {COLORS['border']};
-        border-radius: 16px;
-        padding: 1.5rem;
-    }}
-    
-    /* ========== MOBILE RESPONSIVE ========== */
-    @media (max-width: 768px) {{
-        .main .block-container {{
-            padding-left: 1rem;
-            padding-right: 1rem;
-        }}
-    }}
-    """
-    
-    st.markdown(f"<style>{css_content}{inline_css}</style>", unsafe_allow_html=True)
+# Header nav buttons (icon, label, page key), keyed by whether admin is logged in
+_NAV_ITEMS_BASE = (
+    ("🏠", "Home", "home"),
+    ("🧠", "Practice Exam", "practice"),
+    ("📄", "Upload", "upload"),
+    ("💳", "Upgrade", "upgrade"),
+)
+_NAV_ITEMS = {
+    True: _NAV_ITEMS_BASE + (("🛠️", "Admin", "admin"),),
+    False: _NAV_ITEMS_BASE + (("🔐", "Admin", "admin_login"),),
+}
 
 
-def render_header_nav():
-    """Render the header with navigation - no DB queries."""
-    user = get_current_user()
-    if not user:
-        return
-    
-    # Get status from session state (no DB query)
-    from services.usage_tracker import get_cached_user_status
-    status = get_cached_user_status()
-    if not status:
-        from services.usage_tracker import get_user_status
-        status = get_user_status(user)
-        st.session_state.user_status = status
-    
+def render_header_nav(status: dict, admin_logged: bool):
+    """Render the header with navigation - no DB queries, status/admin flag resolved once in main."""
     user_plan = status["plan"]
-    plan_color = COLORS["accent"] if user_plan == PLAN_PREMIUM else (COLORS["primary"] if user_plan == PLAN_PRO else COLORS["text_muted"])
+    plan_color = PLAN_COLORS.get(user_plan, COLORS["text_muted"])
     
     # Header
     col1, col2, col3 = st.columns([2, 4, 2])
@@ -196,29 +69,14 @@ def render_header_nav():
         """, unsafe_allow_html=True)
     
     with col2:
-        admin_logged = is_admin()
         num_nav_items = 6 if admin_logged else 5
         nav_cols = st.columns(num_nav_items)
         
-        nav_items = [
-            ("🏠", "Home", "home"),
-            ("🧠", "Practice Exam", "practice"),
-            ("📄", "Upload", "upload"),
-            ("💳", "Upgrade", "upgrade"),
-        ]
-        
-        if admin_logged:
-            nav_items.append(("🛠️", "Admin", "admin"))
-        else:
-            nav_items.append(("🔐", "Admin", "admin_login"))
-        
-        for i, (icon, label, page_key) in enumerate(nav_items):
+        for i, (icon, label, page_key) in enumerate(_NAV_ITEMS[admin_logged]):
             with nav_cols[i]:
                 is_active = st.session_state.get("current_page") == page_key
                 btn_type = "primary" if is_active else "secondary"
-                if st.button(f"{icon} {label}", key=f"nav_{page_key}", use_container_width=True, type=btn_type):
-                    st.session_state.current_page = page_key
-                    st.rerun()
+                st.button(f"{icon} {label}", key=f"nav_{page_key}", use_container_width=True, type=btn_type, on_click=set_current_page, args=(page_key,))
     
     with col3:
         st.markdown(f"""
@@ -235,7 +93,7 @@ def render_header_nav():
         logout_cols = st.columns([3, 1])
         with logout_cols[1]:
             if st.button("🚪", key="logout_btn", help="Logout"):
-                if is_admin():
+                if admin_logged:
                     logout_admin()
                 logout_user()
     
@@ -290,8 +148,7 @@ def render_admin_login_page():
             
             if submit:
                 try:
-                    correct_password = st.secrets.get("admin", {}).get("password", "")
-                    if admin_password == correct_password and correct_password:
+                    if check_admin_password(admin_password):
                         st.session_state.is_admin = True
                         st.success("✅ Admin access granted!")
                         st.session_state.current_page = "admin"
@@ -302,9 +159,7 @@ def render_admin_login_page():
                     st.error("Admin authentication not configured.")
         
         st.markdown("<br>", unsafe_allow_html=True)
-        if st.button("← Back to Home", key="back_to_home", use_container_width=True):
-            st.session_state.current_page = "home"
-            st.rerun()
+        st.button("← Back to Home", key="back_to_home", use_container_width=True, on_click=set_current_page, args=("home",))
 
 
 def render_debug_info():
@@ -321,49 +176,58 @@ def render_debug_info():
         """, unsafe_allow_html=True)
 
 
+# ============== PAGE ROUTING ==============
+# Page modules are imported on first visit - LAZY IMPORTS keep startup light
+
+def _route_admin():
+    if is_admin():
+        get_page_renderer("admin")()
+    else:
+        render_admin_login_page()
+
+
+# Pages that need gating in app.py; everything else goes through get_page_renderer
+_ROUTES = {
+    "admin_login": render_admin_login_page,
+    "admin": _route_admin,
+}
+
+
 def main():
     """Main application entry point - OPTIMIZED."""
     # Initialize session state ONCE
     init_session_state()
     
+    # New run id - per-run memos in session state (e.g. user lookups) key off it
+    st.session_state._run_id = st.session_state.get("_run_id", 0) + 1
+    
     # Load CSS ONCE (cached)
     load_custom_css()
     
+    # Evict caches when other app processes write (started once per process)
+    start_invalidation_listener()
+    
     # Check authentication (no DB query - session state only)
     if not check_authentication():
         show_login_form()
         return
     
+    # User status and admin flag resolved once per rerun (session state) and shared with the header
+    status = get_cached_user_status()
+    admin_logged = is_admin()
+    
     # Render header navigation
-    render_header_nav()
+    render_header_nav(status, admin_logged)
     
     # Get current page from session state
     current_page = st.session_state.get("current_page", "home")
     
-    # Page routing - LAZY IMPORTS to reduce startup time
-    if current_page == "home":
-        from pages.home import render_home_page
-        render_home_page()
-    elif current_page == "upload":
-        from pages.upload_reviewer import render_upload_page
-        render_upload_page()
-    elif current_page == "practice":
-        from pages.practice_exam import render_practice_page
-        render_practice_page()
-    elif current_page == "upgrade":
-        from pages.upgrade import render_upgrade_page
-        render_upgrade_page()
-    elif current_page == "admin_login":
-        render_admin_login_page()
-    elif current_page == "admin":
-        if is_admin():
-            from pages.admin_panel import render_admin_page
-            render_admin_page()
-        else:
-            render_admin_login_page()
+    # Page routing - dict dispatch, unknown pages fall back to home
+    route = _ROUTES.get(current_page)
+    if route:
+        route()
     else:
-        from pages.home import render_home_page
-        render_home_page()
+        get_page_renderer(current_page)()
     
     # Debug info (comment out in production)
     # render_debug_info()
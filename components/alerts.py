@@ -4,6 +4,7 @@ Modern Techy Theme
 """
 
 import streamlit as st
+from components.auth import set_current_page
 from config.settings import COLORS, EMAIL_SHARING_WARNING
 
 
@@ -26,9 +27,7 @@ def show_upgrade_prompt(message: str = None):
     </div>
     """, unsafe_allow_html=True)
     
-    if st.button("💳 Upgrade Now", key="upgrade_prompt_btn", use_container_width=True, type="primary"):
-        st.session_state.current_page = "upgrade"
-        st.rerun()
+    st.button("💳 Upgrade Now", key="upgrade_prompt_btn", use_container_width=True, type="primary", on_click=set_current_page, args=("upgrade",))
 
 
 def show_success_message(title: str, message: str):
@@ -104,9 +103,7 @@ def show_premium_expired_banner():
     </div>
     """, unsafe_allow_html=True)
     
-    if st.button("💳 Renew Premium", key="renew_premium_btn", use_container_width=True, type="primary"):
-        st.session_state.current_page = "upgrade"
-        st.rerun()
+    st.button("💳 Renew Premium", key="renew_premium_btn", use_container_width=True, type="primary", on_click=set_current_page, args=("upgrade",))
 
 
 def show_document_required_message():
@@ -122,6 +119,4 @@ def show_document_required_message():
     </div>
     """, unsafe_allow_html=True)
     
-    if st.button("📄 Upload Reviewer", key="upload_redirect_btn", use_container_width=True, type="primary"):
-        st.session_state.current_page = "upload"
-        st.rerun()
+    st.button("📄 Upload Reviewer", key="upload_redirect_btn", use_container_width=True, type="primary", on_click=set_current_page, args=("upload",))
@@ -3,6 +3,9 @@ LEPT AI Reviewer - Authentication Components
 OPTIMIZED: Session state based, minimal reruns
 """
 
+import hashlib
+import hmac
+
 import streamlit as st
 
 from config.settings import EMAIL_SHARING_WARNING, COLORS
@@ -159,6 +162,21 @@ def show_login_form():
         """, unsafe_allow_html=True)
 
 
+@st.cache_resource
+def _admin_password_hash() -> bytes:
+    """Get SHA-256 digest of the configured admin password - CACHED (secrets read once)."""
+    password = st.secrets.get("admin", {}).get("password", "")
+    return hashlib.sha256(password.encode()).digest() if password else b""
+
+
+def check_admin_password(password: str) -> bool:
+    """Constant-time check of an entered password against the configured admin password."""
+    expected = _admin_password_hash()
+    if not expected:
+        return False
+    return hmac.compare_digest(hashlib.sha256(password.encode()).digest(), expected)
+
+
 def show_admin_login():
     """Display admin login form - uses form to prevent reruns."""
     st.markdown("### 🔐 Admin Access", unsafe_allow_html=True)
@@ -169,8 +187,7 @@ def show_admin_login():
         
         if submit:
             try:
-                admin_password = st.secrets.get("admin", {}).get("password", "")
-                if password == admin_password and admin_password:
+                if check_admin_password(password):
                     st.session_state.is_admin = True
                     st.success("Admin access granted!")
                     st.rerun()
@@ -206,3 +223,13 @@ def get_current_user() -> dict:
 def is_admin() -> bool:
     """Check if current session has admin access - no DB query."""
     return st.session_state.get("is_admin", False)
+
+
+def get_current_page() -> str:
+    """Get the currently selected page."""
+    return st.session_state.get("current_page", "home")
+
+
+def set_current_page(page: str):
+    """Set the current page - used as a button on_click callback so no st.rerun() is needed."""
+    st.session_state.current_page = page
@@ -3,9 +3,26 @@ LEPT AI Reviewer - Card Components
 """
 
 import streamlit as st
+from components.auth import set_current_page
 from config.settings import COLORS
 
 
+# Info card accent and background colors by card_type
+_INFO_CARD_COLORS = {
+    "info": COLORS["secondary"],
+    "warning": COLORS["warning"],
+    "success": COLORS["success"],
+    "error": COLORS["error"]
+}
+
+_INFO_CARD_BG_COLORS = {
+    "info": "#E8F5E9",
+    "warning": "#FFF3E0",
+    "success": "#E8F5E9",
+    "error": "#FFEBEE"
+}
+
+
 def render_nav_card(icon: str, title: str, description: str, page_key: str, color: str = None):
     """
     Render a navigation card button.
@@ -34,9 +51,7 @@ def render_nav_card(icon: str, title: str, description: str, page_key: str, colo
     st.markdown(card_html, unsafe_allow_html=True)
     
     # Hidden button for click handling
-    if st.button(f"Go to {title}", key=f"nav_card_{page_key}", use_container_width=True):
-        st.session_state.current_page = page_key
-        st.rerun()
+    st.button(f"Go to {title}", key=f"nav_card_{page_key}", use_container_width=True, on_click=set_current_page, args=(page_key,))
 
 
 def render_stat_card(title: str, value: str, icon: str = None, color: str = None):
@@ -109,22 +124,8 @@ def render_info_card(title: str, content: str, icon: str = "ℹ️", card_type:
         icon: Emoji icon
         card_type: Type of card (info, warning, success, error)
     """
-    colors = {
-        "info": COLORS["secondary"],
-        "warning": COLORS["warning"],
-        "success": COLORS["success"],
-        "error": COLORS["error"]
-    }
-    
-    bg_colors = {
-        "info": "#E8F5E9",
-        "warning": "#FFF3E0",
-        "success": "#E8F5E9",
-        "error": "#FFEBEE"
-    }
-    
-    color = colors.get(card_type, COLORS["secondary"])
-    bg_color = bg_colors.get(card_type, "#E8F5E9")
+    color = _INFO_CARD_COLORS.get(card_type, COLORS["secondary"])
+    bg_color = _INFO_CARD_BG_COLORS.get(card_type, "#E8F5E9")
     
     st.markdown(f"""
     <div style="background: {bg_color}; padding: 1rem; border-radius: 10px; 
@@ -5,9 +5,12 @@ Modern Techy Theme
 
 import streamlit as st
 
-from components.auth import get_current_user, is_admin, logout_user, logout_admin, show_admin_login
+from components.auth import (
+    get_current_user, is_admin, logout_user, logout_admin, show_admin_login,
+    set_current_page
+)
 from services.usage_tracker import get_user_status
-from config.settings import EMAIL_SHARING_WARNING, COLORS, PLAN_FREE, PLAN_PRO, PLAN_PREMIUM
+from config.settings import EMAIL_SHARING_WARNING, COLORS, PLAN_COLORS
 
 
 def render_sidebar():
@@ -33,12 +36,7 @@ def render_sidebar():
             # User info section
             status = get_user_status(user)
             
-            plan_colors = {
-                PLAN_FREE: COLORS["text_muted"],
-                PLAN_PRO: COLORS["primary"],
-                PLAN_PREMIUM: COLORS["accent"]
-            }
-            plan_color = plan_colors.get(status["plan"], COLORS["text_muted"])
+            plan_color = PLAN_COLORS.get(status["plan"], COLORS["text_muted"])
             
             st.markdown(f"""
             <div style="background: linear-gradient(135deg, rgba(99, 102, 241, 0.15) 0%, rgba(6, 182, 212, 0.1) 100%);
@@ -79,18 +77,14 @@ def render_sidebar():
                 is_active = st.session_state.get("current_page") == page_key
                 button_type = "primary" if is_active else "secondary"
                 
-                if st.button(f"{icon} {label}", key=f"nav_{page_key}", use_container_width=True,
-                           type=button_type):
-                    st.session_state.current_page = page_key
-                    st.rerun()
+                st.button(f"{icon} {label}", key=f"nav_{page_key}", use_container_width=True,
+                           type=button_type, on_click=set_current_page, args=(page_key,))
             
             # Admin panel (only show if admin)
             if is_admin():
                 st.markdown(f"<p style='color: {COLORS['text_muted']}; font-size: 0.75rem; letter-spacing: 1px; margin: 1.5rem 0 0.5rem 0;'>ADMIN</p>", unsafe_allow_html=True)
                 
-                if st.button("🛠️ Admin Panel", key="nav_admin", use_container_width=True):
-                    st.session_state.current_page = "admin"
-                    st.rerun()
+                st.button("🛠️ Admin Panel", key="nav_admin", use_container_width=True, on_click=set_current_page, args=("admin",))
                 
                 if st.button("🚪 Exit Admin", key="exit_admin", use_container_width=True):
                     logout_admin()
@@ -119,13 +113,3 @@ def render_sidebar():
             <p style="margin: 0;">© 2024 All rights reserved</p>
         </div>
         """, unsafe_allow_html=True)
-
-
-def get_current_page() -> str:
-    """Get the currently selected page."""
-    return st.session_state.get("current_page", "home")
-
-
-def set_current_page(page: str):
-    """Set the current page."""
-    st.session_state.current_page = page
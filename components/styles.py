@@ -0,0 +1,131 @@
+"""
+LEPT AI Reviewer - Theme Styles
+Stylesheet + inline CSS overrides, resolved once at import
+"""
+
+from pathlib import Path
+
+from config.settings import COLORS
+
+
+_CSS_PATH = Path(__file__).parent.parent / "assets" / "style.css"
+_CSS_FILE = _CSS_PATH.read_text(encoding="utf-8") if _CSS_PATH.exists() else ""
+
+
+# Theme overrides layered on top of assets/style.css, filled from COLORS
+_INLINE_CSS_TEMPLATE = """
+    /* ========== DARK TECHY BACKGROUND ========== */
+    .stApp {{
+        background: linear-gradient(135deg, #0F172A 0%, #1E1B4B 50%, #0F172A 100%);
+        background-attachment: fixed;
+    }}
+    
+    .stApp::before {{
+        content: '';
+        position: fixed;
+        top: 0;
+        left: 0;
+        right: 0;
+        bottom: 0;
+        background: 
+            radial-gradient(ellipse at 20% 20%, rgba(99, 102, 241, 0.15) 0%, transparent 50%),
+            radial-gradient(ellipse at 80% 80%, rgba(6, 182, 212, 0.1) 0%, transparent 50%);
+        pointer-events: none;
+        z-index: 0;
+    }}
+    
+    .main .block-container {{
+        position: relative;
+        z-index: 1;
+        padding-top: 1rem;
+    }}
+    
+    /* ========== TYPOGRAPHY ========== */
+    h1, h2, h3, h4, h5, h6 {{color: {text} !important;}}
+    p, span, label {{color: {text_muted} !important;}}
+    
+    /* ========== BUTTONS ========== */
+    .stButton > button {{
+        border-radius: 12px !important;
+        font-weight: 600 !important;
+        transition: all 0.2s ease !important;
+    }}
+    
+    .stButton > button[data-testid="baseButton-primary"] {{
+        background: linear-gradient(135deg, {primary} 0%, {accent} 100%) !important;
+        border: none !important;
+    }}
+    
+    .stButton > button[data-testid="baseButton-secondary"] {{
+        background: {background_light} !important;
+        border: 1px solid {border} !important;
+        color: {text} !important;
+    }}
+    
+    /* ========== INPUTS ========== */
+    .stTextInput > div > div > input,
+    .stTextArea > div > div > textarea {{
+        background: {background_light} !important;
+        border: 1px solid {border} !important;
+        border-radius: 12px !important;
+        color: {text} !important;
+    }}
+    
+    .stSelectbox > div > div {{
+        background: {background_light} !important;
+        border: 1px solid {border} !important;
+        border-radius: 12px !important;
+    }}
+    
+    /* ========== FILE UPLOADER ========== */
+    .stFileUploader > div {{
+        background: {background_light} !important;
+        border: 2px dashed {border} !important;
+        border-radius: 16px !important;
+    }}
+    
+    /* ========== TABS ========== */
+    .stTabs [data-baseweb="tab-list"] {{
+        gap: 8px;
+        background: {background_light};
+        border-radius: 12px;
+        padding: 4px;
+    }}
+    
+    .stTabs [data-baseweb="tab"] {{
+        border-radius: 8px;
+        color: {text_muted} !important;
+        background: transparent;
+    }}
+    
+    .stTabs [aria-selected="true"] {{
+        background: linear-gradient(135deg, {primary} 0%, {accent} 100%) !important;
+        color: white !important;
+    }}
+    
+    /* ========== ALERTS ========== */
+    [data-testid="stAlert"] {{
+        background: {background_light} !important;
+        border-radius: 12px !important;
+    }}
+    
+    /* ========== FORM ========== */
+    [data-testid="stForm"] {{
+        background: {background_light};
+        border: 1px solid {border};
+        border-radius: 16px;
+        padding: 1.5rem;
+    }}
+    
+    /* ========== MOBILE RESPONSIVE ========== */
+    @media (max-width: 768px) {{
+        .main .block-container {{
+            padding-left: 1rem;
+            padding-right: 1rem;
+        }}
+    }}
+"""
+
+# Built once per process - this module is imported, not re-run like app.py
+INLINE_CSS = _INLINE_CSS_TEMPLATE.format_map(COLORS)
+STYLE_TAG = f"<style>{_CSS_FILE}{INLINE_CSS}</style>"
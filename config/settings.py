@@ -12,6 +12,7 @@ APP_DESCRIPTION = "AI-Powered Reviewer for the Philippine Licensure Examination
 PLAN_FREE = "FREE"
 PLAN_PRO = "PRO"
 PLAN_PREMIUM = "PREMIUM"
+PAID_PLANS = frozenset({PLAN_PRO, PLAN_PREMIUM})
 
 # Usage Limits
 FREE_QUESTION_LIMIT = 15
@@ -97,6 +98,9 @@ DIFFICULTY_LEVELS = ["Easy", "Medium", "Hard"]
 # Questions per generation
 QUESTIONS_PER_BATCH = 5
 
+# Max characters of selected-document text included in a generation prompt
+AI_DOCUMENT_CONTEXT_CHARS = 6000
+
 # Modern Techy UI Theme Colors
 COLORS = {
     "primary": "#6366F1",        # Indigo
@@ -117,6 +121,13 @@ COLORS = {
     "glow": "rgba(99, 102, 241, 0.4)"
 }
 
+# Plan badge colors - built once at import, shared by every page
+PLAN_COLORS = {
+    PLAN_FREE: COLORS["text_muted"],
+    PLAN_PRO: COLORS["primary"],
+    PLAN_PREMIUM: COLORS["accent"]
+}
+
 # Payment Status
 PAYMENT_PENDING = "PENDING"
 PAYMENT_APPROVED = "APPROVED"
@@ -146,3 +157,4 @@ EMAIL_SHARING_WARNING = "⚠️ **DO NOT share your email address. Sharing may r
 
 # Database Configuration
 DB_TYPE = "supabase"
+DEBUG_QUERIES = False  # Count DB queries per session (Admin > Settings); adds a session_state write per query
@@ -4,9 +4,20 @@ OPTIMIZED: All SELECT queries are cached to reduce database calls
 Adapted for Supabase PostgreSQL
 """
 
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+
 import streamlit as st
-from typing import Optional, List, Dict
-from database.connection import execute_query, execute_write
+from types import MappingProxyType
+from typing import Optional, List, Dict, Mapping, Tuple, Any
+from database.connection import (
+    execute_query, execute_write, execute_returning, execute_stream
+)
+from database.write_queue import enqueue_write
+from database.pubsub import publish_invalidation, register_handler
 from config.settings import (
     PLAN_FREE, PLAN_PRO, PLAN_PREMIUM,
     FREE_QUESTION_LIMIT, PRO_QUESTION_BONUS, PREMIUM_DURATION_DAYS,
@@ -16,96 +27,244 @@ from config.settings import (
 
 # ============== CACHED SELECT QUERIES ==============
 
-@st.cache_data(ttl=60, show_spinner=False)
-def cached_get_user_by_email(email: str) -> Optional[Dict]:
-    """Get user by email - cached for 60 seconds."""
+# Per-email cache versions, part of the user cache keys. Bumping one email's
+# version invalidates only that user's entries instead of clearing the cache
+# for every user; stale entries age out via TTL.
+# email -> (version, bumped_at), oldest bump first. Once a bump is older than the
+# user caches' TTL every entry it shadowed has expired, so the email is dropped and
+# reads fall back to version 0. Versions come from one process-wide counter, so a
+# dropped email never gets back a version an unexpired entry is still keyed by.
+_user_cache_versions: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+_user_cache_versions_lock = threading.Lock()
+_user_cache_version_counter = itertools.count(1)
+_USER_CACHE_TTL_SECONDS = 60
+
+
+def _user_cache_version(email: str) -> int:
+    entry = _user_cache_versions.get(email)
+    return entry[0] if entry else 0
+
+
+def _bump_user_cache_version(email: str):
+    """Move one email to a new cache version and forget bumps whose entries have expired."""
+    now = time.monotonic()
+    with _user_cache_versions_lock:
+        _user_cache_versions[email] = (next(_user_cache_version_counter), now)
+        _user_cache_versions.move_to_end(email)
+        while _user_cache_versions:
+            _, (_, bumped_at) = next(iter(_user_cache_versions.items()))
+            if now - bumped_at <= _USER_CACHE_TTL_SECONDS:
+                break
+            _user_cache_versions.popitem(last=False)
+
+
+# Recent "no such user" results: email -> expiry. Repeated lookups of an
+# unknown email (bots, stale sessions) skip the DB for a short while.
+# Bounded; the oldest entries are evicted first.
+_missing_users: "OrderedDict[str, float]" = OrderedDict()
+_missing_users_lock = threading.Lock()
+_MISSING_USER_TTL_SECONDS = 30
+_MISSING_USERS_MAX = 10000
+
+
+def is_known_missing_user(email: str) -> bool:
+    """True if this email was looked up and not found within the last 30 seconds."""
+    with _missing_users_lock:
+        expiry = _missing_users.get(email)
+        if expiry is None:
+            return False
+        if expiry > time.monotonic():
+            return True
+        del _missing_users[email]
+        return False
+
+
+def remember_missing_user(email: str):
+    """Record a lookup miss for this email."""
+    with _missing_users_lock:
+        _missing_users[email] = time.monotonic() + _MISSING_USER_TTL_SECONDS
+        _missing_users.move_to_end(email)
+        while len(_missing_users) > _MISSING_USERS_MAX:
+            _missing_users.popitem(last=False)
+
+
+@st.cache_data(ttl=_USER_CACHE_TTL_SECONDS, show_spinner=False)
+def cached_get_user_by_email(email: str, version: int = 0) -> Optional[Dict]:
+    """Get user by email - cached for 60 seconds, keyed by the user's cache version."""
     query = """
-    SELECT email, ip_address, plan_status, questions_used_total, questions_remaining, 
+    SELECT email, ip_address, plan_status AS plan_type, questions_used_total, questions_remaining, 
            premium_expiry, is_blocked, created_at, updated_at
     FROM users 
     WHERE email = %s
     LIMIT 1
     """
-    result = execute_query(query, (email,))
-    if result and len(result) > 0:
-        row = result[0]
-        return {
-            "email": row[0],
-            "ip_address": row[1],
-            "plan_type": row[2],
-            "questions_used_total": row[3],
-            "questions_remaining": row[4],
-            "premium_expiry": row[5],
-            "is_blocked": row[6],
-            "created_at": row[7],
-            "updated_at": row[8]
-        }
-    return None
+    result = execute_query(query, (email,), dict_rows=True, prepare="get_user_by_email")
+    return result[0] if result else None
 
 
-@st.cache_data(ttl=300, show_spinner=False)
-def cached_get_admin_documents() -> List[Dict]:
-    """Get admin documents - cached for 5 minutes."""
+@st.cache_data(ttl=_USER_CACHE_TTL_SECONDS, show_spinner=False)
+def cached_get_session_bootstrap(email: str, ip_address: str, version: int = 0) -> Dict:
+    """
+    Get everything login needs in ONE round-trip - cached for 60 seconds.
+    Returns {"user": dict or None, "ip_blocked": bool, "has_pending_payment": bool}.
+    """
+    query = """
+    SELECT u.email, u.ip_address, u.plan_status AS plan_type, u.questions_used_total, 
+           u.questions_remaining, u.premium_expiry, u.is_blocked, u.created_at, u.updated_at,
+           COALESCE((SELECT is_blocked FROM ip_usage WHERE ip_address = %s), FALSE) AS ip_blocked,
+           EXISTS (SELECT 1 FROM payments WHERE email = %s AND status = %s) AS has_pending_payment
+    FROM (SELECT 1) AS one
+    LEFT JOIN users u ON u.email = %s
+    """
+    result = execute_query(query, (ip_address, email, PAYMENT_PENDING, email), dict_rows=True,
+                           prepare="get_session_bootstrap")
+    if not result:
+        return {"user": None, "ip_blocked": False, "has_pending_payment": False}
+    
+    row = result[0]
+    ip_blocked = bool(row.pop("ip_blocked"))
+    has_pending_payment = bool(row.pop("has_pending_payment"))
+    return {
+        "user": row if row["email"] else None,
+        "ip_blocked": ip_blocked,
+        "has_pending_payment": has_pending_payment
+    }
+
+
+def memo_get_user_by_email(email: str) -> Optional[Dict]:
+    """
+    Get user by email, memoized in session state for the current script run.
+    Repeat lookups in one run skip the cache_data hash + unpickle entirely.
+    """
+    key = f"_u_{email}"
+    run_id = st.session_state.get("_run_id", 0)
+    memo = st.session_state.get(key)
+    if memo is not None and memo[0] == run_id:
+        return memo[1]
+    
+    user = cached_get_user_by_email(email, _user_cache_version(email))
+    st.session_state[key] = (run_id, user)
+    return user
+
+
+def get_user_session_bootstrap(email: str, ip_address: str) -> Dict:
+    """Get the login bootstrap row for the user's current cache version."""
+    return cached_get_session_bootstrap(email, ip_address, _user_cache_version(email))
+
+
+@st.cache_resource(ttl=300, show_spinner=False)
+def cached_get_admin_documents() -> Tuple[Mapping[str, Any], ...]:
+    """
+    Get admin document metadata - cached for 5 minutes.
+    Uses cache_resource so rows are shared, not copied per hit.
+    Rows are read-only; copy a row before adding keys to it.
+    Text is not included - only a has_text flag; load it per document when needed.
+    Reserved uploads are left out until finalize_admin_document has attached their file.
+    """
     query = """
-    SELECT admin_doc_id, file_name, file_type, storage_path, text_stage_path, 
-           is_downloadable, uploaded_at, uploaded_by, category, extracted_text
+    SELECT admin_doc_id AS doc_id, file_name AS filename, file_type, storage_path, text_stage_path, 
+           is_downloadable, uploaded_at AS created_at, uploaded_by,
+           COALESCE(category, 'General') AS category,
+           (extracted_text IS NOT NULL) AS has_text
     FROM admin_documents 
-    WHERE is_deleted = FALSE
+    WHERE is_deleted = FALSE AND finalized_at IS NOT NULL
     ORDER BY uploaded_at DESC
     LIMIT 50
     """
-    result = execute_query(query)
-    docs = []
-    if result:
-        for row in result:
-            docs.append({
-                "doc_id": row[0],
-                "filename": row[1],
-                "file_type": row[2],
-                "storage_path": row[3],
-                "text_stage_path": row[4],
-                "is_downloadable": row[5],
-                "created_at": row[6],
-                "uploaded_by": row[7],
-                "category": row[8] or "General",
-                "extracted_text": row[9]
-            })
-    return docs
-
-
-@st.cache_data(ttl=120, show_spinner=False)
-def cached_get_user_documents(email: str) -> List[Dict]:
-    """Get user documents with extracted text - cached for 2 minutes."""
+    result = execute_query(query, dict_rows=True)
+    return tuple(MappingProxyType(row) for row in result or ())
+
+
+@st.cache_data(ttl=3600, max_entries=200, show_spinner=False)
+def cached_get_admin_document_text(doc_id: int, max_chars: Optional[int] = None) -> Optional[Dict]:
+    """
+    Get the extracted text of one admin document - cached for an hour, truncated server-side.
+    Admin text only changes on upload or delete, which evict this cache.
+    """
     query = """
-    SELECT doc_id, email, file_name, file_type, storage_path, text_stage_path, uploaded_at, extracted_text
+    SELECT LEFT(extracted_text, COALESCE(%s::int, 2147483647)) AS text, file_name AS filename
+    FROM admin_documents 
+    WHERE admin_doc_id = %s AND is_deleted = FALSE
+    LIMIT 1
+    """
+    result = execute_query(query, (max_chars, doc_id), dict_rows=True)
+    return result[0] if result else None
+
+
+# Admin file bytes are read in slices of this size through a server-side cursor
+_BLOB_CHUNK_BYTES = 1024 * 1024
+
+
+@st.cache_resource(ttl=300, max_entries=8, show_spinner=False)
+def cached_get_admin_document_file(doc_id: int) -> Optional[Mapping[str, Any]]:
+    """
+    Get an admin document's file for download - cached for 5 minutes, shared by all sessions.
+    Bytes are streamed in 1 MB slices instead of one whole-file result set; the
+    cache keeps at most a few files, so concurrent downloads share one copy.
+    """
+    query = """
+    SELECT substring(b.content FROM s FOR %s) AS chunk, d.file_name, d.file_type
+    FROM admin_document_blobs b
+    JOIN admin_documents d USING (admin_doc_id)
+    CROSS JOIN generate_series(1, octet_length(b.content), %s) AS s
+    WHERE b.admin_doc_id = %s AND d.is_deleted = FALSE
+    ORDER BY s
+    """
+    chunks = []
+    meta = None
+    # Drained (or closed on error) here, so the pooled connection is back before returning
+    with closing(execute_stream(query, (_BLOB_CHUNK_BYTES, _BLOB_CHUNK_BYTES, doc_id), itersize=4)) as rows:
+        for row in rows:
+            chunks.append(row["chunk"])
+            meta = row
+    if meta is None:
+        return None
+    return MappingProxyType({"content": b"".join(chunks), "filename": meta["file_name"],
+                             "file_type": meta["file_type"]})
+
+
+@st.cache_resource(ttl=120, show_spinner=False)
+def cached_get_user_documents(email: str) -> Tuple[Mapping[str, Any], ...]:
+    """
+    Get user document metadata - cached for 2 minutes.
+    Shared read-only rows without text, same as cached_get_admin_documents.
+    """
+    query = """
+    SELECT doc_id, email, file_name AS filename, file_type, storage_path, text_stage_path,
+           uploaded_at AS created_at, (extracted_text IS NOT NULL) AS has_text
     FROM user_documents 
     WHERE email = %s AND is_deleted = FALSE
     ORDER BY uploaded_at DESC
     LIMIT 20
     """
-    result = execute_query(query, (email,))
-    
-    docs = []
-    if result:
-        for row in result:
-            docs.append({
-                "doc_id": row[0],
-                "email": row[1],
-                "filename": row[2],
-                "file_type": row[3],
-                "storage_path": row[4],
-                "text_stage_path": row[5],
-                "created_at": row[6],
-                "extracted_text": row[7] if len(row) > 7 else None
-            })
-    return docs
+    result = execute_query(query, (email,), dict_rows=True)
+    return tuple(MappingProxyType(row) for row in result or ())
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def cached_get_user_document_text(doc_id: int, email: str, max_chars: Optional[int] = None) -> Optional[str]:
+    """Get the extracted text of one user document - fetched only when used, truncated server-side."""
+    query = """
+    SELECT LEFT(extracted_text, COALESCE(%s::int, 2147483647))
+    FROM user_documents 
+    WHERE doc_id = %s AND email = %s AND is_deleted = FALSE
+    LIMIT 1
+    """
+    result = execute_query(query, (max_chars, doc_id, email), prepare="get_user_document_text")
+    if result and result[0]:
+        return result[0][0]
+    return None
+
+
+# Status is inlined, not a bind param, so the prepared plan can use the
+# partial idx_payments_pending_submitted index
+_PENDING_PAYMENTS_COUNT_SQL = f"SELECT COUNT(*) FROM payments WHERE status = '{PAYMENT_PENDING}'"
 
 
 @st.cache_data(ttl=60, show_spinner=False)
 def cached_get_pending_payments_count() -> int:
     """Get count of pending payments - cached."""
-    query = "SELECT COUNT(*) FROM payments WHERE status = %s"
-    result = execute_query(query, (PAYMENT_PENDING,))
+    result = execute_query(_PENDING_PAYMENTS_COUNT_SQL, prepare="get_pending_payments_count")
     if result and result[0]:
         return result[0][0]
     return 0
@@ -115,129 +274,229 @@ def cached_get_pending_payments_count() -> int:
 def cached_is_ip_blocked(ip_address: str) -> bool:
     """Check if IP is blocked - cached for 30 seconds."""
     query = "SELECT is_blocked FROM ip_usage WHERE ip_address = %s LIMIT 1"
-    result = execute_query(query, (ip_address,))
-    if result and len(result) > 0:
+    result = execute_query(query, (ip_address,), prepare="is_ip_blocked")
+    if result:
         return bool(result[0][0])
     return False
 
 
 # ============== CACHE INVALIDATION FUNCTIONS ==============
+# Each invalidate_* evicts locally, then publishes so other app processes
+# evict too (database/pubsub.py). The _evict_* functions are the local part.
 
-def invalidate_user_cache(email: str):
-    """Invalidate user cache after updates."""
-    cached_get_user_by_email.clear()
+def _evict_user(email: str):
+    _bump_user_cache_version(email)
+    with _missing_users_lock:
+        _missing_users.pop(email, None)
+    try:
+        st.session_state.pop(f"_u_{email}", None)
+    except Exception:
+        pass
 
 
-def invalidate_admin_docs_cache():
-    """Invalidate admin documents cache after updates."""
+def _evict_admin_docs(_key=None):
     cached_get_admin_documents.clear()
+    cached_get_admin_document_file.clear()
+    cached_get_admin_document_text.clear()
 
 
-def invalidate_user_docs_cache(email: str):
-    """Invalidate user documents cache after updates."""
+def _evict_user_docs(_key=None):
     cached_get_user_documents.clear()
+    cached_get_user_document_text.clear()
 
 
-def invalidate_all_caches():
-    """Invalidate all cached queries."""
+def _evict_all(_key=None):
     cached_get_user_by_email.clear()
+    cached_get_session_bootstrap.clear()
     cached_get_admin_documents.clear()
+    cached_get_admin_document_file.clear()
+    cached_get_admin_document_text.clear()
     cached_get_user_documents.clear()
+    cached_get_user_document_text.clear()
     cached_get_pending_payments_count.clear()
     cached_is_ip_blocked.clear()
+    with _missing_users_lock:
+        _missing_users.clear()
+
+
+register_handler("user", _evict_user)
+register_handler("admin_docs", _evict_admin_docs)
+register_handler("user_docs", _evict_user_docs)
+register_handler("all", _evict_all)
+
+
+def invalidate_user_cache(email: str):
+    """Invalidate one user's cached rows after updates - other users' entries stay warm."""
+    _evict_user(email)
+    publish_invalidation("user", email)
+
+
+def invalidate_admin_docs_cache():
+    """Invalidate admin documents cache after updates."""
+    _evict_admin_docs()
+    publish_invalidation("admin_docs")
+
+
+def invalidate_user_docs_cache(email: str):
+    """Invalidate user documents cache after updates."""
+    _evict_user_docs()
+    publish_invalidation("user_docs", email)
+
+
+def invalidate_all_caches():
+    """Invalidate all cached queries."""
+    _evict_all()
+    publish_invalidation("all")
 
 
 # ============== WRITE OPERATIONS (NO CACHING) ==============
 
 def write_create_user(email: str, ip_address: str) -> Optional[str]:
-    """Create a new user."""
+    """
+    Create a new user, log the IP in history and upsert IP usage - ONE statement.
+    The foreign key on user_ip_history is checked at statement end, after the user row exists.
+    """
     query = """
-    INSERT INTO users (email, ip_address, plan_status, questions_remaining)
-    VALUES (%s, %s, %s, %s)
-    ON CONFLICT (email) DO NOTHING
+    WITH new_user AS (
+        INSERT INTO users (email, ip_address, plan_status, questions_remaining)
+        VALUES (%s, %s, %s, %s)
+        ON CONFLICT (email) DO NOTHING
+    ), ip_history AS (
+        INSERT INTO user_ip_history (email, ip_address) VALUES (%s, %s)
+        ON CONFLICT (email, ip_address) DO UPDATE SET last_seen = NOW()
+    )
+    INSERT INTO ip_usage (ip_address) VALUES (%s)
+    ON CONFLICT (ip_address) DO UPDATE SET last_seen = NOW()
     """
-    result = execute_write(query, (email, ip_address, PLAN_FREE, FREE_QUESTION_LIMIT))
+    result = execute_write(query, (email, ip_address, PLAN_FREE, FREE_QUESTION_LIMIT,
+                                   email, ip_address, ip_address))
     
     if result:
         invalidate_user_cache(email)
-        write_log_ip_history(email, ip_address)
-        write_log_ip_usage(ip_address)
     
     return email if result else None
 
 
 def write_update_user_ip(email: str, ip_address: str):
-    """Update user's IP address."""
+    """Update user's IP address and upsert the IP history row - ONE statement."""
     query = """
+    WITH ip_history AS (
+        INSERT INTO user_ip_history (email, ip_address) VALUES (%s, %s)
+        ON CONFLICT (email, ip_address) DO UPDATE SET last_seen = NOW()
+    )
     UPDATE users 
     SET ip_address = %s, updated_at = NOW()
     WHERE email = %s
     """
-    result = execute_write(query, (ip_address, email))
+    result = execute_write(query, (email, ip_address, ip_address, email), prepare="update_user_ip")
     if result:
-        write_log_ip_history(email, ip_address)
+        invalidate_user_cache(email)
     return result
 
 
-def write_decrement_questions(email: str, count: int = 1) -> bool:
-    """Decrement user's remaining questions."""
+def write_decrement_questions(email: str, count: int = 1) -> Optional[Dict]:
+    """
+    Decrement user's remaining questions - UPDATE ... RETURNING, no follow-up SELECT.
+    Returns the updated quota fields, or None if the user lacked enough questions.
+    """
     query = """
     UPDATE users 
     SET questions_remaining = questions_remaining - %s,
         questions_used_total = questions_used_total + %s,
         updated_at = NOW()
     WHERE email = %s AND questions_remaining >= %s
+    RETURNING questions_remaining, questions_used_total, plan_status AS plan_type, premium_expiry, updated_at
     """
-    result = execute_write(query, (count, count, email, count))
-    if result:
-        invalidate_user_cache(email)
-    return result
+    result = execute_returning(query, (count, count, email, count), prepare="decrement_questions")
+    if not result:
+        return None
+    return _apply_quota_update(email, result[0])
 
 
-def write_log_ip_history(email: str, ip_address: str):
-    """Log IP in user history."""
-    check_query = "SELECT id FROM user_ip_history WHERE email = %s AND ip_address = %s LIMIT 1"
-    existing = execute_query(check_query, (email, ip_address))
-    
-    if existing and len(existing) > 0:
-        update_query = """
-        UPDATE user_ip_history SET last_seen = NOW() 
-        WHERE email = %s AND ip_address = %s
-        """
-        execute_write(update_query, (email, ip_address))
-    else:
-        insert_query = "INSERT INTO user_ip_history (email, ip_address) VALUES (%s, %s)"
-        execute_write(insert_query, (email, ip_address))
-
-
-def write_log_ip_usage(ip_address: str):
-    """Log or update IP usage."""
-    check_query = "SELECT ip_address FROM ip_usage WHERE ip_address = %s LIMIT 1"
-    existing = execute_query(check_query, (ip_address,))
-    
-    if existing and len(existing) > 0:
-        update_query = "UPDATE ip_usage SET last_seen = NOW() WHERE ip_address = %s"
-        execute_write(update_query, (ip_address,))
-    else:
-        insert_query = "INSERT INTO ip_usage (ip_address) VALUES (%s)"
-        execute_write(insert_query, (ip_address,))
+def write_consume_questions(email: str, ip_address: str, count: int = 1,
+                            source_type: str = None, category: str = None, 
+                            difficulty: str = None) -> Optional[Dict]:
+    """
+    Decrement quota, bump IP usage and log the event - one statement, one transaction.
+    IP usage and the log row are only written if the decrement succeeded.
+    Returns the updated quota fields, or None if the user lacked enough questions.
+    """
+    query = """
+    WITH dec AS (
+        UPDATE users 
+        SET questions_remaining = questions_remaining - %s,
+            questions_used_total = questions_used_total + %s,
+            updated_at = NOW()
+        WHERE email = %s AND questions_remaining >= %s
+        RETURNING email, questions_remaining, questions_used_total, plan_status AS plan_type, 
+                  premium_expiry, updated_at
+    ), ip AS (
+        UPDATE ip_usage 
+        SET questions_used_total = questions_used_total + %s, last_seen = NOW()
+        WHERE ip_address = %s AND EXISTS (SELECT 1 FROM dec)
+    ), log AS (
+        INSERT INTO usage_logs (email, ip_address, questions_generated, source_type, category, difficulty)
+        SELECT email, %s::text, %s::int, %s::text, %s::text, %s::text FROM dec
+    )
+    SELECT questions_remaining, questions_used_total, plan_type, premium_expiry, updated_at FROM dec
+    """
+    params = (count, count, email, count, count, ip_address,
+              ip_address, count, source_type, category, difficulty)
+    result = execute_returning(query, params, prepare="consume_questions")
+    if not result:
+        return None
+    return _apply_quota_update(email, result[0])
+
+
+def _apply_quota_update(email: str, updated: Dict) -> Dict:
+    """Invalidate the user's caches after a quota change, keeping this run's memo current."""
+    key = f"_u_{email}"
+    memo = st.session_state.get(key)
+    invalidate_user_cache(email)
+    # Keep this run's memo warm with the returned values instead of re-selecting
+    if memo is not None and memo[1]:
+        st.session_state[key] = (memo[0], {**memo[1], **updated})
+    return updated
+
+
+def write_log_ip_history(email: str, ip_address: str) -> bool:
+    """Log IP in user history - single UPSERT, queued off the request path."""
+    query = """
+    INSERT INTO user_ip_history (email, ip_address) VALUES (%s, %s)
+    ON CONFLICT (email, ip_address) DO UPDATE SET last_seen = NOW()
+    """
+    return enqueue_write(query, (email, ip_address))
 
 
-def write_log_usage(email: str, ip_address: str, questions_generated: int, 
-                    source_type: str = None, category: str = None, difficulty: str = None):
-    """Log a usage event."""
+def write_log_ip_usage(ip_address: str) -> bool:
+    """Log or update IP usage - single UPSERT, queued off the request path."""
     query = """
-    INSERT INTO usage_logs (email, ip_address, questions_generated, source_type, category, difficulty)
-    VALUES (%s, %s, %s, %s, %s, %s)
+    INSERT INTO ip_usage (ip_address) VALUES (%s)
+    ON CONFLICT (ip_address) DO UPDATE SET last_seen = NOW()
     """
-    execute_write(query, (email, ip_address, questions_generated, source_type, category, difficulty))
+    return enqueue_write(query, (ip_address,))
+
+
+_LOG_USAGE_INSERT = """
+INSERT INTO usage_logs (email, ip_address, questions_generated, source_type, category, difficulty, notes)
+VALUES %s
+"""
+
+
+def write_log_usage(email: str, ip_address: str, questions_generated: int, 
+                    source_type: str = None, category: str = None, difficulty: str = None,
+                    notes: str = None) -> bool:
+    """Log a usage event - queued off the request path, written with other queued events as one INSERT."""
+    return enqueue_write(_LOG_USAGE_INSERT,
+                         (email, ip_address, questions_generated, source_type, category, difficulty, notes),
+                         values=True)
 
 
-def write_increment_ip_usage(ip_address: str, count: int = 1):
-    """Increment questions used by IP."""
+def write_increment_ip_usage(ip_address: str, count: int = 1) -> bool:
+    """Increment questions used by IP - queued off the request path."""
     query = """
     UPDATE ip_usage 
     SET questions_used_total = questions_used_total + %s, last_seen = NOW()
     WHERE ip_address = %s
     """
-    execute_write(query, (count, ip_address))
+    return enqueue_write(query, (count, ip_address))
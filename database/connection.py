@@ -1,14 +1,55 @@
 """
 LEPT AI Reviewer - Supabase PostgreSQL Database Connection
-OPTIMIZED: Single cached connection, reused across all queries
+OPTIMIZED: Cached connection pool, one pooled connection per statement
 """
 
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import psycopg2
 import psycopg2.extras
-from typing import Optional, List, Tuple
+import psycopg2.pool
+import psycopg2.extensions
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Optional, List, Tuple, Dict, Callable, Any, Iterator
+import re
+import uuid
+import threading
 import time
 
+from config.settings import DEBUG_QUERIES
+
+
+# Pool sizing - each Streamlit process holds at most _POOL_MAX_CONN of
+# Supabase's connection slots. Callers block on the semaphore when all
+# connections are checked out instead of getting PoolError.
+_POOL_MIN_CONN = 2
+_POOL_MAX_CONN = 10
+_pool_slots = threading.BoundedSemaphore(_POOL_MAX_CONN)
+
+# Suspect connections _checkout will test and discard before giving up
+_CHECKOUT_ATTEMPTS = 3
+
+# Fan-out for independent reads - each worker checks out its own pooled connection
+_parallel_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="db-read")
+
+# Server-side prepared statements: name -> (PREPARE sql, EXECUTE sql),
+# built on first use. Each connection PREPAREs a name once.
+_prepared_sql: Dict[str, Tuple[str, str]] = {}
+_PLACEHOLDER = re.compile(r"%s")
+
+
+class _PooledConnection(psycopg2.extensions.connection):
+    """
+    psycopg2 connection that remembers which statements it has PREPAREd, and
+    whether a failed query left it in doubt (validated before its next use).
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+        self.suspect = False
+
 
 def _increment_query_count():
     """Safely increment the query counter."""
@@ -20,138 +61,331 @@ def _increment_query_count():
         pass
 
 
+def get_connect_kwargs() -> Dict[str, Any]:
+    """Connection settings shared by the pool and dedicated connections."""
+    return dict(
+        host=st.secrets["supabase"]["host"],
+        port=st.secrets["supabase"].get("port", 5432),
+        dbname=st.secrets["supabase"]["database"],
+        user=st.secrets["supabase"]["user"],
+        password=st.secrets["supabase"]["password"],
+        sslmode="require",
+        connect_timeout=30,
+        keepalives=1,
+        keepalives_idle=60,
+        keepalives_interval=10,
+        keepalives_count=5,
+    )
+
+
 @st.cache_resource
-def get_connection():
+def get_pool():
     """
-    Create and cache a single Supabase PostgreSQL connection.
-    This connection is reused across ALL reruns and users.
+    Create and cache the Supabase PostgreSQL connection pool.
+    The pool is shared across ALL reruns and users; each statement checks
+    out its own connection, so sessions no longer queue on one socket.
+    TCP keepalives stop idle poolers/load balancers from silently dropping connections.
     """
     try:
-        conn = psycopg2.connect(
-            host=st.secrets["supabase"]["host"],
-            port=st.secrets["supabase"].get("port", 5432),
-            dbname=st.secrets["supabase"]["database"],
-            user=st.secrets["supabase"]["user"],
-            password=st.secrets["supabase"]["password"],
-            sslmode="require",
-            connect_timeout=30,
+        return psycopg2.pool.ThreadedConnectionPool(
+            _POOL_MIN_CONN,
+            _POOL_MAX_CONN,
+            connection_factory=_PooledConnection,
+            **get_connect_kwargs(),
         )
-        conn.autocommit = False
-        return conn
     except Exception as e:
         st.error(f"Failed to connect to Supabase: {str(e)}")
         return None
 
 
-def _get_valid_connection():
-    """Get a valid connection, reconnecting if needed."""
-    conn = get_connection()
-    if conn is None:
-        return None
-    try:
-        # Test if connection is still alive
-        conn.poll()
-        if conn.closed:
-            st.cache_resource.clear()
-            conn = get_connection()
-    except Exception:
+def open_dedicated_connection(connect_kwargs: Dict[str, Any] = None):
+    """
+    Open an autocommit connection outside the pool, for long-lived listeners.
+    Pass connect_kwargs captured on the script thread when calling from a
+    background thread, where st.secrets may not be reachable.
+    """
+    conn = psycopg2.connect(**(connect_kwargs or get_connect_kwargs()))
+    conn.autocommit = True
+    return conn
+
+
+@contextmanager
+def _pooled_connection():
+    """
+    Check out a connection for one unit of work and always return it.
+    Connections that raised OperationalError (or were closed) are discarded,
+    not handed to the next caller.
+    """
+    pool = get_pool()
+    if pool is None:
+        yield None
+        return
+    
+    with _pool_slots:
+        conn = _checkout(pool)
+        broken = False
         try:
-            conn.reset()
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            pool.putconn(conn, close=broken or bool(conn.closed))
+
+
+def _checkout(pool):
+    """
+    Take a connection from the pool. Healthy connections are used as-is (no
+    per-query ping); only one whose last query failed gets a SELECT 1 first.
+    A connection that fails the check is closed and the next one is checked the same way.
+    """
+    for _ in range(_CHECKOUT_ATTEMPTS):
+        conn = pool.getconn()
+        if not conn.closed and not getattr(conn, "suspect", False):
+            return conn
+        try:
+            if conn.closed:
+                raise psycopg2.InterfaceError("connection already closed")
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            conn.suspect = False
+            return conn
         except Exception:
-            st.cache_resource.clear()
-            conn = get_connection()
-    return conn
+            pool.putconn(conn, close=True)
+    raise psycopg2.OperationalError("no healthy pooled connection")
+
+
+def _rollback(conn):
+    """Roll back the current transaction; a connection that cannot roll back is marked suspect."""
+    try:
+        conn.rollback()
+    except Exception:
+        conn.suspect = True
+
 
+def _fetch_rows(cursor, dict_rows: bool) -> List:
+    """Fetch all rows, as dicts keyed by column name when dict_rows is set."""
+    rows = cursor.fetchall()
+    if not dict_rows:
+        return rows
+    columns = [col[0] for col in cursor.description]
+    return [dict(zip(columns, row)) for row in rows]
 
-def execute_query(query: str, params: tuple = None, fetch: bool = True) -> Optional[List]:
+
+def _get_prepared_sql(name: str, query: str) -> Tuple[str, str]:
+    """Get (PREPARE, EXECUTE) statements for a %s-style query - built once per name."""
+    sql = _prepared_sql.get(name)
+    if sql is None:
+        counter = iter(range(1, query.count("%s") + 1))
+        body = _PLACEHOLDER.sub(lambda _: f"${next(counter)}", query)
+        args = ", ".join(["%s"] * query.count("%s"))
+        sql = (f"PREPARE {name} AS {body}", f"EXECUTE {name}({args})" if args else f"EXECUTE {name}")
+        _prepared_sql[name] = sql
+    return sql
+
+
+def execute_query(query: str, params: tuple = None, fetch: bool = True, dict_rows: bool = False,
+                  prepare: Optional[str] = None) -> Optional[List]:
     """
-    Execute a query using the cached connection.
+    Execute a query on a pooled connection.
     
     Args:
         query: SQL query string (use %s for parameters)
         params: Query parameters (optional)
         fetch: Whether to fetch results (default True)
+        dict_rows: Return rows as dicts keyed by column name/alias (default False)
+        prepare: Run as a server-side prepared statement under this name (hot queries only)
     
     Returns:
         List of results if fetch=True, True if successful write, None on error
     """
-    _increment_query_count()
+    if DEBUG_QUERIES:
+        _increment_query_count()
+    return _execute(query, params, fetch, dict_rows, prepare=prepare)
+
+
+def execute_returning(query: str, params: tuple = None, dict_rows: bool = True,
+                      prepare: Optional[str] = None) -> Optional[List]:
+    """Execute a write with a RETURNING clause - fetches the returned rows, then commits."""
+    if DEBUG_QUERIES:
+        _increment_query_count()
+    return _execute(query, params, True, dict_rows, commit=True, prepare=prepare)
+
+
+def _execute(query: str, params: tuple, fetch: bool, dict_rows: bool = False,
+             commit: bool = False, prepare: Optional[str] = None) -> Optional[List]:
+    """
+    Run one statement on a pooled connection, retrying a read once if the connection was lost.
+    Writes are never retried - the lost connection may have committed them already.
+    """
+    attempts = 2 if fetch and not commit else 1
+    for attempt in range(attempts):
+        try:
+            with _pooled_connection() as conn:
+                if conn is None:
+                    return None
+                return _run_statement(conn, query, params, fetch, dict_rows, commit, prepare)
+        except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+            # Connection lost - it has been discarded; a read retries once on a fresh one
+            if attempt == attempts - 1:
+                print(f"Query error: {str(e)}")
+        except Exception as e:
+            print(f"Query error: {str(e)}")
+            return None
+    return None
+
+
+def _run_statement(conn, query: str, params: tuple, fetch: bool, dict_rows: bool,
+                   commit: bool, prepare: Optional[str] = None) -> Optional[List]:
+    """Execute on the given connection - rolls back and re-raises on error."""
+    start_time = time.time()
+    try:
+        with conn.cursor() as cursor:
+            if prepare:
+                prepare_sql, query = _get_prepared_sql(prepare, query)
+                if prepare not in conn.prepared:
+                    cursor.execute(prepare_sql)
+                    conn.prepared.add(prepare)
+            
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            
+            if fetch:
+                result = _fetch_rows(cursor, dict_rows)
+                if commit:
+                    conn.commit()
+            else:
+                conn.commit()
+                result = True
+    except Exception:
+        _rollback(conn)
+        raise
     
-    conn = _get_valid_connection()
-    if conn is None:
-        return None
+    elapsed = (time.time() - start_time) * 1000
+    if elapsed > 500:
+        print(f"SLOW QUERY ({elapsed:.0f}ms): {query[:100]}...")
+    
+    return result
+
+
+def execute_write(query: str, params: tuple = None, prepare: Optional[str] = None) -> bool:
+    """Execute a write query (INSERT, UPDATE, DELETE)."""
+    result = execute_query(query, params, fetch=False, prepare=prepare)
+    return result is True
+
+
+def execute_many(query: str, params_list: List[tuple], prepare: Optional[str] = None) -> bool:
+    """
+    Execute one write statement for many parameter sets in a single transaction.
+    Uses execute_batch so rows go to the server in pages, not one round-trip each.
+    With `prepare`, each page EXECUTEs a server-side prepared statement.
+    """
+    if not params_list:
+        return True
     
-    cursor = None
     try:
-        start_time = time.time()
-        cursor = conn.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        if fetch:
-            result = cursor.fetchall()
-        else:
-            conn.commit()
-            result = True
-        
-        elapsed = (time.time() - start_time) * 1000
-        if elapsed > 500:
-            print(f"SLOW QUERY ({elapsed:.0f}ms): {query[:100]}...")
-        
-        return result
-        
-    except psycopg2.OperationalError as e:
-        # Connection lost, try to reconnect once
-        try:
-            conn.rollback()
-        except Exception:
-            pass
-        st.cache_resource.clear()
-        try:
-            conn = get_connection()
-            if conn:
-                cursor = conn.cursor()
-                if params:
-                    cursor.execute(query, params)
-                else:
-                    cursor.execute(query)
-                if fetch:
-                    return cursor.fetchall()
-                else:
-                    conn.commit()
-                    return True
-        except Exception:
-            pass
-        return None
+        with _pooled_connection() as conn:
+            if conn is None:
+                return False
+            try:
+                with conn.cursor() as cursor:
+                    if prepare:
+                        prepare_sql, query = _get_prepared_sql(prepare, query)
+                        if prepare not in conn.prepared:
+                            cursor.execute(prepare_sql)
+                            conn.prepared.add(prepare)
+                    psycopg2.extras.execute_batch(cursor, query, params_list)
+                conn.commit()
+                return True
+            except Exception:
+                _rollback(conn)
+                raise
     except Exception as e:
-        try:
-            conn.rollback()
-        except Exception:
-            pass
-        print(f"Query error: {str(e)}")
-        return None
-    finally:
-        if cursor:
+        print(f"Batch write error: {str(e)}")
+        return False
+
+
+def execute_values_batch(query: str, rows: List[tuple], page_size: int = 500) -> bool:
+    """
+    Insert many rows with one multi-row INSERT per page (execute_values).
+    The query must use a single `VALUES %s` placeholder for the row list.
+    """
+    if not rows:
+        return True
+    
+    try:
+        with _pooled_connection() as conn:
+            if conn is None:
+                return False
             try:
-                cursor.close()
+                with conn.cursor() as cursor:
+                    psycopg2.extras.execute_values(cursor, query, rows, page_size=page_size)
+                conn.commit()
+                return True
             except Exception:
-                pass
+                _rollback(conn)
+                raise
+    except Exception as e:
+        print(f"Batch insert error: {str(e)}")
+        return False
 
 
-def execute_write(query: str, params: tuple = None) -> bool:
-    """Execute a write query (INSERT, UPDATE, DELETE)."""
-    result = execute_query(query, params, fetch=False)
-    return result is True
+def execute_stream(query: str, params: tuple = None, itersize: int = 2000) -> Iterator[Dict]:
+    """
+    Stream a large SELECT through a server-side (named) cursor as dict rows.
+    Only `itersize` rows are held in memory at a time; the pooled connection and
+    its pool slot stay checked out until the generator is exhausted or closed.
+    Callers must drain it within one call - wrap it in contextlib.closing, never
+    keep a suspended stream in session state or across reruns.
+    """
+    with _pooled_connection() as conn:
+        if conn is None:
+            return
+        try:
+            with conn.cursor(name=f"stream_{uuid.uuid4().hex}") as cursor:
+                cursor.itersize = itersize
+                cursor.execute(query, params)
+                columns = None
+                for row in cursor:
+                    if columns is None:
+                        columns = [col[0] for col in cursor.description]
+                    yield dict(zip(columns, row))
+        finally:
+            _rollback(conn)
+
+
+def run_parallel(*calls: Callable[[], Any]) -> List[Any]:
+    """
+    Run independent query functions concurrently, one pooled connection each.
+    Returns their results in call order - total latency is the slowest call, not the sum.
+    Workers run under the caller's ScriptRunContext, so st.cache_data wrappers and
+    session state behave as they do on the script thread.
+    """
+    if len(calls) <= 1:
+        return [call() for call in calls]
+    ctx = get_script_run_ctx()
+    futures = [_parallel_executor.submit(_run_with_ctx, call, ctx) for call in calls]
+    return [future.result() for future in futures]
+
+
+def _run_with_ctx(call: Callable[[], Any], ctx) -> Any:
+    """Run one call on a pooled worker under `ctx`, then detach it - threads are reused."""
+    thread = threading.current_thread()
+    add_script_run_ctx(thread, ctx)
+    try:
+        return call()
+    finally:
+        add_script_run_ctx(thread, None)
 
 
 def test_connection() -> Tuple[bool, str]:
     """Test the database connection."""
     try:
         result = execute_query("SELECT version()")
-        if result and len(result) > 0:
+        if result:
             return True, result[0][0]
         return False, "Connection test failed"
     except Exception as e:
@@ -159,7 +393,7 @@ def test_connection() -> Tuple[bool, str]:
 
 
 def get_query_count() -> int:
-    """Get the number of queries executed in this session (for debugging)."""
+    """Get the number of queries executed in this session (for debugging, needs DEBUG_QUERIES)."""
     try:
         return st.session_state.get("db_query_count", 0)
     except Exception:
@@ -0,0 +1,15 @@
+-- Migration: Composite (filter, sort) indexes for the per-user and pending-payment queries
+-- Run each statement on its own in Supabase SQL Editor - CREATE INDEX CONCURRENTLY
+-- cannot run inside a transaction block, but it does not lock out writes while building
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_usage_logs_email_time ON usage_logs(email, event_time DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_payments_email_submitted ON payments(email, submitted_at DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_payments_status_submitted ON payments(status, submitted_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_docs_email_uploaded ON user_documents(email, uploaded_at DESC) WHERE is_deleted = FALSE;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_admin_docs_uploaded ON admin_documents(uploaded_at DESC) WHERE is_deleted = FALSE;
+
+-- The composites lead with the same column, so the single-column indexes are redundant
+DROP INDEX CONCURRENTLY IF EXISTS idx_usage_logs_email;
+DROP INDEX CONCURRENTLY IF EXISTS idx_payments_email;
+DROP INDEX CONCURRENTLY IF EXISTS idx_payments_status;
+DROP INDEX CONCURRENTLY IF EXISTS idx_user_docs_email;
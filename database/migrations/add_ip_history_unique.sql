@@ -0,0 +1,21 @@
+-- Migration: Unique (email, ip_address) on USER_IP_HISTORY
+-- Run this in Supabase SQL Editor so IP logging can use INSERT ... ON CONFLICT
+
+-- Keep the oldest row per (email, ip_address), carrying over the latest last_seen
+UPDATE user_ip_history h
+SET last_seen = d.max_seen
+FROM (
+    SELECT MIN(id) AS keep_id, MAX(last_seen) AS max_seen
+    FROM user_ip_history
+    GROUP BY email, ip_address
+) d
+WHERE h.id = d.keep_id;
+
+DELETE FROM user_ip_history h
+USING user_ip_history dup
+WHERE h.email = dup.email
+  AND h.ip_address = dup.ip_address
+  AND h.id > dup.id;
+
+-- Add the unique index used by the UPSERT
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ip_history_email_ip ON user_ip_history(email, ip_address);
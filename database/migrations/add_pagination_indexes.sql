@@ -0,0 +1,8 @@
+-- Migration: Indexes for the admin list queries
+-- Run this in Supabase SQL Editor so keyset-paginated lists (ORDER BY ... DESC LIMIT n)
+-- read one index range instead of sorting the whole table
+
+CREATE INDEX IF NOT EXISTS idx_users_created_at ON users(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_usage_logs_event_time ON usage_logs(event_time DESC);
+CREATE INDEX IF NOT EXISTS idx_payments_submitted_at ON payments(submitted_at DESC);
+CREATE INDEX IF NOT EXISTS idx_admin_actions_time ON admin_actions(action_time DESC);
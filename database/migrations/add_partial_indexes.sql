@@ -0,0 +1,11 @@
+-- Migration: Partial index for the pending-payments queue, drop indexes duplicated by other keys
+-- Run each statement on its own in Supabase SQL Editor - CREATE/DROP INDEX CONCURRENTLY
+-- cannot run inside a transaction block, but it does not lock out writes
+
+-- Only PENDING rows are indexed, matching get_pending_payments and the pending count exactly
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_payments_pending_submitted ON payments(submitted_at) WHERE status = 'PENDING';
+DROP INDEX CONCURRENTLY IF EXISTS idx_payments_status_submitted;
+
+-- users.email is the primary key, and idx_ip_history_email_ip leads with email
+DROP INDEX CONCURRENTLY IF EXISTS idx_users_email;
+DROP INDEX CONCURRENTLY IF EXISTS idx_ip_history_email;
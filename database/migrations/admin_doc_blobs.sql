@@ -0,0 +1,15 @@
+-- Migration: Move ADMIN_DOCUMENTS.FILE_CONTENT into a separate ADMIN_DOCUMENT_BLOBS table
+-- Run after admin_doc_content_bytea.sql, before deploying the blob-table upload/download code
+
+CREATE TABLE IF NOT EXISTS admin_document_blobs (
+    admin_doc_id INTEGER PRIMARY KEY REFERENCES admin_documents(admin_doc_id) ON DELETE CASCADE,
+    content BYTEA NOT NULL
+);
+
+INSERT INTO admin_document_blobs (admin_doc_id, content)
+SELECT admin_doc_id, file_content
+FROM admin_documents
+WHERE file_content IS NOT NULL
+ON CONFLICT (admin_doc_id) DO NOTHING;
+
+ALTER TABLE admin_documents DROP COLUMN IF EXISTS file_content;
@@ -0,0 +1,6 @@
+-- Migration: Store ADMIN_DOCUMENT_BLOBS.CONTENT uncompressed so downloads can read it in slices
+-- With EXTERNAL storage, substring() fetches only the TOAST chunks it needs instead of
+-- decompressing the whole file per slice. PDF/DOCX are already compressed formats.
+-- Applies to newly written rows; existing rows keep their storage until rewritten.
+
+ALTER TABLE admin_document_blobs ALTER COLUMN content SET STORAGE EXTERNAL;
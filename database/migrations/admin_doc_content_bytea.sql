@@ -0,0 +1,6 @@
+-- Migration: Store ADMIN_DOCUMENTS.FILE_CONTENT as raw BYTEA instead of base64 TEXT
+-- Run this in Supabase SQL Editor before deploying the BYTEA-based upload/download code
+
+ALTER TABLE admin_documents
+ALTER COLUMN file_content TYPE BYTEA
+USING decode(file_content, 'base64');
@@ -0,0 +1,12 @@
+-- Migration: finalized_at on admin_documents, so reserved uploads stay unlisted until their file is attached
+-- Run each statement on its own in Supabase SQL Editor - CREATE/DROP INDEX CONCURRENTLY
+-- cannot run inside a transaction block, but it does not lock out writes
+
+ALTER TABLE admin_documents ADD COLUMN IF NOT EXISTS finalized_at TIMESTAMP;
+
+-- Existing rows were written before reserve/finalize split the upload; keep them listed
+UPDATE admin_documents SET finalized_at = uploaded_at WHERE finalized_at IS NULL;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_admin_docs_listed ON admin_documents(uploaded_at DESC)
+    WHERE is_deleted = FALSE AND finalized_at IS NOT NULL;
+DROP INDEX CONCURRENTLY IF EXISTS idx_admin_docs_uploaded;
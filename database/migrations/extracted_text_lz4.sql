@@ -0,0 +1,7 @@
+-- Migration: Compress EXTRACTED_TEXT with lz4 instead of pglz (PostgreSQL 14+)
+-- Text stays compressed in TOAST (EXTENDED storage, the default for TEXT); lz4 decompresses
+-- several times faster, which every practice-exam text load pays.
+-- Applies to newly written values; existing rows keep pglz until rewritten.
+
+ALTER TABLE user_documents ALTER COLUMN extracted_text SET COMPRESSION lz4;
+ALTER TABLE admin_documents ALTER COLUMN extracted_text SET COMPRESSION lz4;
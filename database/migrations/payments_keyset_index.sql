@@ -0,0 +1,6 @@
+-- Migration: (submitted_at, payment_id) index for keyset-paginated get_all_payments
+-- Run each statement on its own in Supabase SQL Editor - CREATE/DROP INDEX CONCURRENTLY
+-- cannot run inside a transaction block, but it does not lock out writes
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_payments_submitted_id ON payments(submitted_at DESC, payment_id DESC);
+DROP INDEX CONCURRENTLY IF EXISTS idx_payments_submitted_at;
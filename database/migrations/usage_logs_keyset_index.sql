@@ -0,0 +1,8 @@
+-- Migration: (event_time, event_id) indexes for keyset-paginated get_all_logs and get_user_logs
+-- Run each statement on its own in Supabase SQL Editor - CREATE/DROP INDEX CONCURRENTLY
+-- cannot run inside a transaction block, but it does not lock out writes
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_usage_logs_time_id ON usage_logs(event_time DESC, event_id DESC);
+DROP INDEX CONCURRENTLY IF EXISTS idx_usage_logs_event_time;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_usage_logs_email_time_id ON usage_logs(email, event_time DESC, event_id DESC);
+DROP INDEX CONCURRENTLY IF EXISTS idx_usage_logs_email_time;
@@ -0,0 +1,8 @@
+-- Migration: tiebroken keyset indexes for get_all_users and get_admin_actions
+-- Run each statement on its own in Supabase SQL Editor - CREATE/DROP INDEX CONCURRENTLY
+-- cannot run inside a transaction block, but it does not lock out writes
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_created_email ON users(created_at DESC NULLS LAST, email DESC);
+DROP INDEX CONCURRENTLY IF EXISTS idx_users_created_at;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_admin_actions_time_id ON admin_actions(action_time DESC, action_id DESC);
+DROP INDEX CONCURRENTLY IF EXISTS idx_admin_actions_time;
@@ -0,0 +1,98 @@
+"""
+LEPT AI Reviewer - Cross-Process Cache Invalidation
+OPTIMIZED: PostgreSQL LISTEN/NOTIFY so every app process evicts on writes, not just the writer
+"""
+
+import json
+import select
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Optional
+
+import streamlit as st
+
+from database.connection import open_dedicated_connection, get_connect_kwargs, execute_write
+
+
+_CHANNEL = "cache_invalidate"
+
+# Identifies this process in payloads so it skips its own notifications -
+# the writer has already evicted locally
+_ORIGIN = uuid.uuid4().hex
+
+# How long select() waits for a notification, and the pause before reconnecting
+_POLL_SECONDS = 30
+_RECONNECT_SECONDS = 5
+
+# A repeated eviction is harmless, so a failed publish is retried (writes otherwise are not)
+_PUBLISH_ATTEMPTS = 3
+
+# scope -> local eviction function taking the key (or None)
+_handlers: Dict[str, Callable[[Optional[str]], None]] = {}
+
+
+def register_handler(scope: str, handler: Callable[[Optional[str]], None]):
+    """Register the local eviction to run when another process publishes this scope."""
+    _handlers[scope] = handler
+
+
+def publish_invalidation(scope: str, key: Optional[str] = None) -> bool:
+    """
+    Tell other processes to evict a cache scope.
+    Sent as its own statement straight after the writer's commit - never queued, so
+    it is not delayed by the write-behind batch or dropped when an unrelated row fails.
+    """
+    payload = json.dumps({"scope": scope, "key": key, "origin": _ORIGIN})
+    for _ in range(_PUBLISH_ATTEMPTS):
+        if execute_write("SELECT pg_notify(%s, %s)", (_CHANNEL, payload), prepare="publish_invalidation"):
+            return True
+    print(f"Cache invalidation not published: {scope} {key or ''}")
+    return False
+
+
+def _dispatch(payload: str):
+    """Run the local eviction for one notification payload."""
+    try:
+        message = json.loads(payload)
+    except ValueError:
+        return
+    if message.get("origin") == _ORIGIN:
+        return
+    handler = _handlers.get(message.get("scope"))
+    if handler:
+        handler(message.get("key"))
+
+
+def _listen(connect_kwargs: Dict):
+    """LISTEN on a dedicated connection forever, reconnecting after errors."""
+    while True:
+        conn = None
+        try:
+            conn = open_dedicated_connection(connect_kwargs)
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {_CHANNEL}")
+            while True:
+                if select.select([conn], [], [], _POLL_SECONDS) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    _dispatch(conn.notifies.pop(0).payload)
+        except Exception as e:
+            print(f"Cache invalidation listener error: {str(e)}")
+        finally:
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+        time.sleep(_RECONNECT_SECONDS)
+
+
+@st.cache_resource
+def start_invalidation_listener() -> threading.Thread:
+    """Start the LISTEN thread once per process (secrets are read here, on the script thread)."""
+    thread = threading.Thread(target=_listen, args=(get_connect_kwargs(),),
+                              name="db-cache-listener", daemon=True)
+    thread.start()
+    return thread
@@ -5,82 +5,167 @@ Adapted for Supabase PostgreSQL
 """
 
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Mapping, Tuple
 
-from database.connection import execute_query, execute_write
+import psycopg2
+
+from database.connection import execute_query, execute_write, execute_returning, execute_many
+from database.row_types import UserRow, UsageLogRow, PaymentRow, PaymentHistoryRow, AdminActionRow
 from database.cached_queries import (
-    cached_get_user_by_email, cached_get_admin_documents, cached_get_user_documents,
+    memo_get_user_by_email, cached_get_admin_documents, cached_get_admin_document_file,
+    cached_get_admin_document_text, cached_get_user_documents,
+    cached_get_user_document_text, get_user_session_bootstrap,
     cached_is_ip_blocked, invalidate_user_cache, invalidate_admin_docs_cache, 
-    invalidate_user_docs_cache
+    invalidate_user_docs_cache, is_known_missing_user, remember_missing_user, write_decrement_questions, write_consume_questions, write_log_ip_history, write_log_ip_usage,
+    write_log_usage, write_create_user, write_increment_ip_usage,
+    write_update_user_ip
 )
 from config.settings import (
     PLAN_FREE, PLAN_PRO, PLAN_PREMIUM,
     FREE_QUESTION_LIMIT, PRO_QUESTION_BONUS, PREMIUM_DURATION_DAYS,
-    PAYMENT_PENDING, PAYMENT_APPROVED, PAYMENT_REJECTED
+    PAYMENT_PENDING, PAYMENT_APPROVED, PAYMENT_REJECTED,
+    ACTION_PLAN_CHANGED, ACTION_QUOTA_ADJUSTED, ACTION_USER_BLOCKED, ACTION_USER_UNBLOCKED
 )
 
 
+# ============== LIST SQL (built once at import) ==============
+# (first page, next page) pairs - the next-page variant adds the keyset condition
+
+_USERS_PAGE_SQL = """
+    SELECT email, ip_address, plan_status AS plan_type, questions_used_total, questions_remaining, 
+           premium_expiry, is_blocked, created_at, updated_at
+    FROM users
+    {keyset}
+    ORDER BY created_at DESC NULLS LAST, email DESC
+    LIMIT %s
+    """
+# (created_at, email) keyset - users created in the same instant are not skipped
+_Q_USERS_PAGE = (_USERS_PAGE_SQL.format(keyset=""),
+                 _USERS_PAGE_SQL.format(keyset="WHERE (created_at, email) < (%s, %s)"))
+
+_USER_LOGS_PAGE_SQL = """
+    SELECT event_id, email, ip_address, event_time, questions_generated, source_type, category, difficulty, notes
+    FROM usage_logs 
+    WHERE email = %s {keyset}
+    ORDER BY event_time DESC, event_id DESC
+    LIMIT %s
+    """
+# (event_time, event_id) keyset - a queued batch of usage rows shares one NOW()
+_Q_USER_LOGS_PAGE = (_USER_LOGS_PAGE_SQL.format(keyset=""),
+                     _USER_LOGS_PAGE_SQL.format(keyset="AND (event_time, event_id) < (%s, %s)"))
+
+_LOGS_PAGE_SQL = """
+    SELECT event_id, email, ip_address, event_time, questions_generated, source_type, category, difficulty, notes
+    FROM usage_logs
+    {keyset}
+    ORDER BY event_time DESC, event_id DESC
+    LIMIT %s
+    """
+_Q_LOGS_PAGE = (_LOGS_PAGE_SQL.format(keyset=""),
+                _LOGS_PAGE_SQL.format(keyset="WHERE (event_time, event_id) < (%s, %s)"))
+
+_PAYMENTS_PAGE_SQL = """
+    SELECT payment_id, full_name, email, gcash_ref, plan_requested, 
+           receipt_storage_path, submitted_at AS created_at, status, admin_notes, approved_at, approved_by
+    FROM payments
+    {keyset}
+    ORDER BY submitted_at DESC, payment_id DESC
+    LIMIT %s
+    """
+# (submitted_at, payment_id) keyset - payments submitted in the same instant are not skipped
+_Q_PAYMENTS_PAGE = (_PAYMENTS_PAGE_SQL.format(keyset=""),
+                    _PAYMENTS_PAGE_SQL.format(keyset="WHERE (submitted_at, payment_id) < (%s, %s)"))
+_MAX_SERIAL_ID = 2147483647
+
+_ADMIN_ACTIONS_PAGE_SQL = """
+    SELECT action_id, admin_user, action_time, action_type, details
+    FROM admin_actions
+    {keyset}
+    ORDER BY action_time DESC, action_id DESC
+    LIMIT %s
+    """
+# (action_time, action_id) keyset - actions logged in one transaction share NOW()
+_Q_ADMIN_ACTIONS_PAGE = (_ADMIN_ACTIONS_PAGE_SQL.format(keyset=""),
+                         _ADMIN_ACTIONS_PAGE_SQL.format(keyset="WHERE (action_time, action_id) < (%s, %s)"))
+
+
+# ============== ADMIN AUDIT ==============
+# Admin mutations write their admin_actions row in the same statement, so the
+# entry commits (or fails) with the change and is visible as soon as it returns.
+
+_AUDIT_CTE = """
+    , audit AS (
+        INSERT INTO admin_actions (admin_user, action_type, details, action_time)
+        SELECT %s, %s, %s, NOW() WHERE EXISTS (SELECT 1 FROM mutation)
+    )
+    """
+
+
+def _with_audit(query: str, audit: Optional[Tuple[str, str, str]]) -> str:
+    """
+    Wrap one INSERT/UPDATE/DELETE ... RETURNING so `audit` is logged if it touched a row.
+    The audit values go after the query's own params; rows are the mutation's RETURNING.
+    """
+    if audit is None:
+        return query
+    return f"WITH mutation AS ({query}) {_AUDIT_CTE} SELECT * FROM mutation"
+
+
 # ============== USER QUERIES ==============
 
 def get_user_by_email(email: str) -> Optional[Dict]:
-    """Get a user by email address - CACHED."""
-    return cached_get_user_by_email(email)
+    """Get a user by email address - CACHED, memoized per script run."""
+    return memo_get_user_by_email(email)
 
 
-def get_fresh_user_by_email(email: str) -> Optional[Dict]:
-    """Get fresh (non-cached) user data - use sparingly."""
+def get_session_bootstrap(email: str, ip_address: str) -> Dict:
+    """Get user, IP block flag and pending-payment flag in one query - CACHED."""
+    return get_user_session_bootstrap(email, ip_address)
+
+
+def get_fresh_user_by_email(email: str) -> Optional[UserRow]:
+    """Get fresh (non-cached) user data - use sparingly. Misses are remembered for 30 seconds."""
+    if is_known_missing_user(email):
+        return None
     query = """
-    SELECT email, ip_address, plan_status, questions_used_total, questions_remaining, 
+    SELECT email, ip_address, plan_status AS plan_type, questions_used_total, questions_remaining, 
            premium_expiry, is_blocked, created_at, updated_at
     FROM users 
     WHERE email = %s
     LIMIT 1
     """
-    result = execute_query(query, (email,))
-    if result and len(result) > 0:
-        row = result[0]
-        return {
-            "email": row[0],
-            "ip_address": row[1],
-            "plan_type": row[2],
-            "questions_used_total": row[3],
-            "questions_remaining": row[4],
-            "premium_expiry": row[5],
-            "is_blocked": row[6],
-            "created_at": row[7],
-            "updated_at": row[8]
-        }
+    result = execute_query(query, (email,), dict_rows=True, prepare="get_fresh_user_by_email")
+    if result:
+        return result[0]
+    if result is not None:
+        # Empty result, not a query error - safe to remember
+        remember_missing_user(email)
     return None
 
 
-def create_user(email: str, ip_address: str) -> Optional[str]:
-    """Create a new user and return the email."""
+def get_users_by_emails(emails: List[str]) -> Dict[str, UserRow]:
+    """Get many users in one query, keyed by email - for admin lists instead of per-row lookups."""
+    unique_emails = list(set(emails))
+    if not unique_emails:
+        return {}
     query = """
-    INSERT INTO users (email, ip_address, plan_status, questions_remaining)
-    VALUES (%s, %s, %s, %s)
-    ON CONFLICT (email) DO NOTHING
+    SELECT email, ip_address, plan_status AS plan_type, questions_used_total, questions_remaining, 
+           premium_expiry, is_blocked, created_at, updated_at
+    FROM users 
+    WHERE email = ANY(%s)
     """
-    result = execute_write(query, (email, ip_address, PLAN_FREE, FREE_QUESTION_LIMIT))
-    
-    if result:
-        log_ip_history(email, ip_address)
-        log_ip_usage(ip_address)
-        invalidate_user_cache(email)
-    
-    return email if result else None
+    result = execute_query(query, (unique_emails,), dict_rows=True) or []
+    return {row["email"]: row for row in result}
+
+
+def create_user(email: str, ip_address: str) -> Optional[str]:
+    """Create a new user (with IP history and IP usage rows) and return the email - one round-trip."""
+    return write_create_user(email, ip_address)
 
 
 def update_user_ip(email: str, ip_address: str):
-    """Update user's IP address and log to history."""
-    query = """
-    UPDATE users 
-    SET ip_address = %s, updated_at = NOW()
-    WHERE email = %s
-    """
-    result = execute_write(query, (ip_address, email))
-    if result:
-        log_ip_history(email, ip_address)
-    return result
+    """Update user's IP address and log to history - one round-trip."""
+    return write_update_user_ip(email, ip_address)
 
 
 def update_user_plan(email: str, plan_type: str, questions_remaining: int = None, premium_expiry: datetime = None):
@@ -99,19 +184,16 @@ def update_user_plan(email: str, plan_type: str, questions_remaining: int = None
     return result
 
 
-def decrement_user_questions(email: str, count: int = 1) -> bool:
-    """Decrement a user's remaining questions and increment total used."""
-    query = """
-    UPDATE users 
-    SET questions_remaining = questions_remaining - %s,
-        questions_used_total = questions_used_total + %s,
-        updated_at = NOW()
-    WHERE email = %s AND questions_remaining >= %s
-    """
-    result = execute_write(query, (count, count, email, count))
-    if result:
-        invalidate_user_cache(email)
-    return result
+def decrement_user_questions(email: str, count: int = 1) -> Optional[Dict]:
+    """Decrement a user's remaining questions and increment total used - returns the new quota fields."""
+    return write_decrement_questions(email, count)
+
+
+def consume_user_questions(email: str, ip_address: str, count: int = 1,
+                           source_type: str = None, category: str = None, 
+                           difficulty: str = None) -> Optional[Dict]:
+    """Decrement quota, increment IP usage and log usage in one round-trip - None if quota ran out."""
+    return write_consume_questions(email, ip_address, count, source_type, category, difficulty)
 
 
 def block_user(email: str, blocked: bool = True):
@@ -127,32 +209,25 @@ def block_user(email: str, blocked: bool = True):
     return result
 
 
-def get_all_users(limit: int = 100) -> List[Dict]:
-    """Get all users for admin panel - with limit, deduplicated by email."""
+def get_all_users(limit: int = 100, before: datetime = None, before_email: str = None) -> List[UserRow]:
+    """
+    Get one page of users for admin panel, newest first.
+    For the next page pass the last row's created_at as `before` and email as `before_email`.
+    """
+    query = _Q_USERS_PAGE[before is not None]
+    params = (before, before_email or "", limit) if before is not None else (limit,)
+    return execute_query(query, params, dict_rows=True) or []
+
+
+def get_user_plan_counts() -> Dict[str, int]:
+    """Count users per plan with one GROUP BY - for admin summary stats."""
     query = """
-    SELECT DISTINCT ON (email) email, ip_address, plan_status, questions_used_total, questions_remaining, 
-           premium_expiry, is_blocked, created_at, updated_at
+    SELECT plan_status, COUNT(*)
     FROM users
-    ORDER BY email, updated_at DESC
+    GROUP BY plan_status
     """
-    result = execute_query(query)
-    users = []
-    if result:
-        # Sort by created_at DESC after dedup and apply limit
-        sorted_result = sorted(result, key=lambda r: r[7] or datetime.min, reverse=True)[:limit]
-        for row in sorted_result:
-            users.append({
-                "email": row[0],
-                "ip_address": row[1],
-                "plan_type": row[2],
-                "questions_used_total": row[3],
-                "questions_remaining": row[4],
-                "premium_expiry": row[5],
-                "is_blocked": row[6],
-                "created_at": row[7],
-                "updated_at": row[8]
-            })
-    return users
+    result = execute_query(query) or []
+    return {plan: count for plan, count in result}
 
 
 def adjust_user_quota(email: str, new_quota: int):
@@ -168,97 +243,141 @@ def adjust_user_quota(email: str, new_quota: int):
     return result
 
 
-def delete_user(email: str) -> bool:
-    """Delete a user and all related records."""
-    execute_write("DELETE FROM user_ip_history WHERE email = %s", (email,))
-    execute_write("DELETE FROM usage_logs WHERE email = %s", (email,))
-    execute_write("DELETE FROM user_documents WHERE email = %s", (email,))
-    execute_write("DELETE FROM payments WHERE email = %s", (email,))
-    
-    query = "DELETE FROM users WHERE email = %s"
-    result = execute_write(query, (email,))
-    if result:
+def delete_user(email: str, audit: Optional[Tuple[str, str, str]] = None) -> bool:
+    """
+    Delete a user and all related records - one statement, one transaction.
+    `audit` (admin_user, action_type, details) is logged in the same statement.
+    """
+    # user_ip_history rows go via its ON DELETE CASCADE foreign key
+    query = f"""
+    WITH del_logs AS (DELETE FROM usage_logs WHERE email = %s),
+         del_docs AS (DELETE FROM user_documents WHERE email = %s),
+         del_payments AS (DELETE FROM payments WHERE email = %s),
+         mutation AS (DELETE FROM users WHERE email = %s RETURNING email)
+         {_AUDIT_CTE if audit else ""}
+    SELECT email FROM mutation
+    """
+    result = execute_returning(query, (email, email, email, email) + tuple(audit or ()), dict_rows=False)
+    if result is not None:
         invalidate_user_cache(email)
-    return result
+        invalidate_user_docs_cache(email)
+    return bool(result)
 
 
-def change_user_plan(email: str, new_plan: str, questions_remaining: int = None) -> bool:
-    """Change a user's plan with appropriate quota."""
-    premium_expiry = None
-    
-    if new_plan == PLAN_FREE:
-        if questions_remaining is None:
-            questions_remaining = FREE_QUESTION_LIMIT
-        premium_expiry = None
-    elif new_plan == PLAN_PRO:
-        if questions_remaining is None:
-            questions_remaining = PRO_QUESTION_BONUS
-        premium_expiry = None
-    elif new_plan == PLAN_PREMIUM:
-        if questions_remaining is None:
-            questions_remaining = 9999
-        premium_expiry = datetime.now() + timedelta(days=PREMIUM_DURATION_DAYS)
-    
-    query = """
+# Plan defaults live in the statement (constants inlined once at import): an explicit
+# quota wins, otherwise the plan's default; only premium gets an expiry
+_CHANGE_PLAN_SQL = f"""
     UPDATE users 
-    SET plan_status = %s, questions_remaining = %s, premium_expiry = %s, updated_at = NOW()
+    SET plan_status = %s,
+        questions_remaining = COALESCE(%s, CASE %s
+            WHEN '{PLAN_FREE}' THEN {FREE_QUESTION_LIMIT}
+            WHEN '{PLAN_PRO}' THEN {PRO_QUESTION_BONUS}
+            WHEN '{PLAN_PREMIUM}' THEN 9999
+        END),
+        premium_expiry = CASE WHEN %s = '{PLAN_PREMIUM}'
+            THEN %s::timestamp + INTERVAL '{PREMIUM_DURATION_DAYS} days' END,
+        updated_at = NOW()
     WHERE email = %s
     """
-    result = execute_write(query, (new_plan, questions_remaining, premium_expiry, email))
+
+
+def change_user_plan(email: str, new_plan: str, questions_remaining: int = None) -> bool:
+    """Change a user's plan with appropriate quota - defaults picked in SQL, one statement."""
+    # Expiry is based on app time, matching check_premium_expiry
+    result = execute_write(_CHANGE_PLAN_SQL, (new_plan, questions_remaining, new_plan, new_plan,
+                                              datetime.now(), email))
     if result:
         invalidate_user_cache(email)
     return result
 
 
+# One admin row edit: only non-NULL fields change, and its audit rows are inserted by the
+# same statement. A plan change without a quota falls back to the plan default, as above.
+_ADMIN_USER_EDIT_SQL = f"""
+    WITH upd AS (
+        UPDATE users 
+        SET plan_status = COALESCE(%s::text, plan_status),
+            questions_remaining = COALESCE(%s::int, CASE %s::text
+                WHEN '{PLAN_FREE}' THEN {FREE_QUESTION_LIMIT}
+                WHEN '{PLAN_PRO}' THEN {PRO_QUESTION_BONUS}
+                WHEN '{PLAN_PREMIUM}' THEN 9999
+            END, questions_remaining),
+            premium_expiry = CASE
+                WHEN %s::text IS NULL THEN premium_expiry
+                WHEN %s::text = '{PLAN_PREMIUM}' THEN %s::timestamp + INTERVAL '{PREMIUM_DURATION_DAYS} days'
+            END,
+            is_blocked = COALESCE(%s::boolean, is_blocked),
+            updated_at = NOW()
+        WHERE email = %s
+        RETURNING 1
+    )
+    INSERT INTO admin_actions (admin_user, action_type, details, action_time)
+    SELECT %s, a.action_type, a.details, clock_timestamp()
+    FROM unnest(%s::text[], %s::text[]) AS a(action_type, details)
+    WHERE EXISTS (SELECT 1 FROM upd)
+    """
+
+
+def apply_admin_user_edits(edits: List[Tuple[str, Optional[str], Optional[int], Optional[bool]]],
+                           admin_user: str = "admin") -> bool:
+    """
+    Apply admin grid edits - (email, plan, quota, blocked) per row, None = unchanged.
+    Each row's UPDATE and audit rows are one statement; all rows share one transaction.
+    """
+    now = datetime.now()
+    params_list = []
+    for email, plan, quota, blocked in edits:
+        actions = []
+        if plan is not None:
+            actions.append((ACTION_PLAN_CHANGED, f"Changed plan to {plan} for {email}"))
+        # An explicit quota is its own change even alongside a plan change (which would reset it)
+        if quota is not None:
+            actions.append((ACTION_QUOTA_ADJUSTED, f"Quota set to {quota} for {email}"))
+        if blocked is not None:
+            actions.append((ACTION_USER_BLOCKED, f"Blocked {email}") if blocked
+                           else (ACTION_USER_UNBLOCKED, f"Unblocked {email}"))
+        params_list.append((plan, quota, plan, plan, plan, now, blocked, email, admin_user,
+                            [action for action, _ in actions], [details for _, details in actions]))
+    
+    result = execute_many(_ADMIN_USER_EDIT_SQL, params_list, prepare="admin_user_edit")
+    if result:
+        for email, *_ in edits:
+            invalidate_user_cache(email)
+    return result
+
+
 def check_premium_expiry(email: str) -> bool:
-    """Check if premium has expired and revert to free if needed."""
-    user = get_fresh_user_by_email(email)
-    if user and user["plan_type"] == PLAN_PREMIUM:
-        if user["premium_expiry"] and user["premium_expiry"] < datetime.now():
-            update_user_plan(email, PLAN_FREE, 0, None)
-            return True
+    """Revert an expired premium plan to free - one conditional UPDATE, no row is touched if still active."""
+    # Compare against app time, matching how premium_expiry is written (datetime.now() + duration)
+    query = """
+    UPDATE users
+    SET plan_status = %s, questions_remaining = 0, premium_expiry = NULL, updated_at = NOW()
+    WHERE email = %s AND plan_status = %s AND premium_expiry < %s
+    RETURNING 1
+    """
+    result = execute_returning(query, (PLAN_FREE, email, PLAN_PREMIUM, datetime.now()), dict_rows=False,
+                               prepare="check_premium_expiry")
+    if result:
+        invalidate_user_cache(email)
+        return True
     return False
 
 
 # ============== IP TRACKING QUERIES ==============
 
-def log_ip_history(email: str, ip_address: str):
-    """Log IP address in user history."""
-    check_query = "SELECT id FROM user_ip_history WHERE email = %s AND ip_address = %s LIMIT 1"
-    existing = execute_query(check_query, (email, ip_address))
-    
-    if existing and len(existing) > 0:
-        update_query = """
-        UPDATE user_ip_history SET last_seen = NOW() 
-        WHERE email = %s AND ip_address = %s
-        """
-        execute_write(update_query, (email, ip_address))
-    else:
-        insert_query = "INSERT INTO user_ip_history (email, ip_address) VALUES (%s, %s)"
-        execute_write(insert_query, (email, ip_address))
+def log_ip_history(email: str, ip_address: str) -> bool:
+    """Log IP address in user history - single INSERT ... ON CONFLICT UPSERT."""
+    return write_log_ip_history(email, ip_address)
 
 
-def log_ip_usage(ip_address: str):
-    """Log or update IP usage."""
-    check_query = "SELECT ip_address FROM ip_usage WHERE ip_address = %s LIMIT 1"
-    existing = execute_query(check_query, (ip_address,))
-    
-    if existing and len(existing) > 0:
-        update_query = "UPDATE ip_usage SET last_seen = NOW() WHERE ip_address = %s"
-        execute_write(update_query, (ip_address,))
-    else:
-        insert_query = "INSERT INTO ip_usage (ip_address) VALUES (%s)"
-        execute_write(insert_query, (ip_address,))
+def log_ip_usage(ip_address: str) -> bool:
+    """Log or update IP usage - single INSERT ... ON CONFLICT UPSERT."""
+    return write_log_ip_usage(ip_address)
 
 
-def increment_ip_usage(ip_address: str, count: int = 1):
-    """Increment questions used by IP."""
-    query = """
-    UPDATE ip_usage 
-    SET questions_used_total = questions_used_total + %s, last_seen = NOW()
-    WHERE ip_address = %s
-    """
-    execute_write(query, (count, ip_address))
+def increment_ip_usage(ip_address: str, count: int = 1) -> bool:
+    """Increment questions used by IP - queued off the request path."""
+    return write_increment_ip_usage(ip_address, count)
 
 
 def is_ip_blocked(ip_address: str) -> bool:
@@ -270,65 +389,35 @@ def is_ip_blocked(ip_address: str) -> bool:
 
 def log_usage(email: str, ip_address: str, questions_generated: int, 
               source_type: str = None, category: str = None, difficulty: str = None, notes: str = None):
-    """Log a usage event."""
-    query = """
-    INSERT INTO usage_logs (email, ip_address, questions_generated, source_type, category, difficulty, notes)
-    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    """Log a usage event - queued and batched into multi-row INSERTs off the request path."""
+    return write_log_usage(email, ip_address, questions_generated, source_type, category, difficulty, notes)
+
+
+def get_user_logs(email: str, limit: int = 20, before: datetime = None,
+                  before_id: int = None) -> List[UsageLogRow]:
+    """
+    Get one page of usage logs for a specific user.
+    For the next page pass the last row's event_time as `before` and event_id as `before_id`.
     """
-    return execute_write(query, (email, ip_address, questions_generated, source_type, category, difficulty, notes))
+    query = _Q_USER_LOGS_PAGE[before is not None]
+    if before is not None:
+        params = (email, before, before_id if before_id is not None else _MAX_SERIAL_ID, limit)
+    else:
+        params = (email, limit)
+    return execute_query(query, params, dict_rows=True) or []
 
 
-def get_user_logs(email: str, limit: int = 20) -> List[Dict]:
-    """Get usage logs for a specific user - limited."""
-    query = """
-    SELECT event_id, email, ip_address, event_time, questions_generated, source_type, category, difficulty, notes
-    FROM usage_logs 
-    WHERE email = %s
-    ORDER BY event_time DESC
-    LIMIT %s
+def get_all_logs(limit: int = 50, before: datetime = None, before_id: int = None) -> List[UsageLogRow]:
     """
-    result = execute_query(query, (email, limit))
-    logs = []
-    if result:
-        for row in result:
-            logs.append({
-                "event_id": row[0],
-                "email": row[1],
-                "ip_address": row[2],
-                "event_time": row[3],
-                "questions_generated": row[4],
-                "source_type": row[5],
-                "category": row[6],
-                "difficulty": row[7],
-                "notes": row[8]
-            })
-    return logs
-
-
-def get_all_logs(limit: int = 50) -> List[Dict]:
-    """Get all usage logs for admin panel - limited."""
-    query = """
-    SELECT event_id, email, ip_address, event_time, questions_generated, source_type, category, difficulty, notes
-    FROM usage_logs
-    ORDER BY event_time DESC
-    LIMIT %s
+    Get one page of usage logs for admin panel.
+    For the next page pass the last row's event_time as `before` and event_id as `before_id`.
     """
-    result = execute_query(query, (limit,))
-    logs = []
-    if result:
-        for row in result:
-            logs.append({
-                "event_id": row[0],
-                "email": row[1],
-                "ip_address": row[2],
-                "event_time": row[3],
-                "questions_generated": row[4],
-                "source_type": row[5],
-                "category": row[6],
-                "difficulty": row[7],
-                "notes": row[8]
-            })
-    return logs
+    query = _Q_LOGS_PAGE[before is not None]
+    if before is not None:
+        params = (before, before_id if before_id is not None else _MAX_SERIAL_ID, limit)
+    else:
+        params = (limit,)
+    return execute_query(query, params, dict_rows=True) or []
 
 
 # ============== USER DOCUMENT QUERIES ==============
@@ -341,23 +430,24 @@ def save_user_document(email: str, filename: str, file_type: str, storage_path:
     VALUES (%s, %s, %s, %s, %s, %s)
     RETURNING doc_id
     """
-    result = execute_query(query, (email, filename, file_type, storage_path, text_hash, extracted_text), fetch=False)
-    
+    result = execute_returning(query, (email, filename, file_type, storage_path, text_hash, extracted_text),
+                               dict_rows=False)
     if result:
         invalidate_user_docs_cache(email)
-        # Get the new doc_id
-        id_query = "SELECT MAX(doc_id) FROM user_documents WHERE email = %s AND file_name = %s"
-        id_result = execute_query(id_query, (email, filename))
-        if id_result and id_result[0]:
-            return id_result[0][0]
+        return result[0][0]
     return None
 
 
-def get_user_documents(email: str) -> List[Dict]:
-    """Get all documents uploaded by a user - CACHED."""
+def get_user_documents(email: str) -> Tuple[Mapping[str, Any], ...]:
+    """Get all documents uploaded by a user - CACHED, read-only rows."""
     return cached_get_user_documents(email)
 
 
+def get_user_document_text(doc_id: int, email: str, max_chars: Optional[int] = None) -> Optional[str]:
+    """Get the extracted text of a user's document - CACHED, loaded on demand, at most max_chars."""
+    return cached_get_user_document_text(doc_id, email, max_chars)
+
+
 def delete_user_document(doc_id: int, email: str) -> bool:
     """Soft delete a user's document."""
     query = """
@@ -376,67 +466,90 @@ def save_admin_document(filename: str, file_type: str, storage_path: str,
                         is_downloadable: bool = False, uploaded_by: str = "admin", 
                         text_hash: str = None, file_content: bytes = None, 
                         extracted_text: str = None, category: str = "General") -> Optional[int]:
-    """Save an admin-uploaded reviewer document with file content."""
-    import base64
-    
-    file_content_b64 = base64.b64encode(file_content).decode('utf-8') if file_content else None
-    
+    """Save an admin-uploaded reviewer document - file bytes go to admin_document_blobs, off-row."""
     query = """
-    INSERT INTO admin_documents (file_name, file_type, storage_path, is_downloadable, 
-                                 uploaded_by, text_hash, file_content, extracted_text, category)
-    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    WITH doc AS (
+        INSERT INTO admin_documents (file_name, file_type, storage_path, is_downloadable, 
+                                     uploaded_by, text_hash, extracted_text, category, finalized_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, NOW())
+        RETURNING admin_doc_id
+    ), blob AS (
+        INSERT INTO admin_document_blobs (admin_doc_id, content)
+        SELECT doc.admin_doc_id, v.content
+        FROM doc, (VALUES (%s::bytea)) AS v(content)
+        WHERE v.content IS NOT NULL
+    )
+    SELECT admin_doc_id FROM doc
     """
-    result = execute_write(query, (filename, file_type, storage_path, is_downloadable, 
-                                   uploaded_by, text_hash, file_content_b64, extracted_text, category))
+    result = execute_returning(query, (filename, file_type, storage_path, is_downloadable, 
+                                       uploaded_by, text_hash, extracted_text, category,
+                                       psycopg2.Binary(file_content) if file_content else None),
+                               dict_rows=False)
     if result:
         invalidate_admin_docs_cache()
-        id_query = "SELECT MAX(admin_doc_id) FROM admin_documents WHERE file_name = %s"
-        id_result = execute_query(id_query, (filename,))
-        if id_result and id_result[0]:
-            return id_result[0][0]
+        return result[0][0]
     return None
 
 
-def get_admin_documents() -> List[Dict]:
-    """Get all admin reviewer documents - CACHED."""
-    return cached_get_admin_documents()
-
-
-def get_admin_document_content(doc_id: int) -> Optional[bytes]:
-    """Get the file content of an admin document for download."""
-    import base64
-    
+def reserve_admin_document(filename: str, file_type: str, storage_path: str,
+                           is_downloadable: bool = False, uploaded_by: str = "admin",
+                           category: str = "General",
+                           audit: Optional[Tuple[str, str, str]] = None) -> Optional[int]:
+    """
+    Insert an admin document's metadata only - the bytes and text follow in finalize_admin_document.
+    The row stays out of document lists (finalized_at is NULL) until then.
+    """
     query = """
-    SELECT file_content, file_name, file_type
-    FROM admin_documents 
-    WHERE admin_doc_id = %s AND is_deleted = FALSE
-    LIMIT 1
+    INSERT INTO admin_documents (file_name, file_type, storage_path, is_downloadable, uploaded_by, category)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    RETURNING admin_doc_id
     """
-    result = execute_query(query, (doc_id,))
-    if result and result[0] and result[0][0]:
-        file_content_b64 = result[0][0]
-        filename = result[0][1]
-        file_type = result[0][2]
-        try:
-            file_bytes = base64.b64decode(file_content_b64)
-            return {"content": file_bytes, "filename": filename, "file_type": file_type}
-        except Exception:
-            return None
+    result = execute_returning(_with_audit(query, audit),
+                               (filename, file_type, storage_path, is_downloadable,
+                                uploaded_by, category) + tuple(audit or ()), dict_rows=False)
+    if result:
+        invalidate_admin_docs_cache()
+        return result[0][0]
     return None
 
 
-def get_admin_document_text(doc_id: int) -> Optional[str]:
-    """Get the extracted text from an admin document."""
+def finalize_admin_document(doc_id: int, file_content: bytes = None, extracted_text: str = None) -> bool:
+    """
+    Attach the file bytes and extracted text to a reserved admin document in one statement,
+    and mark it finalized so it is listed. Safe to run off the script thread - it only
+    touches the pool and the caches.
+    """
     query = """
-    SELECT extracted_text, file_name
-    FROM admin_documents 
-    WHERE admin_doc_id = %s AND is_deleted = FALSE
-    LIMIT 1
+    WITH doc AS (
+        UPDATE admin_documents SET extracted_text = %s, finalized_at = NOW()
+        WHERE admin_doc_id = %s
+        RETURNING admin_doc_id
+    )
+    INSERT INTO admin_document_blobs (admin_doc_id, content)
+    SELECT doc.admin_doc_id, v.content
+    FROM doc, (VALUES (%s::bytea)) AS v(content)
+    WHERE v.content IS NOT NULL
     """
-    result = execute_query(query, (doc_id,))
-    if result and result[0]:
-        return {"text": result[0][0], "filename": result[0][1]}
-    return None
+    success = execute_write(query, (extracted_text, doc_id,
+                                    psycopg2.Binary(file_content) if file_content else None))
+    if success:
+        invalidate_admin_docs_cache()
+    return success
+
+
+def get_admin_documents() -> Tuple[Mapping[str, Any], ...]:
+    """Get all admin reviewer documents - CACHED, read-only rows."""
+    return cached_get_admin_documents()
+
+
+def get_admin_document_content(doc_id: int) -> Optional[Mapping[str, Any]]:
+    """Get the file content of an admin document for download - CACHED, streamed from the blob table."""
+    return cached_get_admin_document_file(doc_id)
+
+
+def get_admin_document_text(doc_id: int, max_chars: Optional[int] = None) -> Optional[Dict]:
+    """Get the extracted text from an admin document - CACHED, truncated server-side to max_chars."""
+    return cached_get_admin_document_text(doc_id, max_chars)
 
 
 def update_admin_document_downloadable(doc_id: int, is_downloadable: bool):
@@ -452,16 +565,17 @@ def update_admin_document_downloadable(doc_id: int, is_downloadable: bool):
     return result
 
 
-def delete_admin_document(doc_id: int) -> bool:
-    """Soft delete an admin document."""
+def delete_admin_document(doc_id: int, audit: Optional[Tuple[str, str, str]] = None) -> bool:
+    """Soft delete an admin document - `audit` is logged in the same statement."""
     query = """
     UPDATE admin_documents SET is_deleted = TRUE
     WHERE admin_doc_id = %s
+    RETURNING admin_doc_id
     """
-    result = execute_write(query, (doc_id,))
+    result = execute_returning(_with_audit(query, audit), (doc_id,) + tuple(audit or ()), dict_rows=False)
     if result:
         invalidate_admin_docs_cache()
-    return result
+    return bool(result)
 
 
 # ============== PAYMENT QUERIES ==============
@@ -472,150 +586,109 @@ def create_payment(email: str, full_name: str, plan_requested: str,
     query = """
     INSERT INTO payments (full_name, email, gcash_ref, plan_requested, receipt_storage_path, status)
     VALUES (%s, %s, %s, %s, %s, %s)
+    RETURNING payment_id
     """
-    result = execute_write(query, (full_name, email, gcash_ref, plan_requested, 
-                                   receipt_storage_path or '', PAYMENT_PENDING))
+    result = execute_returning(query, (full_name, email, gcash_ref, plan_requested, 
+                                       receipt_storage_path or '', PAYMENT_PENDING), dict_rows=False)
     if result:
-        id_query = "SELECT MAX(payment_id) FROM payments WHERE email = %s"
-        id_result = execute_query(id_query, (email,))
-        if id_result and id_result[0]:
-            return id_result[0][0]
+        invalidate_user_cache(email)  # session bootstrap carries the pending-payment flag
+        return result[0][0]
     return None
 
 
-def get_pending_payments() -> List[Dict]:
-    """Get all pending payment requests - limited."""
-    query = """
+def get_pending_payments() -> List[PaymentRow]:
+    """Get all pending payment requests - limited, served by the partial pending index."""
+    query = f"""
     SELECT payment_id, full_name, email, gcash_ref, plan_requested, 
-           receipt_storage_path, submitted_at, status, admin_notes
+           receipt_storage_path, submitted_at AS created_at, status, admin_notes
     FROM payments
-    WHERE status = %s
+    WHERE status = '{PAYMENT_PENDING}'
     ORDER BY submitted_at ASC
     LIMIT 50
     """
-    result = execute_query(query, (PAYMENT_PENDING,))
-    payments = []
-    if result:
-        for row in result:
-            payments.append({
-                "payment_id": row[0],
-                "full_name": row[1],
-                "email": row[2],
-                "gcash_ref": row[3],
-                "plan_requested": row[4],
-                "receipt_storage_path": row[5],
-                "created_at": row[6],
-                "status": row[7],
-                "admin_notes": row[8]
-            })
-    return payments
-
-
-def get_all_payments(limit: int = 50) -> List[Dict]:
-    """Get all payment requests for admin - limited."""
-    query = """
-    SELECT payment_id, full_name, email, gcash_ref, plan_requested, 
-           receipt_storage_path, submitted_at, status, admin_notes, approved_at, approved_by
-    FROM payments
-    ORDER BY submitted_at DESC
-    LIMIT %s
+    return execute_query(query, dict_rows=True) or []
+
+
+def get_all_payments(limit: int = 50, before: datetime = None, before_id: int = None) -> List[PaymentHistoryRow]:
     """
-    result = execute_query(query, (limit,))
-    payments = []
-    if result:
-        for row in result:
-            payments.append({
-                "payment_id": row[0],
-                "full_name": row[1],
-                "email": row[2],
-                "gcash_ref": row[3],
-                "plan_requested": row[4],
-                "receipt_storage_path": row[5],
-                "created_at": row[6],
-                "status": row[7],
-                "admin_notes": row[8],
-                "approved_at": row[9],
-                "approved_by": row[10]
-            })
-    return payments
-
-
-def get_user_payments(email: str, limit: int = 10) -> List[Dict]:
+    Get one page of payment requests for admin.
+    For the next page pass the last row's created_at as `before` and payment_id as `before_id`.
+    """
+    query = _Q_PAYMENTS_PAGE[before is not None]
+    if before is not None:
+        params = (before, before_id if before_id is not None else _MAX_SERIAL_ID, limit)
+    else:
+        params = (limit,)
+    return execute_query(query, params, dict_rows=True) or []
+
+
+def get_user_payments(email: str, limit: int = 10) -> List[PaymentRow]:
     """Get all payments for a specific user - limited."""
     query = """
     SELECT payment_id, full_name, email, gcash_ref, plan_requested, 
-           receipt_storage_path, submitted_at, status, admin_notes
+           receipt_storage_path, submitted_at AS created_at, status, admin_notes
     FROM payments 
     WHERE email = %s
     ORDER BY submitted_at DESC
     LIMIT %s
     """
-    result = execute_query(query, (email, limit))
-    payments = []
-    if result:
-        for row in result:
-            payments.append({
-                "payment_id": row[0],
-                "full_name": row[1],
-                "email": row[2],
-                "gcash_ref": row[3],
-                "plan_requested": row[4],
-                "receipt_storage_path": row[5],
-                "created_at": row[6],
-                "status": row[7],
-                "admin_notes": row[8]
-            })
-    return payments
-
-
-def approve_payment(payment_id: int, admin_notes: str = None, approved_by: str = "admin"):
-    """Approve a payment request."""
-    query = """
-    UPDATE payments 
-    SET status = %s, admin_notes = %s, approved_at = NOW(), approved_by = %s
-    WHERE payment_id = %s
-    """
-    return execute_write(query, (PAYMENT_APPROVED, admin_notes, approved_by, payment_id))
+    return execute_query(query, (email, limit), dict_rows=True) or []
 
 
-def reject_payment(payment_id: int, admin_notes: str = None, approved_by: str = "admin"):
-    """Reject a payment request."""
-    query = """
+# Decides a payment; RETURNING email names the user whose cached session bootstrap
+# (has_pending_payment, plan) must be evicted once the status has flipped
+_DECIDE_PAYMENT_SQL = """
     UPDATE payments 
     SET status = %s, admin_notes = %s, approved_at = NOW(), approved_by = %s
     WHERE payment_id = %s
+    RETURNING email
     """
-    return execute_write(query, (PAYMENT_REJECTED, admin_notes, approved_by, payment_id))
+
+
+def _evict_payment_user(result: Optional[List]) -> bool:
+    """After a payment decision - drop the requester's cached user rows; False if no payment matched."""
+    for (email,) in result or ():
+        invalidate_user_cache(email)
+    return bool(result)
+
+
+def approve_payment(payment_id: int, admin_notes: str = None, approved_by: str = "admin",
+                    audit: Optional[Tuple[str, str, str]] = None) -> bool:
+    """Approve a payment request - `audit` is logged in the same statement."""
+    result = execute_returning(_with_audit(_DECIDE_PAYMENT_SQL, audit),
+                               (PAYMENT_APPROVED, admin_notes, approved_by, payment_id) + tuple(audit or ()),
+                               dict_rows=False)
+    return _evict_payment_user(result)
+
+
+def reject_payment(payment_id: int, admin_notes: str = None, approved_by: str = "admin",
+                   audit: Optional[Tuple[str, str, str]] = None) -> bool:
+    """Reject a payment request - `audit` is logged in the same statement."""
+    result = execute_returning(_with_audit(_DECIDE_PAYMENT_SQL, audit),
+                               (PAYMENT_REJECTED, admin_notes, approved_by, payment_id) + tuple(audit or ()),
+                               dict_rows=False)
+    return _evict_payment_user(result)
 
 
 # ============== ADMIN ACTION QUERIES ==============
 
-def log_admin_action(admin_user: str, action_type: str, details: str = None):
-    """Log an admin action."""
+def log_admin_action(admin_user: str, action_type: str, details: str = None) -> bool:
+    """Log a standalone admin action - written before returning, so a re-read sees it."""
     query = """
-    INSERT INTO admin_actions (admin_user, action_type, details)
-    VALUES (%s, %s, %s)
+    INSERT INTO admin_actions (admin_user, action_type, details, action_time)
+    VALUES (%s, %s, %s, NOW())
     """
     return execute_write(query, (admin_user, action_type, details))
 
 
-def get_admin_actions(limit: int = 50) -> List[Dict]:
-    """Get admin actions for audit log - limited."""
-    query = """
-    SELECT action_id, admin_user, action_time, action_type, details
-    FROM admin_actions
-    ORDER BY action_time DESC
-    LIMIT %s
+def get_admin_actions(limit: int = 50, before: datetime = None, before_id: int = None) -> List[AdminActionRow]:
     """
-    result = execute_query(query, (limit,))
-    actions = []
-    if result:
-        for row in result:
-            actions.append({
-                "action_id": row[0],
-                "admin_user": row[1],
-                "action_time": row[2],
-                "action_type": row[3],
-                "details": row[4]
-            })
-    return actions
+    Get one page of admin actions for audit log.
+    For the next page pass the last row's action_time as `before` and action_id as `before_id`.
+    """
+    query = _Q_ADMIN_ACTIONS_PAGE[before is not None]
+    if before is not None:
+        params = (before, before_id if before_id is not None else _MAX_SERIAL_ID, limit)
+    else:
+        params = (limit,)
+    return execute_query(query, params, dict_rows=True) or []
@@ -0,0 +1,56 @@
+"""
+LEPT AI Reviewer - Row Shapes
+Typed dict rows returned by the list and lookup queries (dict_rows=True)
+"""
+
+from datetime import datetime
+from typing import Optional, TypedDict
+
+
+class UserRow(TypedDict):
+    email: str
+    ip_address: Optional[str]
+    plan_type: str
+    questions_used_total: int
+    questions_remaining: int
+    premium_expiry: Optional[datetime]
+    is_blocked: bool
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+
+class UsageLogRow(TypedDict):
+    event_id: int
+    email: str
+    ip_address: Optional[str]
+    event_time: datetime
+    questions_generated: int
+    source_type: Optional[str]
+    category: Optional[str]
+    difficulty: Optional[str]
+    notes: Optional[str]
+
+
+class PaymentRow(TypedDict):
+    payment_id: int
+    full_name: str
+    email: str
+    gcash_ref: str
+    plan_requested: str
+    receipt_storage_path: Optional[str]
+    created_at: datetime
+    status: str
+    admin_notes: Optional[str]
+
+
+class PaymentHistoryRow(PaymentRow):
+    approved_at: Optional[datetime]
+    approved_by: Optional[str]
+
+
+class AdminActionRow(TypedDict):
+    action_id: int
+    admin_user: str
+    action_time: datetime
+    action_type: str
+    details: Optional[str]
@@ -56,7 +56,7 @@ CREATE TABLE IF NOT EXISTS user_documents (
     storage_path VARCHAR(1000),
     text_stage_path VARCHAR(1000),
     text_hash VARCHAR(64),
-    extracted_text TEXT,
+    extracted_text TEXT COMPRESSION lz4,
     is_deleted BOOLEAN DEFAULT FALSE,
     uploaded_at TIMESTAMP DEFAULT NOW()
 );
@@ -71,12 +71,20 @@ CREATE TABLE IF NOT EXISTS admin_documents (
     is_downloadable BOOLEAN DEFAULT FALSE,
     uploaded_by VARCHAR(255) DEFAULT 'admin',
     text_hash VARCHAR(64),
-    file_content TEXT,
-    extracted_text TEXT,
+    extracted_text TEXT COMPRESSION lz4,
     category VARCHAR(100) DEFAULT 'General',
     is_deleted BOOLEAN DEFAULT FALSE,
-    uploaded_at TIMESTAMP DEFAULT NOW()
+    uploaded_at TIMESTAMP DEFAULT NOW(),
+    finalized_at TIMESTAMP
+);
+
+-- 6b. ADMIN_DOCUMENT_BLOBS table (file bytes kept off the metadata row)
+CREATE TABLE IF NOT EXISTS admin_document_blobs (
+    admin_doc_id INTEGER PRIMARY KEY REFERENCES admin_documents(admin_doc_id) ON DELETE CASCADE,
+    content BYTEA NOT NULL
 );
+-- PDF/DOCX are already compressed; uncompressed TOAST lets substring() read one slice
+ALTER TABLE admin_document_blobs ALTER COLUMN content SET STORAGE EXTERNAL;
 
 -- 7. PAYMENTS table
 CREATE TABLE IF NOT EXISTS payments (
@@ -103,9 +111,13 @@ CREATE TABLE IF NOT EXISTS admin_actions (
 );
 
 -- Indexes for common queries
-CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
-CREATE INDEX IF NOT EXISTS idx_user_docs_email ON user_documents(email);
-CREATE INDEX IF NOT EXISTS idx_usage_logs_email ON usage_logs(email);
-CREATE INDEX IF NOT EXISTS idx_payments_email ON payments(email);
-CREATE INDEX IF NOT EXISTS idx_payments_status ON payments(status);
-CREATE INDEX IF NOT EXISTS idx_ip_history_email ON user_ip_history(email);
+CREATE INDEX IF NOT EXISTS idx_user_docs_email_uploaded ON user_documents(email, uploaded_at DESC) WHERE is_deleted = FALSE;
+CREATE INDEX IF NOT EXISTS idx_admin_docs_listed ON admin_documents(uploaded_at DESC) WHERE is_deleted = FALSE AND finalized_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_usage_logs_email_time_id ON usage_logs(email, event_time DESC, event_id DESC);
+CREATE INDEX IF NOT EXISTS idx_payments_email_submitted ON payments(email, submitted_at DESC);
+CREATE INDEX IF NOT EXISTS idx_payments_pending_submitted ON payments(submitted_at) WHERE status = 'PENDING';
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ip_history_email_ip ON user_ip_history(email, ip_address);
+CREATE INDEX IF NOT EXISTS idx_users_created_email ON users(created_at DESC NULLS LAST, email DESC);
+CREATE INDEX IF NOT EXISTS idx_usage_logs_time_id ON usage_logs(event_time DESC, event_id DESC);
+CREATE INDEX IF NOT EXISTS idx_payments_submitted_id ON payments(submitted_at DESC, payment_id DESC);
+CREATE INDEX IF NOT EXISTS idx_admin_actions_time_id ON admin_actions(action_time DESC, action_id DESC);
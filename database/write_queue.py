@@ -0,0 +1,124 @@
+"""
+LEPT AI Reviewer - Background Write Queue
+OPTIMIZED: Fire-and-forget logging writes, batched off the request path
+"""
+
+import atexit
+import itertools
+import queue
+import threading
+import time
+import zlib
+from typing import List, Tuple
+
+from database.connection import execute_many, execute_values_batch
+
+
+# Max statements written per batch, and how long the worker waits for more
+# statements to arrive before flushing a batch
+_BATCH_SIZE = 500
+_BATCH_WAIT_SECONDS = 0.5
+
+# Bounded so a stalled database cannot grow memory without limit; when full,
+# the caller writes its statement directly instead of dropping it
+_QUEUE_MAX_ITEMS = 10000
+
+_write_queue: "queue.Queue[Tuple[str, tuple, bool]]" = queue.Queue(maxsize=_QUEUE_MAX_ITEMS)
+_worker_lock = threading.Lock()
+_worker_thread = None
+
+
+def _drain(max_items: int) -> List[Tuple[str, tuple, bool]]:
+    """Take up to max_items queued writes without blocking."""
+    items = []
+    while len(items) < max_items:
+        try:
+            items.append(_write_queue.get_nowait())
+        except queue.Empty:
+            break
+    return items
+
+
+def _write_group(query: str, values: bool, params_list: List[tuple]) -> bool:
+    """Write one run of identical statements in a single transaction."""
+    if values:
+        return execute_values_batch(query, params_list)
+    # Queued statements are a small fixed set - prepare each once per connection
+    return execute_many(query, params_list, prepare=f"queued_{zlib.crc32(query.encode()):08x}")
+
+
+def _write_batch(items: List[Tuple[str, tuple, bool]]) -> int:
+    """
+    Write a batch, one executemany (or multi-row INSERT) per run of consecutive identical statements.
+    A run whose transaction fails is retried row by row, so only the bad rows are lost.
+    Returns the number of rows dropped.
+    """
+    dropped = 0
+    # Grouping only consecutive runs keeps the original statement order, so an
+    # ip_usage UPSERT still lands before the increment that depends on it.
+    for (query, values), group in itertools.groupby(items, key=lambda item: (item[0], item[2])):
+        params_list = [params for _, params, _ in group]
+        if _write_group(query, values, params_list):
+            continue
+        if len(params_list) == 1:
+            dropped += 1
+        else:
+            dropped += sum(not _write_group(query, values, [params]) for params in params_list)
+    if dropped:
+        print(f"Write queue: dropped {dropped} of {len(items)} rows")
+    return dropped
+
+
+def _worker():
+    """Block for the first write, then flush it with whatever arrives shortly after."""
+    while True:
+        first = _write_queue.get()
+        time.sleep(_BATCH_WAIT_SECONDS)
+        items = [first] + _drain(_BATCH_SIZE - 1)
+        try:
+            _write_batch(items)
+        finally:
+            for _ in items:
+                _write_queue.task_done()
+
+
+def _ensure_worker():
+    """Start the background writer once per process."""
+    global _worker_thread
+    if _worker_thread is not None and _worker_thread.is_alive():
+        return
+    with _worker_lock:
+        if _worker_thread is None or not _worker_thread.is_alive():
+            _worker_thread = threading.Thread(target=_worker, name="db-write-queue", daemon=True)
+            _worker_thread.start()
+
+
+def enqueue_write(query: str, params: tuple, values: bool = False) -> bool:
+    """
+    Queue a write statement and return immediately.
+    With values=True the query is an `INSERT ... VALUES %s` template and params is
+    one row; queued rows are then written as a single multi-row INSERT.
+    Returns False only when the queue was full and the direct write failed.
+    """
+    _ensure_worker()
+    item = (query, params, values)
+    try:
+        _write_queue.put_nowait(item)
+    except queue.Full:
+        return _write_batch([item]) == 0
+    return True
+
+
+def flush_writes() -> int:
+    """Synchronously write everything still queued (used at process exit) - returns rows dropped."""
+    dropped = 0
+    items = _drain(_write_queue.qsize())
+    while items:
+        dropped += _write_batch(items)
+        for _ in items:
+            _write_queue.task_done()
+        items = _drain(_write_queue.qsize())
+    return dropped
+
+
+atexit.register(flush_writes)
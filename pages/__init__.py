@@ -1 +1,24 @@
 # Pages module
+"""
+Page registry - page modules are imported on first access, not at startup.
+"""
+
+import importlib
+from functools import lru_cache
+from typing import Callable
+
+# page key -> (module, render function)
+PAGE_RENDERERS = {
+    "home": ("pages.home", "render_home_page"),
+    "upload": ("pages.upload_reviewer", "render_upload_page"),
+    "practice": ("pages.practice_exam", "render_practice_page"),
+    "upgrade": ("pages.upgrade", "render_upgrade_page"),
+    "admin": ("pages.admin_panel", "render_admin_page"),
+}
+
+
+@lru_cache(maxsize=None)
+def get_page_renderer(page_key: str) -> Callable[[], None]:
+    """Get the render function for a page - imports its module once, unknown keys fall back to home."""
+    module_name, func_name = PAGE_RENDERERS.get(page_key, PAGE_RENDERERS["home"])
+    return getattr(importlib.import_module(module_name), func_name)
@@ -3,17 +3,187 @@ LEPT AI Reviewer - Admin Panel Page
 OPTIMIZED: Lazy loading, cached queries
 """
 
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
 import streamlit as st
 
 from components.auth import is_admin, show_admin_login
 from config.settings import (
-    COLORS, PLAN_FREE, PLAN_PRO, PLAN_PREMIUM,
+    COLORS, PLAN_COLORS, PLAN_FREE, PLAN_PRO, PLAN_PREMIUM,
     PAYMENT_PENDING, PAYMENT_APPROVED, PAYMENT_REJECTED,
-    ACTION_USER_BLOCKED, ACTION_USER_UNBLOCKED, ACTION_QUOTA_ADJUSTED, 
-    ACTION_UPLOAD_ADMIN_DOC, ACTION_USER_DELETED, ACTION_PLAN_CHANGED, ACTION_DELETE_ADMIN_DOC
+    ACTION_UPLOAD_ADMIN_DOC, ACTION_USER_DELETED, ACTION_DELETE_ADMIN_DOC
 )
 
 
+# ============== STATIC HTML (built once at import) ==============
+
+_ADMIN_HEADER_HTML = f"""
+<div style="padding: 2rem; 
+            background: linear-gradient(135deg, rgba(239, 68, 68, 0.15) 0%, rgba(99, 102, 241, 0.1) 100%);
+            border-radius: 20px; margin-bottom: 1.5rem;
+            border: 1px solid {COLORS['border']};">
+    <h2 style="color: {COLORS['text']}; margin: 0;">
+        🛠️ Admin Panel
+    </h2>
+    <p style="color: {COLORS['text_muted']}; margin: 0.5rem 0 0 0;">
+        Manage users, payments, and reviewer documents.
+    </p>
+</div>
+"""
+
+_ADMIN_DOCS_INFO_HTML = f"""
+<div style="background: rgba(99, 102, 241, 0.1); padding: 1rem; border-radius: 12px;
+            border: 1px solid {COLORS['primary']}; margin-bottom: 1rem;">
+    <p style="margin: 0; color: {COLORS['text']};">
+        📚 Admin reviewers for PRO/PREMIUM users to download and use for AI-generated questions.
+    </p>
+</div>
+"""
+
+_TEST_CONNECTION_CARD_HTML = f"""
+<div style="background: rgba(30, 41, 59, 0.8); padding: 1.5rem; border-radius: 16px;
+            border: 1px solid {COLORS['border']};">
+    <h4 style="color: {COLORS['text']}; margin: 0 0 0.5rem 0;">🔌 Test Connection</h4>
+    <p style="color: {COLORS['text_muted']}; margin: 0 0 1rem 0; font-size: 0.9rem;">
+        Test database connection.
+    </p>
+</div>
+"""
+
+_SYSTEM_INFO_CARD_HTML = f"""
+<div style="background: rgba(30, 41, 59, 0.8); padding: 1.5rem; border-radius: 16px;
+            border: 1px solid {COLORS['border']};">
+    <h4 style="color: {COLORS['text']}; margin: 0 0 0.5rem 0;">📊 System Info</h4>
+    <p style="color: {COLORS['text_muted']}; margin: 0; font-size: 0.9rem;">
+        Free: 15 questions<br>
+        Pro: +75 questions<br>
+        Premium: 30 days unlimited
+    </p>
+</div>
+"""
+
+_PRICING_CARD_HTML = f"""
+<div style="background: rgba(30, 41, 59, 0.8); padding: 1.5rem; border-radius: 16px;
+            border: 1px solid {COLORS['border']};">
+    <h4 style="color: {COLORS['text']}; margin: 0 0 1rem 0;">💰 Pricing</h4>
+    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1rem;">
+        <div>
+            <p style="color: {COLORS['text_muted']}; margin: 0;">Pro Plan</p>
+            <p style="color: {COLORS['primary']}; font-size: 1.5rem; font-weight: 700; margin: 0;">₱99</p>
+        </div>
+        <div>
+            <p style="color: {COLORS['text_muted']}; margin: 0;">Premium Plan</p>
+            <p style="color: {COLORS['accent']}; font-size: 1.5rem; font-weight: 700; margin: 0;">₱499</p>
+        </div>
+    </div>
+</div>
+"""
+
+# Per-row fields stay as {placeholders} for str.format
+_AUDIT_ROW_TEMPLATE = f"""
+<div style="background: rgba(30, 41, 59, 0.8); padding: 0.75rem 1rem; border-radius: 10px; 
+            border-left: 3px solid {COLORS['primary']}; margin-bottom: 0.5rem;">
+    <div style="display: flex; justify-content: space-between;">
+        <strong style="color: {COLORS['text']};">{{action_type}}</strong>
+        <span style="color: {COLORS['text_muted']}; font-size: 0.85rem;">{{action_time}}</span>
+    </div>
+    <p style="margin: 0.25rem 0 0 0; color: {COLORS['text_muted']}; font-size: 0.9rem;">
+        By: {{admin_user}} | {{details}}
+    </p>
+</div>
+
+"""
+
+# Fallbacks for audit rows missing a column - the template reads the row directly
+_AUDIT_ROW_DEFAULTS = {"action_type": "Unknown", "admin_user": "N/A", "details": "", "action_time": "N/A"}
+
+
+# Admin document list - one HTML table; per-row fields stay as {placeholders} for str.format
+_ADMIN_DOC_TABLE_HTML = f"""
+<table style="width: 100%; border-collapse: collapse; background: rgba(30, 41, 59, 0.8); 
+              border: 1px solid {COLORS['border']}; border-radius: 12px; margin-bottom: 0.5rem;">
+    <tr style="color: {COLORS['text_muted']}; font-size: 0.8rem; text-align: left;">
+        <th style="padding: 0.5rem 1rem;">File</th><th>Category</th><th>Text</th><th>Access</th>
+    </tr>
+    {{rows}}
+</table>
+"""
+
+_ADMIN_DOC_ROW_TEMPLATE = f"""
+    <tr style="border-top: 1px solid {COLORS['border']};">
+        <td style="padding: 0.5rem 1rem;"><strong style="color: {COLORS['text']};">{{filename}}</strong></td>
+        <td><span style="background: {COLORS['primary']}33; color: {COLORS['primary']}; 
+                         padding: 2px 8px; border-radius: 10px; font-size: 0.75rem;">{{category}}</span></td>
+        <td style="color: {{text_color}}; font-size: 0.75rem;">{{text_label}}</td>
+        <td style="color: {{download_color}}; font-size: 0.85rem;">{{download_label}}</td>
+    </tr>"""
+
+
+# Rows per page in the users and payment-history lists - keeps the widget count constant
+_ADMIN_PAGE_SIZE = 25
+
+# Audit entries per "Load more" step
+_AUDIT_PAGE_SIZE = 50
+
+
+# ============== CACHED ADMIN READS ==============
+# Shared by every admin session for 60 seconds; admin writes clear the
+# affected cache so the next load sees the change. The raw query functions
+# in database.queries stay uncached.
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_users(limit: int = _ADMIN_PAGE_SIZE, before=None, before_email: str = None) -> list:
+    from database.queries import get_all_users
+    return get_all_users(limit=limit, before=before, before_email=before_email)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_user_plan_counts() -> dict:
+    from database.queries import get_user_plan_counts
+    return get_user_plan_counts()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_pending_payments() -> list:
+    from database.queries import get_pending_payments
+    return get_pending_payments()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_all_payments(limit: int = _ADMIN_PAGE_SIZE, before=None, before_id: int = None) -> list:
+    from database.queries import get_all_payments
+    return get_all_payments(limit=limit, before=before, before_id=before_id)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_payment_users(emails: tuple) -> dict:
+    from database.queries import get_users_by_emails
+    return get_users_by_emails(list(emails))
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_admin_actions(limit: int = 50, before=None, before_id: int = None) -> list:
+    from database.queries import get_admin_actions
+    return get_admin_actions(limit=limit, before=before, before_id=before_id)
+
+
+def _clear_users_cache():
+    """After a user write - the user list, requester rows and the audit log changed."""
+    _cached_users.clear()
+    _cached_user_plan_counts.clear()
+    _cached_payment_users.clear()
+    _cached_admin_actions.clear()
+
+
+def _clear_payments_cache():
+    """After a payment decision - payments, the upgraded user and the audit log changed."""
+    _cached_pending_payments.clear()
+    _cached_all_payments.clear()
+    _clear_users_cache()
+
+
 def render_admin_page():
     """Render the admin panel - OPTIMIZED with lazy loading."""
     if not is_admin():
@@ -22,43 +192,44 @@ def render_admin_page():
         return
     
     # Header
-    st.markdown(f"""
-    <div style="padding: 2rem; 
-                background: linear-gradient(135deg, rgba(239, 68, 68, 0.15) 0%, rgba(99, 102, 241, 0.1) 100%);
-                border-radius: 20px; margin-bottom: 1.5rem;
-                border: 1px solid {COLORS['border']};">
-        <h2 style="color: {COLORS['text']}; margin: 0;">
-            🛠️ Admin Panel
-        </h2>
-        <p style="color: {COLORS['text_muted']}; margin: 0.5rem 0 0 0;">
-            Manage users, payments, and reviewer documents.
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Tabs
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        "👥 Users", 
-        "💳 Payments", 
-        "📚 Admin Reviewers",
-        "📊 Audit Logs",
-        "⚙️ Settings"
-    ])
-    
-    with tab1:
-        render_users_tab()
-    
-    with tab2:
-        render_payments_tab()
-    
-    with tab3:
-        render_admin_docs_tab()
-    
-    with tab4:
-        render_audit_logs_tab()
-    
-    with tab5:
-        render_settings_tab()
+    st.markdown(_ADMIN_HEADER_HTML, unsafe_allow_html=True)
+    
+    # Loads and page moves run as on_click callbacks - state is set before the
+    # script runs, so there is no second full run from an explicit st.rerun()
+    st.button("🔄 Load All Admin Data", key="load_all_admin_data", on_click=load_all_admin_data)
+    
+    # Tab selector - unlike st.tabs, only the selected tab's body runs on a rerun
+    tabs = {
+        "👥 Users": render_users_tab,
+        "💳 Payments": render_payments_tab,
+        "📚 Admin Reviewers": render_admin_docs_tab,
+        "📊 Audit Logs": render_audit_logs_tab,
+        "⚙️ Settings": render_settings_tab,
+    }
+    active_tab = st.radio("Section", list(tabs), horizontal=True,
+                          key="admin_active_tab", label_visibility="collapsed")
+    tabs[active_tab]()
+
+
+def load_all_admin_data():
+    """Load users, payments and audit logs in parallel - one round-trip of latency, not four."""
+    from database.connection import run_parallel
+    
+    users, pending, all_payments, actions = run_parallel(
+        _cached_users,
+        _cached_pending_payments,
+        _cached_all_payments,
+        lambda: _cached_admin_actions(limit=_AUDIT_PAGE_SIZE + 1),
+    )
+    st.session_state.admin_users_cursors = [(None, None)]
+    st.session_state.admin_users_loaded = users
+    st.session_state.admin_pending_payments = pending
+    st.session_state.admin_payments_cursors = [(None, None)]
+    st.session_state.admin_all_payments = all_payments
+    st.session_state.admin_payment_users = _cached_payment_users(tuple(sorted({p["email"] for p in pending})))
+    st.session_state.admin_payment_decisions = {}
+    st.session_state.admin_payments_loaded = True
+    _set_audit_logs(actions)
 
 
 def render_users_tab():
@@ -70,10 +241,7 @@ def render_users_tab():
         st.session_state.admin_users_loaded = None
     
     if st.session_state.admin_users_loaded is None:
-        if st.button("🔄 Load Users", key="load_users"):
-            from database.queries import get_all_users
-            st.session_state.admin_users_loaded = get_all_users(limit=100)
-            st.rerun()
+        st.button("🔄 Load Users", key="load_users", on_click=_show_users_page, args=([(None, None)],))
         return
     
     users = st.session_state.admin_users_loaded
@@ -82,122 +250,176 @@ def render_users_tab():
         st.info("No users found.")
         return
     
-    # Summary stats
+    # Summary stats - whole-table counts from one cached GROUP BY, not the visible page
     col1, col2, col3, col4 = st.columns(4)
     
-    total_users = len(users)
-    free_users = len([u for u in users if u.get("plan_type") == PLAN_FREE])
-    pro_users = len([u for u in users if u.get("plan_type") == PLAN_PRO])
-    premium_users = len([u for u in users if u.get("plan_type") == PLAN_PREMIUM])
+    plan_counts = _cached_user_plan_counts()
     
     with col1:
-        st.metric("Total Users", total_users)
+        st.metric("Total Users", sum(plan_counts.values()))
     with col2:
-        st.metric("Free Users", free_users)
+        st.metric("Free Users", plan_counts.get(PLAN_FREE, 0))
     with col3:
-        st.metric("Pro Users", pro_users)
+        st.metric("Pro Users", plan_counts.get(PLAN_PRO, 0))
     with col4:
-        st.metric("Premium Users", premium_users)
+        st.metric("Premium Users", plan_counts.get(PLAN_PREMIUM, 0))
     
     st.markdown("<br>", unsafe_allow_html=True)
     
     # Refresh button
-    if st.button("🔄 Refresh Users", key="refresh_users"):
-        from database.queries import get_all_users
-        st.session_state.admin_users_loaded = get_all_users(limit=100)
-        st.rerun()
+    st.button("🔄 Refresh Users", key="refresh_users", on_click=_refresh_users)
     
-    # User list - use expanders to avoid rendering all content
-    # Use enumerate to create unique keys even for duplicate emails
-    for idx, user in enumerate(users):
-        email = user.get("email", "N/A")
-        ip = user.get("ip_address", "N/A")
-        plan = user.get("plan_type", PLAN_FREE)
-        questions = user.get("questions_remaining", 0)
-        is_blocked = user.get("is_blocked", False)
-        expiry = user.get("premium_expiry")
-        
-        plan_colors = {
-            PLAN_FREE: COLORS["text_muted"],
-            PLAN_PRO: COLORS["primary"],
-            PLAN_PREMIUM: COLORS["accent"]
-        }
-        plan_color = plan_colors.get(plan, COLORS["text_muted"])
-        blocked_icon = "🚫 " if is_blocked else ""
-        
-        with st.expander(f"{blocked_icon}{email} - {plan}"):
-            render_user_actions(idx, user, email, ip, plan, plan_color, questions, is_blocked, expiry)
+    cursors = st.session_state.get("admin_users_cursors", [(None, None)])
+    page = len(cursors) - 1
+    
+    # User list - one editable grid for the page instead of an expander per user
+    render_users_table(page)
+    
+    # Pages - keyset on (created_at, email); the cursor stack lets Previous step back
+    has_next = len(users) == _ADMIN_PAGE_SIZE and users[-1].get("created_at") is not None
+    next_cursors = cursors + [(users[-1]["created_at"], users[-1]["email"])] if has_next else None
+    _render_pager("users", cursors, next_cursors, _show_users_page)
 
 
-def render_user_actions(idx, user, email, ip, plan, plan_color, questions, is_blocked, expiry):
-    """Render user management actions - separated for cleaner code."""
-    from database.queries import block_user, adjust_user_quota, log_admin_action, delete_user, change_user_plan
-    
-    # Use index for unique key suffix to handle duplicate emails
-    key_suffix = f"user_{idx}"
+def _refresh_users():
+    """Refresh button callback - drop the cached pages and counts, back to page one."""
+    _cached_users.clear()
+    _cached_user_plan_counts.clear()
+    _show_users_page([(None, None)])
+
+
+# Grid columns, in display order; only plan, quota and blocked are editable
+_USER_TABLE_COLUMNS = ["email", "plan_type", "questions_remaining", "is_blocked",
+                       "questions_used_total", "premium_expiry", "ip_address", "created_at"]
+_USER_TABLE_EDITABLE = ("plan_type", "questions_remaining", "is_blocked")
+
+
+@st.fragment
+def render_users_table(page: int):
+    """
+    Render the users page as one editable grid - a fragment, so saving reruns only the table.
+    Plan, quota and blocked are edited inline; Save writes only the rows that changed.
+    """
+    import pandas as pd
+    from database.queries import apply_admin_user_edits, delete_user
+    
+    users = st.session_state.get("admin_users_loaded") or []
+    if not users:
+        st.info("No users found.")
+        return
     
-    col1, col2 = st.columns(2)
+    editor_key = f"users_editor_{page}_{st.session_state.get('admin_users_editor_version', 0)}"
+    
+    # Form, so cell edits are batched client-side and nothing reruns until Save
+    with st.form(f"users_form_{page}", border=False):
+        st.data_editor(
+            pd.DataFrame(users, columns=_USER_TABLE_COLUMNS),
+            key=editor_key,
+            hide_index=True,
+            use_container_width=True,
+            num_rows="fixed",
+            disabled=[col for col in _USER_TABLE_COLUMNS if col not in _USER_TABLE_EDITABLE],
+            column_config={
+                "email": st.column_config.TextColumn("Email"),
+                "plan_type": st.column_config.SelectboxColumn(
+                    "Plan", options=[PLAN_FREE, PLAN_PRO, PLAN_PREMIUM], required=True
+                ),
+                "questions_remaining": st.column_config.NumberColumn(
+                    "Questions", min_value=0, max_value=10000, step=1, required=True
+                ),
+                "is_blocked": st.column_config.CheckboxColumn("Blocked"),
+                "questions_used_total": st.column_config.NumberColumn("Used"),
+                "premium_expiry": st.column_config.DatetimeColumn("Premium Expiry"),
+                "ip_address": st.column_config.TextColumn("IP"),
+                "created_at": st.column_config.DatetimeColumn("Joined"),
+            },
+        )
+        save = st.form_submit_button("💾 Save Changes")
+    
+    # Only the edited cells, by row position - no DataFrame diff needed
+    changes = st.session_state.get(editor_key, {}).get("edited_rows", {})
+    
+    if save and changes:
+        # (email, plan, quota, blocked) per row - None where the cell is back to its original value
+        edits = []
+        for row, cells in changes.items():
+            user = users[row]
+            plan = cells.get("plan_type")
+            quota = cells.get("questions_remaining")
+            blocked = cells.get("is_blocked")
+            edit = (
+                user["email"],
+                plan if plan is not None and plan != user.get("plan_type") else None,
+                int(quota) if quota is not None and quota != user.get("questions_remaining") else None,
+                blocked if blocked is not None and blocked != user.get("is_blocked") else None,
+            )
+            if any(value is not None for value in edit[1:]):
+                edits.append(edit)
+        
+        if apply_admin_user_edits(edits):
+            _reload_users_page()
+            st.rerun(scope="fragment")
+        st.error("Failed to save changes.")
     
+    # Delete - explicit pick and confirm, kept out of the grid
+    with st.expander("🗑️ Delete a user"):
+        st.markdown(f"<p style='color: {COLORS['error']};'><strong>Danger Zone:</strong></p>", unsafe_allow_html=True)
+        with st.form(f"delete_user_form_{page}", clear_on_submit=True):
+            target = st.selectbox("User:", options=[u["email"] for u in users])
+            confirmed = st.checkbox("Confirm delete")
+            if st.form_submit_button("🗑️ Delete User", type="primary"):
+                if not confirmed:
+                    st.warning("Tick Confirm delete first.")
+                elif delete_user(target, audit=("admin", ACTION_USER_DELETED, f"Deleted {target}")):
+                    _reload_users_page()
+                    st.rerun(scope="fragment")
+                else:
+                    st.error("Failed to delete user.")
+
+
+def _reload_users_page():
+    """After admin edits - clear the caches, re-read the current page and reset the grid's edits."""
+    _clear_users_cache()
+    _show_users_page(st.session_state.get("admin_users_cursors", [(None, None)]))
+    st.session_state.admin_users_editor_version = st.session_state.get("admin_users_editor_version", 0) + 1
+
+
+def _show_users_page(cursors: list):
+    """Load the users page for the last (created_at, email) cursor in the stack - CACHED."""
+    before, before_email = cursors[-1]
+    st.session_state.admin_users_cursors = cursors
+    st.session_state.admin_users_loaded = _cached_users(before=before, before_email=before_email)
+
+
+def _show_payments_page(cursors: list):
+    """Load the payment-history page for the last (created_at, payment_id) cursor - CACHED."""
+    before, before_id = cursors[-1]
+    st.session_state.admin_payments_cursors = cursors
+    st.session_state.admin_all_payments = _cached_all_payments(before=before, before_id=before_id)
+
+
+_PAYMENT_HISTORY_COLUMNS = ("payment_id", "created_at", "full_name", "email", "plan_requested",
+                            "gcash_ref", "status", "admin_notes", "approved_at", "approved_by")
+
+
+def _render_pager(key: str, cursors: list, next_cursors: Optional[list], show_page):
+    """
+    Previous/Next buttons for a keyset-paged list - each calls show_page(cursor stack) on click.
+    next_cursors is None on the last page.
+    """
+    page = len(cursors) - 1
+    col1, col2, col3 = st.columns([1, 2, 1])
     with col1:
-        st.markdown(f"**Email:** {email}")
-        st.markdown(f"**IP:** {ip}")
-        st.markdown(f"**Plan:** <span style='color: {plan_color}'>{plan}</span>", unsafe_allow_html=True)
-        st.markdown(f"**Questions:** {questions}")
-        if expiry:
-            st.markdown(f"**Premium Expiry:** {expiry}")
-    
+        if page > 0:
+            st.button("⬅️ Previous", key=f"{key}_prev_page", use_container_width=True,
+                      on_click=show_page, args=(cursors[:-1],))
     with col2:
-        st.markdown("**Actions:**")
-        
-        # Change Plan - use form to prevent reruns
-        with st.form(f"plan_form_{key_suffix}", clear_on_submit=False):
-            plan_options = [PLAN_FREE, PLAN_PRO, PLAN_PREMIUM]
-            current_index = plan_options.index(plan) if plan in plan_options else 0
-            new_plan = st.selectbox("Change Plan:", options=plan_options, index=current_index, key=f"plan_sel_{key_suffix}")
-            
-            if st.form_submit_button("💳 Update Plan"):
-                change_user_plan(email, new_plan)
-                log_admin_action("admin", ACTION_PLAN_CHANGED, f"Changed plan to {new_plan} for {email}")
-                st.session_state.admin_users_loaded = None  # Force reload
-                st.success(f"Plan updated to {new_plan}!")
-                st.rerun()
-        
-        # Block/Unblock
-        if is_blocked:
-            if st.button(f"✅ Unblock", key=f"unblock_{key_suffix}"):
-                block_user(email, False)
-                log_admin_action("admin", ACTION_USER_UNBLOCKED, f"Unblocked {email}")
-                st.session_state.admin_users_loaded = None
-                st.rerun()
-        else:
-            if st.button(f"🚫 Block", key=f"block_{key_suffix}"):
-                block_user(email, True)
-                log_admin_action("admin", ACTION_USER_BLOCKED, f"Blocked {email}")
-                st.session_state.admin_users_loaded = None
-                st.rerun()
-        
-        # Adjust quota - use form
-        with st.form(f"quota_form_{key_suffix}", clear_on_submit=False):
-            new_quota = st.number_input("Adjust Quota:", min_value=0, max_value=10000, value=questions, key=f"quota_num_{key_suffix}")
-            
-            if st.form_submit_button("📊 Update Quota"):
-                adjust_user_quota(email, new_quota)
-                log_admin_action("admin", ACTION_QUOTA_ADJUSTED, f"Quota set to {new_quota} for {email}")
-                st.session_state.admin_users_loaded = None
-                st.success("Quota updated!")
-                st.rerun()
-        
-        # Delete
-        st.markdown(f"<p style='color: {COLORS['error']};'><strong>Danger Zone:</strong></p>", unsafe_allow_html=True)
-        delete_confirm = st.checkbox(f"Confirm delete", key=f"confirm_del_{key_suffix}")
-        
-        if delete_confirm:
-            if st.button(f"🗑️ Delete User", key=f"del_{key_suffix}", type="primary"):
-                delete_user(email)
-                log_admin_action("admin", ACTION_USER_DELETED, f"Deleted {email}")
-                st.session_state.admin_users_loaded = None
-                st.success(f"Deleted {email}!")
-                st.rerun()
+        st.markdown(f"<p style='text-align: center; color: {COLORS['text_muted']};'>Page {page + 1}</p>", 
+                    unsafe_allow_html=True)
+    with col3:
+        if next_cursors is not None:
+            st.button("Next ➡️", key=f"{key}_next_page", use_container_width=True,
+                      on_click=show_page, args=(next_cursors,))
 
 
 def render_payments_tab():
@@ -209,12 +431,7 @@ def render_payments_tab():
         st.session_state.admin_payments_loaded = None
     
     if st.session_state.admin_payments_loaded is None:
-        if st.button("🔄 Load Payments", key="load_payments"):
-            from database.queries import get_pending_payments, get_all_payments
-            st.session_state.admin_pending_payments = get_pending_payments()
-            st.session_state.admin_all_payments = get_all_payments(limit=50)
-            st.session_state.admin_payments_loaded = True
-            st.rerun()
+        st.button("🔄 Load Payments", key="load_payments", on_click=_load_payments)
         return
     
     pending = st.session_state.get("admin_pending_payments", [])
@@ -223,8 +440,9 @@ def render_payments_tab():
         st.success("No pending payments.")
     else:
         st.warning(f"{len(pending)} payment(s) awaiting review")
+        payment_users = st.session_state.get("admin_payment_users", {})
         for payment in pending:
-            render_payment_card(payment, is_pending=True)
+            render_payment_card(payment, is_pending=True, user=payment_users.get(payment.get("email")))
     
     st.markdown("<br>", unsafe_allow_html=True)
     st.markdown(f"<h3 style='color: {COLORS['text']}; margin-bottom: 1rem;'>📜 All Payments</h3>", unsafe_allow_html=True)
@@ -234,34 +452,78 @@ def render_payments_tab():
     if not all_payments:
         st.info("No payment history.")
     else:
-        for payment in all_payments:
-            if payment.get("status") != PAYMENT_PENDING:
-                render_payment_card(payment, is_pending=False)
+        # Decided payments are read-only - one table instead of an expander per payment
+        st.dataframe(
+            [p for p in all_payments if p.get("status") != PAYMENT_PENDING],
+            column_order=_PAYMENT_HISTORY_COLUMNS,
+            hide_index=True,
+            use_container_width=True,
+        )
+        
+        # Pages - keyset on (created_at, payment_id)
+        cursors = st.session_state.get("admin_payments_cursors", [(None, None)])
+        last = all_payments[-1]
+        has_next = len(all_payments) == _ADMIN_PAGE_SIZE
+        _render_pager("payments", cursors,
+                      cursors + [(last["created_at"], last["payment_id"])] if has_next else None,
+                      _show_payments_page)
     
     # Refresh button
-    if st.button("🔄 Refresh Payments", key="refresh_payments"):
-        st.session_state.admin_payments_loaded = None
-        st.rerun()
+    st.button("🔄 Refresh Payments", key="refresh_payments", on_click=_refresh_payments)
+
 
+def _load_payments():
+    """Load Payments callback - pending and history in parallel, then the requesters' rows."""
+    from database.connection import run_parallel
+    st.session_state.admin_pending_payments, st.session_state.admin_all_payments = run_parallel(
+        _cached_pending_payments, _cached_all_payments
+    )
+    st.session_state.admin_payments_cursors = [(None, None)]
+    # Requesters' current plans for every pending card - one query, not one per card
+    st.session_state.admin_payment_users = _cached_payment_users(
+        tuple(sorted({p["email"] for p in st.session_state.admin_pending_payments}))
+    )
+    st.session_state.admin_payment_decisions = {}
+    st.session_state.admin_payments_loaded = True
 
-def render_payment_card(payment: dict, is_pending: bool = True):
-    """Render a payment card."""
+
+def _refresh_payments():
+    """Refresh button callback - drop the cached lists; the tab shows its Load button again."""
+    _clear_payments_cache()
+    st.session_state.admin_payments_loaded = None
+
+
+# (column, default) pairs read once per payment card
+_PAYMENT_CARD_FIELDS = (
+    ("full_name", "N/A"), ("email", "N/A"), ("plan_requested", "N/A"),
+    ("gcash_ref", "N/A"), ("status", PAYMENT_PENDING), ("created_at", "N/A"),
+)
+
+_PAYMENT_STATUS_COLORS = {
+    PAYMENT_PENDING: COLORS["warning"],
+    PAYMENT_APPROVED: COLORS["success"],
+    PAYMENT_REJECTED: COLORS["error"]
+}
+
+
+@st.fragment
+def render_payment_card(payment: dict, is_pending: bool = True, user: dict = None):
+    """
+    Render a payment card - `user` is the requester's row, preloaded in bulk.
+    A fragment: approve/reject rerun only this card, which then shows the outcome.
+    """
     from services.payment_handler import process_payment_approval, process_payment_rejection
     
     payment_id = payment.get("payment_id")
-    full_name = payment.get("full_name", "N/A")
-    email = payment.get("email", "N/A")
-    plan = payment.get("plan_requested", "N/A")
-    gcash_ref = payment.get("gcash_ref", "N/A")
-    status = payment.get("status", PAYMENT_PENDING)
-    created_at = payment.get("created_at", "N/A")
-    
-    status_colors = {
-        PAYMENT_PENDING: COLORS["warning"],
-        PAYMENT_APPROVED: COLORS["success"],
-        PAYMENT_REJECTED: COLORS["error"]
-    }
-    status_color = status_colors.get(status, COLORS["text_muted"])
+    decision = st.session_state.get("admin_payment_decisions", {}).get(payment_id)
+    if decision:
+        st.success(decision)
+        return
+    full_name, email, plan, gcash_ref, status, created_at = (
+        payment.get(field, default) for field, default in _PAYMENT_CARD_FIELDS
+    )
+    
+    status_color = _PAYMENT_STATUS_COLORS.get(status, COLORS["text_muted"])
     
     with st.expander(f"{'⏳' if is_pending else '📄'} {full_name} - {plan} ({status})"):
         col1, col2 = st.columns(2)
@@ -274,6 +536,13 @@ def render_payment_card(payment: dict, is_pending: bool = True):
             st.markdown(f"**Submitted:** {created_at}")
             st.markdown(f"**Status:** <span style='color: {status_color}'>{status}</span>", unsafe_allow_html=True)
         
+        if user:
+            with col2:
+                current_plan = user.get("plan_type", PLAN_FREE)
+                plan_color = PLAN_COLORS.get(current_plan, COLORS["text_muted"])
+                st.markdown(f"**Current Plan:** <span style='color: {plan_color}'>{current_plan}</span>", unsafe_allow_html=True)
+                st.markdown(f"**Questions Left:** {user.get('questions_remaining', 0)}")
+        
         if is_pending:
             st.markdown("---")
             
@@ -292,34 +561,63 @@ def render_payment_card(payment: dict, is_pending: bool = True):
                 if approve:
                     success, msg = process_payment_approval(payment_id, payment, admin_notes)
                     if success:
-                        st.session_state.admin_payments_loaded = None
-                        st.success(msg)
-                        st.rerun()
+                        _clear_payments_cache()
+                        st.session_state.setdefault("admin_payment_decisions", {})[payment_id] = msg
+                        st.rerun(scope="fragment")
                     else:
                         st.error(msg)
                 
                 if reject:
                     success, msg = process_payment_rejection(payment_id, payment, admin_notes)
                     if success:
-                        st.session_state.admin_payments_loaded = None
-                        st.success(msg)
-                        st.rerun()
+                        _clear_payments_cache()
+                        st.session_state.setdefault("admin_payment_decisions", {})[payment_id] = msg
+                        st.rerun(scope="fragment")
                     else:
                         st.error(msg)
 
 
+@st.cache_resource
+def _get_upload_executor() -> ThreadPoolExecutor:
+    """Background workers for admin document uploads - created once per process."""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="admin-upload")
+
+
+@st.fragment(run_every=1)
+def render_pending_uploads():
+    """
+    Show a badge per in-flight upload - a polling fragment, so only it reruns while waiting.
+    Once every upload has finished, reports the results and reruns the page once.
+    """
+    pending = st.session_state.get("admin_doc_uploads", {})
+    finished = [doc_id for doc_id, (_, _, future) in pending.items() if future.done()]
+    
+    for doc_id in finished:
+        filename, text_len, future = pending.pop(doc_id)
+        if future.exception() is None and future.result():
+            if text_len > 100:
+                st.toast(f"✅ {filename} uploaded! Extracted {text_len:,} characters for AI use.")
+            else:
+                st.toast(f"✅ {filename} uploaded! (Limited text extraction - file can still be downloaded)")
+        else:
+            # Hide the half-written row rather than list a document with no file
+            from database.queries import delete_admin_document
+            delete_admin_document(doc_id)
+            st.session_state.admin_upload_errors = st.session_state.get("admin_upload_errors", []) + [filename]
+    
+    if not pending:
+        st.session_state.admin_docs_loaded = None  # Force reload
+        st.rerun()
+    
+    for filename, _, _ in pending.values():
+        st.info(f"⏳ Uploading {filename}…")
+
+
 def render_admin_docs_tab():
     """Render admin documents tab."""
     st.markdown(f"<h3 style='color: {COLORS['text']}; margin-bottom: 1rem;'>Upload Admin Reviewer</h3>", unsafe_allow_html=True)
     
-    st.markdown(f"""
-    <div style="background: rgba(99, 102, 241, 0.1); padding: 1rem; border-radius: 12px;
-                border: 1px solid {COLORS['primary']}; margin-bottom: 1rem;">
-        <p style="margin: 0; color: {COLORS['text']};">
-            📚 Admin reviewers for PRO/PREMIUM users to download and use for AI-generated questions.
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_ADMIN_DOCS_INFO_HTML, unsafe_allow_html=True)
     
     uploaded_file = st.file_uploader("Choose PDF or DOCX", type=["pdf", "docx"], key="admin_doc_upload")
     
@@ -334,6 +632,9 @@ def render_admin_docs_tab():
         is_downloadable = st.checkbox("Allow download", value=True)
     
     if uploaded_file:
+        from utils.file_utils import get_file_type
+        file_type = get_file_type(uploaded_file.name)
+        
         st.markdown(f"""
         <div style="background: rgba(6, 182, 212, 0.1); padding: 0.75rem 1rem; border-radius: 10px; margin: 0.5rem 0;">
             📎 <strong>{uploaded_file.name}</strong> ({uploaded_file.size / 1024:.1f} KB)
@@ -346,40 +647,43 @@ def render_admin_docs_tab():
             
             if upload_submit:
                 with st.spinner("Processing..."):
-                    from services.document_processor import extract_text_from_file
-                    from database.queries import save_admin_document, log_admin_action
-                    from database.cached_queries import invalidate_admin_docs_cache
+                    from services.document_processor import extract_text_from_bytes
+                    from database.queries import reserve_admin_document, finalize_admin_document
                     
                     file_content = uploaded_file.getvalue()
-                    success, extracted_text = extract_text_from_file(uploaded_file)
+                    success, extracted_text = extract_text_from_bytes(file_content, file_type)
                     
                     storage_path = f"@STAGE_ADMIN_DOCS/{uploaded_file.name}"
-                    file_type = uploaded_file.name.split('.')[-1].lower()
                     
-                    doc_id = save_admin_document(
+                    # Metadata row inline; the bytes and text are written in the background
+                    doc_id = reserve_admin_document(
                         filename=uploaded_file.name,
                         file_type=file_type,
                         storage_path=storage_path,
                         is_downloadable=is_downloadable,
                         uploaded_by="admin",
-                        file_content=file_content,
-                        extracted_text=extracted_text if success else None,
-                        category=category
+                        category=category,
+                        audit=("admin", ACTION_UPLOAD_ADMIN_DOC,
+                               f"Uploaded {uploaded_file.name} (Category: {category})")
                     )
                     
                     if doc_id:
-                        invalidate_admin_docs_cache()
-                        log_admin_action("admin", ACTION_UPLOAD_ADMIN_DOC, f"Uploaded {uploaded_file.name} (Category: {category})")
-                        st.session_state.admin_docs_loaded = None  # Force reload
-                        text_len = len(extracted_text) if extracted_text else 0
-                        if text_len > 100:
-                            st.success(f"✅ Uploaded! Extracted {text_len:,} characters for AI use.")
-                        else:
-                            st.success("✅ Uploaded! (Limited text extraction - file can still be downloaded)")
-                        st.rerun()
+                        future = _get_upload_executor().submit(
+                            finalize_admin_document, doc_id, file_content,
+                            extracted_text if success else None
+                        )
+                        text_len = len(extracted_text) if success and extracted_text else 0
+                        st.session_state.setdefault("admin_doc_uploads", {})[doc_id] = (uploaded_file.name, text_len, future)
+                        _cached_admin_actions.clear()
                     else:
                         st.error("Failed to save document.")
     
+    if st.session_state.get("admin_doc_uploads"):
+        render_pending_uploads()
+    
+    for filename in st.session_state.pop("admin_upload_errors", []):
+        st.error(f"Failed to save {filename}.")
+    
     st.markdown("<br>", unsafe_allow_html=True)
     st.markdown(f"<h3 style='color: {COLORS['text']}; margin-bottom: 1rem;'>Existing Admin Reviewers</h3>", unsafe_allow_html=True)
     
@@ -388,70 +692,75 @@ def render_admin_docs_tab():
         st.session_state.admin_docs_loaded = None
     
     if st.session_state.admin_docs_loaded is None:
-        if st.button("🔄 Load Admin Docs", key="load_admin_docs_admin"):
-            from database.queries import get_admin_documents
-            st.session_state.admin_docs_list = get_admin_documents()
-            st.session_state.admin_docs_loaded = True
-            st.rerun()
+        st.button("🔄 Load Admin Docs", key="load_admin_docs_admin", on_click=_load_admin_docs)
         return
     
-    docs = st.session_state.get("admin_docs_list", [])
-    
-    if not docs:
-        st.info("No admin reviewers uploaded yet.")
-    else:
-        st.markdown(f"<p style='color: {COLORS['text_muted']};'>{len(docs)} reviewer(s)</p>", unsafe_allow_html=True)
-        
-        for doc in docs:
-            render_admin_doc_item(doc)
+    render_admin_docs_list()
 
 
-def render_admin_doc_item(doc):
-    """Render a single admin document item."""
-    from database.queries import update_admin_document_downloadable, delete_admin_document, log_admin_action
-    from database.cached_queries import invalidate_admin_docs_cache
-    
-    doc_id = doc.get("doc_id")
-    filename = doc.get("filename", "Unknown")
-    is_downloadable = doc.get("is_downloadable", False)
-    category = doc.get("category", "General")
-    has_text = doc.get("extracted_text") is not None
-    
-    st.markdown(f"""
-    <div style="background: rgba(30, 41, 59, 0.8); padding: 1rem; border-radius: 12px; 
-                border: 1px solid {COLORS['border']}; margin-bottom: 0.5rem;">
-        <strong style="color: {COLORS['text']};">{filename}</strong>
-        <span style="background: {COLORS['primary']}33; color: {COLORS['primary']}; 
-                     padding: 2px 8px; border-radius: 10px; font-size: 0.75rem; margin-left: 0.5rem;">
-            {category}
-        </span>
-        <span style="color: {'#10B981' if has_text else '#F59E0B'}; font-size: 0.75rem; margin-left: 0.5rem;">
-            {'✅ Text' if has_text else '⚠️ No Text'}
-        </span>
-        <span style="color: {COLORS['success'] if is_downloadable else COLORS['warning']}; font-size: 0.85rem; float: right;">
-            {'📥 Downloadable' if is_downloadable else '🔒 View Only'}
-        </span>
-    </div>
-    """, unsafe_allow_html=True)
+@st.fragment
+def render_admin_docs_list():
+    """
+    Render all admin documents as one HTML table, with actions only for the picked document -
+    a fragment, so picking, toggling or deleting reruns only the list.
+    """
+    from database.queries import update_admin_document_downloadable, delete_admin_document
+    
+    docs = st.session_state.get("admin_docs_list", ())
+    if not docs:
+        st.info("No admin reviewers uploaded yet.")
+        return
     
-    col1, col2, col3 = st.columns([2, 1, 1])
+    st.markdown(f"<p style='color: {COLORS['text_muted']};'>{len(docs)} reviewer(s)</p>", unsafe_allow_html=True)
     
-    with col1:
-        toggle_label = "🔓 Downloadable" if not is_downloadable else "🔒 View Only"
-        if st.button(toggle_label, key=f"toggle_{doc_id}"):
-            update_admin_document_downloadable(doc_id, not is_downloadable)
-            invalidate_admin_docs_cache()
-            st.session_state.admin_docs_loaded = None
-            st.rerun()
+    # Actions render for the picked document only - O(1) widgets however long the list
+    by_id = {doc.get("doc_id"): doc for doc in docs}
+    doc_id = st.selectbox(
+        "Manage document", options=list(by_id), index=None, placeholder="Pick a document to manage...",
+        format_func=lambda i: by_id[i].get("filename", "Unknown"), key="admin_doc_pick"
+    )
     
-    with col3:
-        if st.button("🗑️", key=f"del_admin_{doc_id}", help="Delete"):
-            delete_admin_document(doc_id)
-            invalidate_admin_docs_cache()
-            log_admin_action("admin", ACTION_DELETE_ADMIN_DOC, f"Deleted {filename}")
-            st.session_state.admin_docs_loaded = None
-            st.success("Deleted!")
-            st.rerun()
+    if doc_id is not None:
+        doc = by_id[doc_id]
+        is_downloadable = doc.get("is_downloadable", False)
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            toggle_label = "🔓 Downloadable" if not is_downloadable else "🔒 View Only"
+            if st.button(toggle_label, key="toggle_admin_doc", use_container_width=True):
+                update_admin_document_downloadable(doc_id, not is_downloadable)
+                st.session_state.admin_docs_list = tuple(
+                    {**d, "is_downloadable": not is_downloadable} if d is doc else d for d in docs
+                )
+                st.rerun(scope="fragment")
+        
+        with col2:
+            if st.button("🗑️ Delete", key="del_admin_doc", use_container_width=True):
+                delete_admin_document(doc_id, audit=("admin", ACTION_DELETE_ADMIN_DOC,
+                                                      f"Deleted {doc.get('filename', 'Unknown')}"))
+                _cached_admin_actions.clear()
+                st.session_state.admin_docs_list = tuple(d for d in docs if d is not doc)
+                st.rerun(scope="fragment")
+    
+    # The whole list in one markdown element - one delta instead of one per document
+    st.markdown(_ADMIN_DOC_TABLE_HTML.format(rows="".join(
+        _ADMIN_DOC_ROW_TEMPLATE.format(
+            filename=doc.get("filename", "Unknown"),
+            category=doc.get("category", "General"),
+            text_color=COLORS['success'] if doc.get("has_text") else COLORS['warning'],
+            text_label="✅ Text" if doc.get("has_text") else "⚠️ No Text",
+            download_color=COLORS['success'] if doc.get("is_downloadable") else COLORS['warning'],
+            download_label="📥 Downloadable" if doc.get("is_downloadable") else "🔒 View Only",
+        )
+        for doc in docs
+    )), unsafe_allow_html=True)
+
+
+def _load_admin_docs():
+    """Load Admin Docs callback - CACHED metadata rows."""
+    from database.queries import get_admin_documents
+    st.session_state.admin_docs_list = get_admin_documents()
+    st.session_state.admin_docs_loaded = True
 
 
 def render_audit_logs_tab():
@@ -463,11 +772,7 @@ def render_audit_logs_tab():
         st.session_state.admin_logs_loaded = None
     
     if st.session_state.admin_logs_loaded is None:
-        if st.button("🔄 Load Logs", key="load_logs"):
-            from database.queries import get_admin_actions
-            st.session_state.admin_logs_list = get_admin_actions(limit=50)
-            st.session_state.admin_logs_loaded = True
-            st.rerun()
+        st.button("🔄 Load Logs", key="load_logs", on_click=_load_audit_logs)
         return
     
     actions = st.session_state.get("admin_logs_list", [])
@@ -476,28 +781,37 @@ def render_audit_logs_tab():
         st.info("No admin actions logged yet.")
         return
     
-    for action in actions:
-        action_type = action.get("action_type", "Unknown")
-        admin_user = action.get("admin_user", "N/A")
-        details = action.get("details", "")
-        action_time = action.get("action_time", "N/A")
-        
-        st.markdown(f"""
-        <div style="background: rgba(30, 41, 59, 0.8); padding: 0.75rem 1rem; border-radius: 10px; 
-                    border-left: 3px solid {COLORS['primary']}; margin-bottom: 0.5rem;">
-            <div style="display: flex; justify-content: space-between;">
-                <strong style="color: {COLORS['text']};">{action_type}</strong>
-                <span style="color: {COLORS['text_muted']}; font-size: 0.85rem;">{action_time}</span>
-            </div>
-            <p style="margin: 0.25rem 0 0 0; color: {COLORS['text_muted']}; font-size: 0.9rem;">
-                By: {admin_user} | {details}
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+    # All rows in one markdown element - one delta instead of one per action
+    st.markdown("".join(
+        _AUDIT_ROW_TEMPLATE.format_map(ChainMap(action, _AUDIT_ROW_DEFAULTS)) for action in actions
+    ), unsafe_allow_html=True)
     
-    if st.button("🔄 Refresh Logs", key="refresh_logs"):
-        st.session_state.admin_logs_loaded = None
-        st.rerun()
+    # Keyset "Load more" - the next page starts below the oldest action shown
+    if st.session_state.get("admin_logs_has_more"):
+        st.button("⬇️ Load More", key="load_more_logs", on_click=_load_audit_logs,
+                  args=(actions[-1]["action_time"], actions[-1]["action_id"]))
+    
+    st.button("🔄 Refresh Logs", key="refresh_logs", on_click=_refresh_audit_logs)
+
+
+def _load_audit_logs(before=None, before_id: int = None):
+    """Load Logs / Load More callback - the first page, or the page below (`before`, `before_id`) appended."""
+    _set_audit_logs(_cached_admin_actions(limit=_AUDIT_PAGE_SIZE + 1, before=before, before_id=before_id),
+                    append=before is not None)
+
+
+def _refresh_audit_logs():
+    """Refresh button callback - drop the cached log; the tab shows its Load button again."""
+    _cached_admin_actions.clear()
+    st.session_state.admin_logs_loaded = None
+
+
+def _set_audit_logs(fetched: list, append: bool = False):
+    """Store a fetched audit page - one extra row was requested only to tell whether more exist."""
+    page = fetched[:_AUDIT_PAGE_SIZE]
+    st.session_state.admin_logs_list = st.session_state.get("admin_logs_list", []) + page if append else page
+    st.session_state.admin_logs_has_more = len(fetched) > _AUDIT_PAGE_SIZE
+    st.session_state.admin_logs_loaded = True
 
 
 def render_settings_tab():
@@ -509,15 +823,7 @@ def render_settings_tab():
     col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown(f"""
-        <div style="background: rgba(30, 41, 59, 0.8); padding: 1.5rem; border-radius: 16px;
-                    border: 1px solid {COLORS['border']};">
-            <h4 style="color: {COLORS['text']}; margin: 0 0 0.5rem 0;">🔌 Test Connection</h4>
-            <p style="color: {COLORS['text_muted']}; margin: 0 0 1rem 0; font-size: 0.9rem;">
-                Test database connection.
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_TEST_CONNECTION_CARD_HTML, unsafe_allow_html=True)
         
         if st.button("Test Connection", key="test_conn_btn", use_container_width=True):
             from database.connection import test_connection
@@ -529,47 +835,23 @@ def render_settings_tab():
                 st.error(f"Failed: {result}")
     
     with col2:
-        st.markdown(f"""
-        <div style="background: rgba(30, 41, 59, 0.8); padding: 1.5rem; border-radius: 16px;
-                    border: 1px solid {COLORS['border']};">
-            <h4 style="color: {COLORS['text']}; margin: 0 0 0.5rem 0;">📊 System Info</h4>
-            <p style="color: {COLORS['text_muted']}; margin: 0; font-size: 0.9rem;">
-                Free: 15 questions<br>
-                Pro: +75 questions<br>
-                Premium: 30 days unlimited
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_SYSTEM_INFO_CARD_HTML, unsafe_allow_html=True)
     
     # Debug info
     st.markdown("<br>", unsafe_allow_html=True)
     
     from database.connection import get_query_count
+    from config.settings import DEBUG_QUERIES
     st.markdown(f"""
     <div style="background: rgba(30, 41, 59, 0.8); padding: 1.5rem; border-radius: 16px;
                 border: 1px solid {COLORS['border']};">
         <h4 style="color: {COLORS['text']}; margin: 0 0 1rem 0;">🔍 Debug Info</h4>
         <p style="color: {COLORS['text_muted']}; margin: 0; font-size: 0.9rem;">
-            DB Queries this session: <strong style="color: {COLORS['secondary']};">{get_query_count()}</strong>
+            DB Queries this session: <strong style="color: {COLORS['secondary']};">{get_query_count() if DEBUG_QUERIES else "off (DEBUG_QUERIES)"}</strong>
         </p>
     </div>
     """, unsafe_allow_html=True)
     
     st.markdown("<br>", unsafe_allow_html=True)
     
-    st.markdown(f"""
-    <div style="background: rgba(30, 41, 59, 0.8); padding: 1.5rem; border-radius: 16px;
-                border: 1px solid {COLORS['border']};">
-        <h4 style="color: {COLORS['text']}; margin: 0 0 1rem 0;">💰 Pricing</h4>
-        <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1rem;">
-            <div>
-                <p style="color: {COLORS['text_muted']}; margin: 0;">Pro Plan</p>
-                <p style="color: {COLORS['primary']}; font-size: 1.5rem; font-weight: 700; margin: 0;">₱99</p>
-            </div>
-            <div>
-                <p style="color: {COLORS['text_muted']}; margin: 0;">Premium Plan</p>
-                <p style="color: {COLORS['accent']}; font-size: 1.5rem; font-weight: 700; margin: 0;">₱499</p>
-            </div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_PRICING_CARD_HTML, unsafe_allow_html=True)
@@ -5,10 +5,10 @@ OPTIMIZED: Session state caching, no DB queries
 
 import streamlit as st
 
-from components.auth import get_current_user
-from services.usage_tracker import get_cached_user_status, get_user_status
+from components.auth import get_current_user, set_current_page
+from services.usage_tracker import get_cached_user_status
 from config.settings import (
-    COLORS, APP_NAME, APP_DESCRIPTION, PLAN_FREE, PLAN_PRO, PLAN_PREMIUM,
+    COLORS, PLAN_COLORS, APP_NAME, APP_DESCRIPTION, PLAN_FREE,
     EDUCATION_LEVELS, ELEMENTARY_SPECIALIZATIONS, SECONDARY_SPECIALIZATIONS,
     EXAM_COMPONENTS
 )
@@ -24,9 +24,6 @@ def render_home_page():
     
     # Use cached status - NO DB query
     status = get_cached_user_status()
-    if not status:
-        status = get_user_status(user)
-        st.session_state.user_status = status
     is_free_user = status["plan"] == PLAN_FREE
     
     # Header with gradient
@@ -67,12 +64,7 @@ def render_home_page():
     
     col1, col2, col3, col4 = st.columns(4)
     
-    plan_colors = {
-        PLAN_FREE: COLORS["text_muted"],
-        PLAN_PRO: COLORS["primary"],
-        PLAN_PREMIUM: COLORS["accent"]
-    }
-    plan_color = plan_colors.get(status["plan"], COLORS["text_muted"])
+    plan_color = PLAN_COLORS.get(status["plan"], COLORS["text_muted"])
     
     with col1:
         st.markdown(f"""
@@ -170,9 +162,7 @@ def render_home_page():
             </div>
             """, unsafe_allow_html=True)
             
-            if st.button("💳 Upgrade Now", key="home_upload_btn", use_container_width=True, type="primary"):
-                st.session_state.current_page = "upgrade"
-                st.rerun()
+            st.button("💳 Upgrade Now", key="home_upload_btn", use_container_width=True, type="primary", on_click=set_current_page, args=("upgrade",))
         else:
             st.markdown(f"""
             <div style="background: linear-gradient(135deg, rgba(6, 182, 212, 0.15) 0%, rgba(30, 41, 59, 0.8) 100%);
@@ -188,9 +178,7 @@ def render_home_page():
             </div>
             """, unsafe_allow_html=True)
             
-            if st.button("📄 Go to Upload", key="home_upload_btn", use_container_width=True, type="primary"):
-                st.session_state.current_page = "upload"
-                st.rerun()
+            st.button("📄 Go to Upload", key="home_upload_btn", use_container_width=True, type="primary", on_click=set_current_page, args=("upload",))
     
     with col2:
         st.markdown(f"""
@@ -207,9 +195,7 @@ def render_home_page():
         </div>
         """, unsafe_allow_html=True)
         
-        if st.button("🧠 Start Practice", key="home_practice_btn", use_container_width=True, type="primary"):
-            st.session_state.current_page = "practice"
-            st.rerun()
+        st.button("🧠 Start Practice", key="home_practice_btn", use_container_width=True, type="primary", on_click=set_current_page, args=("practice",))
     
     col1, col2 = st.columns(2)
     
@@ -227,9 +213,7 @@ def render_home_page():
         </div>
         """, unsafe_allow_html=True)
         
-        if st.button("💳 View Plans", key="home_upgrade_btn", use_container_width=True):
-            st.session_state.current_page = "upgrade"
-            st.rerun()
+        st.button("💳 View Plans", key="home_upgrade_btn", use_container_width=True, on_click=set_current_page, args=("upgrade",))
     
     with col2:
         st.markdown(f"""
@@ -3,18 +3,138 @@ LEPT AI Reviewer - Practice Exam Page
 OPTIMIZED: Session state caching, minimal DB queries
 """
 
+import io
+
 import streamlit as st
 
-from components.auth import get_current_user
-from services.usage_tracker import get_user_status, can_generate_questions, use_questions, get_cached_user_status
+from components.auth import get_current_user, set_current_page
+from services.usage_tracker import can_generate_questions, use_questions, get_cached_user_status
 from utils.ip_utils import get_client_ip
 from config.settings import (
-    COLORS, EXAM_COMPONENTS, DIFFICULTY_LEVELS, QUESTIONS_PER_BATCH,
-    PLAN_FREE, PLAN_PRO, PLAN_PREMIUM,
-    EDUCATION_LEVELS, ELEMENTARY_SPECIALIZATIONS, SECONDARY_SPECIALIZATIONS
+    COLORS, PLAN_COLORS, EXAM_COMPONENTS, DIFFICULTY_LEVELS, QUESTIONS_PER_BATCH,
+    PLAN_FREE, PLAN_PREMIUM,
+    EDUCATION_LEVELS, ELEMENTARY_SPECIALIZATIONS, SECONDARY_SPECIALIZATIONS,
+    FREE_QUESTION_LIMIT, AI_DOCUMENT_CONTEXT_CHARS
 )
 
 
+# ============== STATIC HTML (built once at import) ==============
+# Per-render values stay as {placeholders} for str.format
+
+_PRACTICE_HEADER_HTML = f"""
+<div style="padding: 2rem; 
+            background: linear-gradient(135deg, rgba(99, 102, 241, 0.2) 0%, rgba(6, 182, 212, 0.1) 100%);
+            border-radius: 20px; margin-bottom: 1.5rem;
+            border: 1px solid {COLORS['border']};">
+    <h2 style="color: {COLORS['text']}; margin: 0; display: flex; align-items: center; gap: 0.5rem;">
+        <span>🧠</span> Practice Exam
+    </h2>
+    <p style="color: {COLORS['text_muted']}; margin: 0.5rem 0 0 0;">
+        Configure your exam settings below and click <strong style="color: {COLORS['secondary']};">Generate Practice Questions</strong> to start.
+    </p>
+</div>
+"""
+
+_STATS_ROW_TEMPLATE = f"""
+<div style="display: flex; gap: 1rem; margin-bottom: 1.5rem;">
+    <div style="flex: 1; background: rgba(6, 182, 212, 0.15); padding: 1.25rem; border-radius: 16px; 
+                text-align: center; border: 1px solid {COLORS['border']};">
+        <p style="margin: 0; font-size: 0.85rem; color: {COLORS['text_muted']};">Questions Left</p>
+        <p style="margin: 0.25rem 0 0 0; font-size: 2rem; font-weight: 700; color: {{questions_color}};">
+            {{display_questions}}
+        </p>
+    </div>
+    <div style="flex: 1; background: rgba(99, 102, 241, 0.15); padding: 1.25rem; border-radius: 16px; 
+                text-align: center; border: 1px solid {COLORS['border']};">
+        <p style="margin: 0; font-size: 0.85rem; color: {COLORS['text_muted']};">Current Plan</p>
+        <p style="margin: 0.25rem 0 0 0; font-size: 2rem; font-weight: 700; color: {{plan_color}};">
+            {{plan}}
+        </p>
+    </div>
+    <div style="flex: 1; background: rgba(139, 92, 246, 0.15); padding: 1.25rem; border-radius: 16px; 
+                text-align: center; border: 1px solid {COLORS['border']};">
+        <p style="margin: 0; font-size: 0.85rem; color: {COLORS['text_muted']};">Question Source</p>
+        <p style="margin: 0.25rem 0 0 0; font-size: 1.2rem; font-weight: 700; color: {{source_color}};">
+            {{question_source}}
+        </p>
+    </div>
+</div>
+"""
+
+_OUT_OF_QUESTIONS_HTML = f"""
+<div style="background: rgba(239, 68, 68, 0.15); padding: 1.5rem; border-radius: 16px;
+            border: 2px solid {COLORS['error']}; margin-bottom: 1rem; text-align: center;">
+    <div style="font-size: 3rem; margin-bottom: 0.75rem;">😔</div>
+    <h3 style="color: {COLORS['error']}; margin: 0 0 0.5rem 0;">You have no questions left!</h3>
+    <p style="color: {COLORS['text_muted']}; margin: 0 0 1rem 0;">You've used all {FREE_QUESTION_LIMIT} free questions.</p>
+</div>
+"""
+
+_FREE_MODE_TEMPLATE = f"""
+<div style="background: rgba(245, 158, 11, 0.1); padding: 1rem; border-radius: 12px;
+            border: 1px solid rgba(245, 158, 11, 0.3); margin-bottom: 1rem;">
+    <p style="margin: 0; color: {COLORS['text']};">
+        <strong>📚 FREE Mode:</strong> You have <strong style="color: {COLORS['warning']};">{{questions_remaining}}</strong> questions remaining.
+        Each session uses <strong>{QUESTIONS_PER_BATCH}</strong> from your quota.
+    </p>
+</div>
+<div style="background: linear-gradient(135deg, rgba(139, 92, 246, 0.15) 0%, rgba(99, 102, 241, 0.1) 100%);
+            padding: 1rem; border-radius: 12px; margin-bottom: 1rem;
+            border: 1px solid {COLORS['accent']};">
+    <p style="margin: 0; color: {COLORS['text']}; font-size: 0.9rem;">
+        <strong style="color: {COLORS['accent']};">📚✨ PRO/PREMIUM:</strong> 
+        Download admin reviewers & generate AI questions from your materials!
+    </p>
+</div>
+"""
+
+_CONFIG_PANEL_OPEN_HTML = f"""
+<div style="background: rgba(30, 41, 59, 0.8); padding: 1.5rem; border-radius: 16px;
+            border: 1px solid {COLORS['border']}; margin-bottom: 1rem;">
+    <h4 style="color: {COLORS['text']}; margin: 0 0 1rem 0;">⚙️ Exam Configuration</h4>
+"""
+
+_WILL_GENERATE_TEMPLATE = f"""
+<div style="background: rgba(99, 102, 241, 0.1); padding: 0.75rem 1rem; border-radius: 10px;
+            border-left: 4px solid {COLORS['primary']}; margin-bottom: 1rem;">
+    <p style="margin: 0; color: {COLORS['text']}; font-size: 0.9rem;">
+        📝 Generating: <strong>{{component_name}}</strong> questions {{target}}{{docs}}
+    </p>
+</div>
+"""
+
+_QUESTION_CARD_TEMPLATE = f"""
+<div style="background: rgba(30, 41, 59, 0.8); padding: 1.5rem; border-radius: 16px; 
+            border: 1px solid {COLORS['border']}; margin-bottom: 1rem;">
+    <h4 style="color: {COLORS['primary']}; margin: 0 0 1rem 0;">Question {{number}}</h4>
+    <p style="color: {COLORS['text']}; font-size: 1.05rem; line-height: 1.6; margin: 0;">{{question}}</p>
+</div>
+"""
+
+# Answer review - one option per line, colored like st.success / st.error / muted text
+_REVIEW_OPTION_TEMPLATE = """<p style="padding: 0.5rem 1rem; margin: 0 0 0.25rem 0; border-radius: 8px; {style}">{mark}{key}. {value}</p>"""
+_REVIEW_CORRECT_STYLE = f"background: {COLORS['success']}22; color: {COLORS['success']};"
+_REVIEW_WRONG_STYLE = f"background: {COLORS['error']}22; color: {COLORS['error']};"
+_REVIEW_OTHER_STYLE = f"color: {COLORS['text_muted']};"
+
+_EXPLANATION_TEMPLATE = f"""
+<div style="background: {COLORS['secondary']}1A; padding: 0.75rem 1rem; border-radius: 8px; 
+            color: {COLORS['text']}; margin-top: 0.5rem;">
+    <strong>Explanation:</strong> {{explanation}}
+</div>
+"""
+
+_GENERATE_PANEL_HTML = f"""
+<div style="background: rgba(30, 41, 59, 0.8); padding: 1.5rem; border-radius: 16px;
+            border: 1px solid {COLORS['border']}; margin-bottom: 1rem;">
+    <h4 style="color: {COLORS['text']}; margin: 0 0 0.5rem 0;">🎯 Generate Questions</h4>
+    <p style="color: {COLORS['text_muted']}; margin: 0;">
+        Generate {QUESTIONS_PER_BATCH} questions. Uses <strong style="color: {COLORS['warning']};">{QUESTIONS_PER_BATCH}</strong> from your quota.
+    </p>
+</div>
+"""
+
+
 def render_practice_page():
     """Render the practice exam page - OPTIMIZED."""
     user = get_current_user()
@@ -27,188 +147,94 @@ def render_practice_page():
     
     # Use cached status from session state - NO DB query
     status = get_cached_user_status()
-    if not status:
-        status = get_user_status(user)
-        st.session_state.user_status = status
     
     is_free_user = status["plan"] == PLAN_FREE
     questions_remaining = user.get("questions_remaining", 0)
     
-    # Header
-    st.markdown(f"""
-    <div style="padding: 2rem; 
-                background: linear-gradient(135deg, rgba(99, 102, 241, 0.2) 0%, rgba(6, 182, 212, 0.1) 100%);
-                border-radius: 20px; margin-bottom: 1.5rem;
-                border: 1px solid {COLORS['border']};">
-        <h2 style="color: {COLORS['text']}; margin: 0; display: flex; align-items: center; gap: 0.5rem;">
-            <span>🧠</span> Practice Exam
-        </h2>
-        <p style="color: {COLORS['text_muted']}; margin: 0.5rem 0 0 0;">
-            Configure your exam settings below and click <strong style="color: {COLORS['secondary']};">Generate Practice Questions</strong> to start.
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
-    
     # Check if user can generate questions - no DB query, uses user dict
     can_gen, reason = can_generate_questions(user)
     
-    # Display stats
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        questions_color = COLORS['error'] if questions_remaining <= 0 else (COLORS['warning'] if questions_remaining <= 5 else COLORS['secondary'])
-        display_questions = "Unlimited" if status["plan"] == PLAN_PREMIUM and status.get("expiry_display") != "Expired" else str(questions_remaining)
-        st.markdown(f"""
-        <div style="background: rgba(6, 182, 212, 0.15); padding: 1.25rem; border-radius: 16px; 
-                    text-align: center; border: 1px solid {COLORS['border']};">
-            <p style="margin: 0; font-size: 0.85rem; color: {COLORS['text_muted']};">Questions Left</p>
-            <p style="margin: 0.25rem 0 0 0; font-size: 2rem; font-weight: 700; color: {questions_color};">
-                {display_questions}
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        plan_color = COLORS['accent'] if status['plan'] == PLAN_PREMIUM else (COLORS['primary'] if status['plan'] == PLAN_PRO else COLORS['text_muted'])
-        st.markdown(f"""
-        <div style="background: rgba(99, 102, 241, 0.15); padding: 1.25rem; border-radius: 16px; 
-                    text-align: center; border: 1px solid {COLORS['border']};">
-            <p style="margin: 0; font-size: 0.85rem; color: {COLORS['text_muted']};">Current Plan</p>
-            <p style="margin: 0.25rem 0 0 0; font-size: 2rem; font-weight: 700; color: {plan_color};">
-                {status['plan']}
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        question_source = "AI Generated" if not is_free_user else "Preset Questions"
-        source_color = COLORS['success'] if not is_free_user else COLORS['warning']
-        st.markdown(f"""
-        <div style="background: rgba(139, 92, 246, 0.15); padding: 1.25rem; border-radius: 16px; 
-                    text-align: center; border: 1px solid {COLORS['border']};">
-            <p style="margin: 0; font-size: 0.85rem; color: {COLORS['text_muted']};">Question Source</p>
-            <p style="margin: 0.25rem 0 0 0; font-size: 1.2rem; font-weight: 700; color: {source_color};">
-                {question_source}
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+    questions_color = COLORS['error'] if questions_remaining <= 0 else (COLORS['warning'] if questions_remaining <= 5 else COLORS['secondary'])
+    display_questions = "Unlimited" if status["plan"] == PLAN_PREMIUM and status.get("expiry_display") != "Expired" else str(questions_remaining)
+    plan_color = PLAN_COLORS.get(status['plan'], COLORS['text_muted'])
+    question_source = "AI Generated" if not is_free_user else "Preset Questions"
+    source_color = COLORS['success'] if not is_free_user else COLORS['warning']
     
-    st.markdown("<br>", unsafe_allow_html=True)
+    # Header and stats in one markdown element - the three stat cards are a
+    # flex row rather than st.columns, so no layout deltas either
+    st.markdown(_PRACTICE_HEADER_HTML + _STATS_ROW_TEMPLATE.format(
+        questions_color=questions_color, display_questions=display_questions,
+        plan_color=plan_color, plan=status['plan'],
+        source_color=source_color, question_source=question_source,
+    ), unsafe_allow_html=True)
     
     # Out of questions - prompt upgrade
     if not can_gen and questions_remaining <= 0:
-        from config.settings import FREE_QUESTION_LIMIT
-        st.markdown(f"""
-        <div style="background: rgba(239, 68, 68, 0.15); padding: 1.5rem; border-radius: 16px;
-                    border: 2px solid {COLORS['error']}; margin-bottom: 1rem; text-align: center;">
-            <div style="font-size: 3rem; margin-bottom: 0.75rem;">😔</div>
-            <h3 style="color: {COLORS['error']}; margin: 0 0 0.5rem 0;">You have no questions left!</h3>
-            <p style="color: {COLORS['text_muted']}; margin: 0 0 1rem 0;">You've used all {FREE_QUESTION_LIMIT} free questions.</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_OUT_OF_QUESTIONS_HTML, unsafe_allow_html=True)
         
-        if st.button("💳 Upgrade Now to Continue", key="upgrade_from_practice", use_container_width=True, type="primary"):
-            st.session_state.current_page = "upgrade"
-            st.rerun()
+        st.button("💳 Upgrade Now to Continue", key="upgrade_from_practice", use_container_width=True, type="primary", on_click=set_current_page, args=("upgrade",))
         return
     
-    # Info for free users
+    # Info for free users - quota notice and PRO/PREMIUM highlight in one element
     if is_free_user:
-        st.markdown(f"""
-        <div style="background: rgba(245, 158, 11, 0.1); padding: 1rem; border-radius: 12px;
-                    border: 1px solid rgba(245, 158, 11, 0.3); margin-bottom: 1rem;">
-            <p style="margin: 0; color: {COLORS['text']};">
-                <strong>📚 FREE Mode:</strong> You have <strong style="color: {COLORS['warning']};">{questions_remaining}</strong> questions remaining.
-                Each session uses <strong>{QUESTIONS_PER_BATCH}</strong> from your quota.
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # PRO/PREMIUM benefit highlight
-        st.markdown(f"""
-        <div style="background: linear-gradient(135deg, rgba(139, 92, 246, 0.15) 0%, rgba(99, 102, 241, 0.1) 100%);
-                    padding: 1rem; border-radius: 12px; margin-bottom: 1rem;
-                    border: 1px solid {COLORS['accent']};">
-            <p style="margin: 0; color: {COLORS['text']}; font-size: 0.9rem;">
-                <strong style="color: {COLORS['accent']};">📚✨ PRO/PREMIUM:</strong> 
-                Download admin reviewers & generate AI questions from your materials!
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    # Exam configuration - all widgets, no DB queries
-    st.markdown(f"""
-    <div style="background: rgba(30, 41, 59, 0.8); padding: 1.5rem; border-radius: 16px;
-                border: 1px solid {COLORS['border']}; margin-bottom: 1rem;">
-        <h4 style="color: {COLORS['text']}; margin: 0 0 1rem 0;">⚙️ Exam Configuration</h4>
-    """, unsafe_allow_html=True)
+        st.markdown(_FREE_MODE_TEMPLATE.format(questions_remaining=questions_remaining), unsafe_allow_html=True)
     
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        education_level = st.selectbox(
-            "📚 Education Level",
-            options=list(EDUCATION_LEVELS.keys()),
-            format_func=lambda x: EDUCATION_LEVELS[x],
-            key="education_level_select"
-        )
-    
-    with col2:
-        specializations = ELEMENTARY_SPECIALIZATIONS if education_level == "elementary" else SECONDARY_SPECIALIZATIONS
-        specialization = st.selectbox(
-            "🎯 Specialization",
-            options=specializations,
-            key="specialization_select"
-        )
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        exam_component = st.selectbox(
-            "📋 Exam Component",
-            options=list(EXAM_COMPONENTS.keys()),
-            format_func=lambda x: f"{EXAM_COMPONENTS[x]['name']} ({EXAM_COMPONENTS[x]['weight']}%)",
-            key="exam_component_select"
-        )
-    
-    with col2:
-        difficulty = st.select_slider(
-            "📊 Difficulty Level",
-            options=DIFFICULTY_LEVELS,
-            value="Medium",
-            key="difficulty_select"
-        )
-    
-    st.markdown("</div>", unsafe_allow_html=True)
-    
-    component_name = EXAM_COMPONENTS[exam_component]['name']
-    st.markdown(f"""
-    <div style="background: rgba(99, 102, 241, 0.1); padding: 0.75rem 1rem; border-radius: 10px;
-                border-left: 4px solid {COLORS['primary']}; margin-bottom: 1rem;">
-        <p style="margin: 0; color: {COLORS['text']}; font-size: 0.9rem;">
-            📝 Will generate: <strong>{component_name}</strong> questions 
-            {f'for <strong>{specialization}</strong> teachers' if exam_component != 'general_education' else '(foundational subjects)'}
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    is_premium = status["plan"] == PLAN_PREMIUM and status.get("expiry_display") != "Expired"
+    can_generate = questions_remaining >= QUESTIONS_PER_BATCH or is_premium
     
-    # Document selection for PRO/PREMIUM - LAZY LOAD
-    selected_docs = []
+    # Exam configuration - all widgets, no DB queries
+    st.markdown(_CONFIG_PANEL_OPEN_HTML, unsafe_allow_html=True)
+    
+    # Education level stays outside the form: the specialization options depend on it
+    education_level = st.selectbox(
+        "📚 Education Level",
+        options=list(EDUCATION_LEVELS.keys()),
+        format_func=lambda x: EDUCATION_LEVELS[x],
+        key="education_level_select"
+    )
+    
+    # Document lists are fetched on demand - buttons cannot live inside a form
+    if not is_free_user and not st.session_state.get("practice_docs_loaded", False):
+        if st.button("📄 Load My Documents for AI Generation (Optional)", key="load_docs_btn"):
+            from database.queries import get_user_documents, get_admin_documents
+            st.session_state.user_docs_cache = get_user_documents(email)
+            st.session_state.admin_docs_cache = get_admin_documents() if status.get("can_use_admin_docs") else []
+            st.session_state.practice_docs_loaded = True
+            st.rerun()
     
-    if not is_free_user:
-        # Only fetch documents when needed (not on every rerun)
-        if "practice_docs_loaded" not in st.session_state:
-            st.session_state.practice_docs_loaded = False
+    # Everything else is one form - changing a selection or ticking a document
+    # no longer reruns the page; only Generate does
+    with st.form("generate_form", clear_on_submit=False):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            specializations = ELEMENTARY_SPECIALIZATIONS if education_level == "elementary" else SECONDARY_SPECIALIZATIONS
+            specialization = st.selectbox(
+                "🎯 Specialization",
+                options=specializations,
+                key="specialization_select"
+            )
+            
+            exam_component = st.selectbox(
+                "📋 Exam Component",
+                options=list(EXAM_COMPONENTS.keys()),
+                format_func=lambda x: f"{EXAM_COMPONENTS[x]['name']} ({EXAM_COMPONENTS[x]['weight']}%)",
+                key="exam_component_select"
+            )
         
-        with st.expander("📄 Select Reviewer Documents for AI Generation (Optional)", expanded=False):
-            if not st.session_state.practice_docs_loaded:
-                if st.button("Load My Documents", key="load_docs_btn"):
-                    from database.queries import get_user_documents, get_admin_documents
-                    st.session_state.user_docs_cache = get_user_documents(email)
-                    st.session_state.admin_docs_cache = get_admin_documents() if status.get("can_use_admin_docs") else []
-                    st.session_state.practice_docs_loaded = True
-                    st.rerun()
-            else:
+        with col2:
+            difficulty = st.select_slider(
+                "📊 Difficulty Level",
+                options=DIFFICULTY_LEVELS,
+                value="Medium",
+                key="difficulty_select"
+            )
+        
+        # Document selection for PRO/PREMIUM - only once loaded
+        selected_docs = []
+        
+        if not is_free_user and st.session_state.get("practice_docs_loaded", False):
+            with st.expander("📄 Select Reviewer Documents for AI Generation (Optional)", expanded=False):
                 user_docs = st.session_state.get("user_docs_cache", [])
                 admin_docs = st.session_state.get("admin_docs_cache", [])
                 
@@ -219,57 +245,50 @@ def render_practice_page():
                     </p>
                     """, unsafe_allow_html=True)
                     
-                    if user_docs:
-                        st.markdown(f"**👤 My Documents ({len(user_docs)})**")
-                        for doc in user_docs:
-                            doc["source"] = "user"
-                            if st.checkbox(f"📄 {doc['filename']}", key=f"doc_user_{doc['doc_id']}"):
-                                selected_docs.append(doc)
+                    # One multiselect for both libraries instead of a checkbox per document;
+                    # options are (source, doc_id) since user and admin ids can collide
+                    docs_by_option = {("user", doc["doc_id"]): doc for doc in user_docs}
+                    docs_by_option.update({("admin", doc["doc_id"]): doc for doc in admin_docs})
                     
-                    if admin_docs:
-                        st.markdown(f"**📚 Admin Library ({len(admin_docs)})**")
-                        for doc in admin_docs:
-                            doc["source"] = "admin"
-                            category = doc.get("category", "General")
-                            has_text = doc.get("extracted_text") is not None
-                            label = f"📚 {doc['filename']} [{category}] {'✅' if has_text else '⚠️'}"
-                            if st.checkbox(label, key=f"doc_admin_{doc['doc_id']}"):
-                                selected_docs.append(doc)
+                    def doc_label(option):
+                        doc = docs_by_option[option]
+                        if option[0] == "user":
+                            return f"📄 {doc['filename']}"
+                        return f"📚 {doc['filename']} [{doc.get('category', 'General')}] {'✅' if doc.get('has_text') else '⚠️'}"
                     
-                    if selected_docs:
-                        st.success(f"✅ {len(selected_docs)} document(s) selected")
+                    picked = st.multiselect(
+                        f"Documents ({len(user_docs)} mine, {len(admin_docs)} admin library)",
+                        options=list(docs_by_option),
+                        format_func=doc_label,
+                        key="practice_doc_select"
+                    )
+                    selected_docs = [{**docs_by_option[option], "source": option[0]} for option in picked]
                 else:
                     st.info("No documents available. Upload reviewers or wait for admin to add materials.")
+        
+        st.markdown(_GENERATE_PANEL_HTML, unsafe_allow_html=True)
+        
+        generate_submit = st.form_submit_button(
+            "🚀 Generate Practice Questions", use_container_width=True, type="primary",
+            disabled=not can_generate
+        )
     
-    # Generate button section
-    is_premium = status["plan"] == PLAN_PREMIUM and status.get("expiry_display") != "Expired"
-    can_generate = questions_remaining >= QUESTIONS_PER_BATCH or is_premium
-    
-    st.markdown(f"""
-    <div style="background: rgba(30, 41, 59, 0.8); padding: 1.5rem; border-radius: 16px;
-                border: 1px solid {COLORS['border']}; margin-bottom: 1rem;">
-        <h4 style="color: {COLORS['text']}; margin: 0 0 0.5rem 0;">🎯 Generate Questions</h4>
-        <p style="color: {COLORS['text_muted']}; margin: 0;">
-            Generate {QUESTIONS_PER_BATCH} questions. Uses <strong style="color: {COLORS['warning']};">{QUESTIONS_PER_BATCH}</strong> from your quota.
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
     
     if not can_generate:
         st.error(f"🚫 You have **{questions_remaining}** questions left. Need at least **{QUESTIONS_PER_BATCH}**.")
-        if st.button("💳 Upgrade to Continue", key="upgrade_not_enough", use_container_width=True, type="primary"):
-            st.session_state.current_page = "upgrade"
-            st.rerun()
-    else:
-        # Use a form to prevent reruns on button click until submitted
-        with st.form("generate_form", clear_on_submit=False):
-            generate_submit = st.form_submit_button("🚀 Generate Practice Questions", use_container_width=True, type="primary")
-            
-            if generate_submit:
-                handle_question_generation(
-                    email, user, status, is_free_user, is_premium,
-                    education_level, exam_component, specialization, difficulty, selected_docs
-                )
+        st.button("💳 Upgrade to Continue", key="upgrade_not_enough", use_container_width=True, type="primary", on_click=set_current_page, args=("upgrade",))
+    elif generate_submit:
+        component_name = EXAM_COMPONENTS[exam_component]['name']
+        st.markdown(_WILL_GENERATE_TEMPLATE.format(
+            component_name=component_name,
+            target=f'for <strong>{specialization}</strong> teachers' if exam_component != 'general_education' else '(foundational subjects)',
+            docs=f" from {len(selected_docs)} document(s)" if selected_docs else "",
+        ), unsafe_allow_html=True)
+        handle_question_generation(
+            email, user, status, is_free_user, is_premium,
+            education_level, exam_component, specialization, difficulty, selected_docs
+        )
     
     # Display quiz if questions exist
     if "current_questions" in st.session_state and st.session_state.current_questions:
@@ -282,7 +301,6 @@ def handle_question_generation(email, user, status, is_free_user, is_premium,
     """Handle question generation - separated for cleaner code."""
     # Fresh check for question count
     from database.queries import get_fresh_user_by_email
-    from services.usage_tracker import refresh_user_session
     
     fresh_user = get_fresh_user_by_email(email)
     fresh_remaining = fresh_user.get("questions_remaining", 0) if fresh_user else 0
@@ -307,17 +325,37 @@ def handle_question_generation(email, user, status, is_free_user, is_premium,
             # Collect document content if any documents are selected
             doc_content = ""
             if selected_docs:
-                from database.queries import get_admin_document_text
-                doc_texts = []
-                for doc in selected_docs:
+                from database.queries import get_admin_document_text, get_user_document_text
+                from database.connection import run_parallel
+                
+                # The prompt keeps at most AI_DOCUMENT_CONTEXT_CHARS, so no document needs more
+                def fetch_doc_text(doc):
                     if doc.get("source") == "admin":
-                        doc_data = get_admin_document_text(doc.get("doc_id"))
+                        doc_data = get_admin_document_text(doc.get("doc_id"), max_chars=AI_DOCUMENT_CONTEXT_CHARS)
                         if doc_data and doc_data.get("text"):
-                            doc_texts.append(f"--- {doc_data['filename']} ---\n{doc_data['text'][:8000]}")
-                    elif doc.get("extracted_text"):
-                        doc_texts.append(f"--- {doc.get('filename')} ---\n{doc.get('extracted_text')[:8000]}")
-                if doc_texts:
-                    doc_content = "\n\n".join(doc_texts)
+                            return doc_data["filename"], doc_data["text"]
+                    elif doc.get("has_text"):
+                        text = get_user_document_text(doc.get("doc_id"), email, max_chars=AI_DOCUMENT_CONTEXT_CHARS)
+                        if text:
+                            return doc.get("filename"), text
+                    return None
+                
+                # Independent reads - fetched concurrently, one pooled connection each, in selection order.
+                # The text getters are st.cache_data wrappers; run_parallel gives each worker this
+                # script's run context, so they hit and fill the same caches as a serial loop would.
+                doc_texts = run_parallel(*(lambda d=doc: fetch_doc_text(d) for doc in selected_docs))
+                
+                # Fill the prompt budget in order - stop once it is spent
+                buffer = io.StringIO()
+                budget = AI_DOCUMENT_CONTEXT_CHARS
+                for entry in filter(None, doc_texts):
+                    if budget <= 0:
+                        break
+                    filename, text = entry
+                    chunk = f"--- {filename} ---\n{text}\n\n"[:budget]
+                    buffer.write(chunk)
+                    budget -= len(chunk)
+                doc_content = buffer.getvalue()
             
             # Generate questions using enhanced AI generator
             # The AI will use LEPT competencies if document is not relevant
@@ -345,17 +383,16 @@ def handle_question_generation(email, user, status, is_free_user, is_premium,
             "difficulty": difficulty
         }
         
-        # Update session state with new user data
-        refresh_user_session(force=True)
-        
+        # use_questions already put the balance returned by the UPDATE into session state
         st.success(f"✅ Generated {len(questions)} questions!")
         st.rerun()
     else:
         st.error("Failed to generate questions. Please try again.")
 
 
+@st.fragment
 def render_quiz_section(user, email):
-    """Render quiz section - minimal processing."""
+    """Render quiz section - FRAGMENT: answering and checking rerun only the quiz, not the whole app."""
     questions = st.session_state.current_questions
     exam_info = st.session_state.get("exam_info", {})
     
@@ -378,29 +415,25 @@ def render_quiz_section(user, email):
     show_results = st.session_state.get("show_results", False)
     
     for i, q in enumerate(questions):
-        st.markdown(f"""
-        <div style="background: rgba(30, 41, 59, 0.8); padding: 1.5rem; border-radius: 16px; 
-                    border: 1px solid {COLORS['border']}; margin-bottom: 1rem;">
-            <h4 style="color: {COLORS['primary']}; margin: 0 0 1rem 0;">Question {i + 1}</h4>
-            <p style="color: {COLORS['text']}; font-size: 1.05rem; line-height: 1.6; margin: 0;">{q['question']}</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
+        question_html = _QUESTION_CARD_TEMPLATE.format(number=i + 1, question=q['question'])
         options = q.get("options", {})
         correct_answer = q.get("correct_answer", "")
         
         if show_results:
+            # Question, marked options and explanation as one element
             selected = st.session_state.current_answers.get(f"q_{i}", "")
-            for key, value in options.items():
-                if key == correct_answer:
-                    st.success(f"✓ {key}. {value}")
-                elif key == selected and selected != correct_answer:
-                    st.error(f"✗ {key}. {value}")
-                else:
-                    st.markdown(f"<p style='color: {COLORS['text_muted']}; padding: 0.5rem 1rem;'>{key}. {value}</p>", unsafe_allow_html=True)
-            
-            st.info(f"**Explanation:** {q.get('explanation', 'No explanation.')}")
+            st.markdown(question_html + "".join(
+                _REVIEW_OPTION_TEMPLATE.format(
+                    style=_REVIEW_CORRECT_STYLE if key == correct_answer
+                    else (_REVIEW_WRONG_STYLE if key == selected else _REVIEW_OTHER_STYLE),
+                    mark="✓ " if key == correct_answer else ("✗ " if key == selected else ""),
+                    key=key, value=value,
+                )
+                for key, value in options.items()
+            ) + _EXPLANATION_TEMPLATE.format(explanation=q.get('explanation', 'No explanation.')),
+                unsafe_allow_html=True)
         else:
+            st.markdown(question_html, unsafe_allow_html=True)
             answer = st.radio(
                 f"Q{i+1}:",
                 options=["A", "B", "C", "D"],
@@ -418,8 +451,13 @@ def render_quiz_section(user, email):
     with col1:
         if not show_results:
             if st.button("📊 Check Answers", key="check_answers_btn", use_container_width=True, type="primary"):
+                # Scored once here; later reruns just read the stored result
+                answers = st.session_state.current_answers
+                st.session_state.quiz_score = sum(
+                    1 for i, q in enumerate(questions) if answers.get(f"q_{i}") == q.get("correct_answer")
+                )
                 st.session_state.show_results = True
-                st.rerun()
+                st.rerun(scope="fragment")
     
     with col2:
         if st.button("🔄 New Questions", key="new_questions_btn", use_container_width=True):
@@ -428,11 +466,11 @@ def render_quiz_section(user, email):
             st.session_state.show_results = False
             st.session_state.exam_info = {}
             st.session_state.practice_docs_loaded = False
+            # Full rerun - the generator form outside the fragment must come back
             st.rerun()
     
     if show_results:
-        correct_count = sum(1 for i, q in enumerate(questions) 
-                          if st.session_state.current_answers.get(f"q_{i}") == q.get("correct_answer"))
+        correct_count = st.session_state.get("quiz_score", 0)
         score_percent = (correct_count / len(questions)) * 100
         
         score_color = COLORS["success"] if score_percent >= 80 else (COLORS["warning"] if score_percent >= 60 else COLORS["error"])
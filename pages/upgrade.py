@@ -7,7 +7,7 @@ import streamlit as st
 
 from components.auth import get_current_user
 from components.alerts import show_email_warning, show_payment_pending_banner
-from services.usage_tracker import get_user_status
+from services.usage_tracker import get_cached_user_status
 from services.payment_handler import submit_payment_request, get_user_payment_status, get_plan_details
 from utils.validators import validate_full_name, validate_email
 from config.settings import (
@@ -17,6 +17,14 @@ from config.settings import (
 )
 
 
+# Payment status -> (color, label), built once at import
+_PAYMENT_STATUS_BADGES = {
+    PAYMENT_PENDING: (COLORS["warning"], "⏳ PENDING"),
+    PAYMENT_APPROVED: (COLORS["success"], "✅ APPROVED"),
+    PAYMENT_REJECTED: (COLORS["error"], "❌ REJECTED")
+}
+
+
 def render_upgrade_page():
     """Render the upgrade/payment page with modern techy theme."""
     user = get_current_user()
@@ -26,7 +34,7 @@ def render_upgrade_page():
         return
     
     email = user.get("email", "")
-    status = get_user_status(user)
+    status = get_cached_user_status()
     payment_status = get_user_payment_status(email)
     
     # Header
@@ -259,12 +267,7 @@ def render_upgrade_page():
         st.info("No payment history yet.")
     else:
         for payment in payments:
-            status_colors = {
-                PAYMENT_PENDING: (COLORS["warning"], "⏳ PENDING"),
-                PAYMENT_APPROVED: (COLORS["success"], "✅ APPROVED"),
-                PAYMENT_REJECTED: (COLORS["error"], "❌ REJECTED")
-            }
-            status_info = status_colors.get(payment.get("status"), (COLORS["text_muted"], "UNKNOWN"))
+            status_info = _PAYMENT_STATUS_BADGES.get(payment.get("status"), (COLORS["text_muted"], "UNKNOWN"))
             
             st.markdown(f"""
             <div style="background: rgba(30, 41, 59, 0.8); padding: 1rem; border-radius: 12px; 
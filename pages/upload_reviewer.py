@@ -5,8 +5,8 @@ OPTIMIZED: Lazy loading, cached queries
 
 import streamlit as st
 
-from components.auth import get_current_user
-from services.usage_tracker import get_cached_user_status, get_user_status
+from components.auth import get_current_user, set_current_page
+from services.usage_tracker import get_cached_user_status
 from config.settings import COLORS, PLAN_FREE, PLAN_PRO, PLAN_PREMIUM
 
 
@@ -22,9 +22,6 @@ def render_upload_page():
     
     # Use cached status - NO DB query
     status = get_cached_user_status()
-    if not status:
-        status = get_user_status(user)
-        st.session_state.user_status = status
     
     is_free_user = status["plan"] == PLAN_FREE
     
@@ -146,9 +143,7 @@ def render_free_user_upgrade_prompt():
     
     st.markdown("<br>", unsafe_allow_html=True)
     
-    if st.button("💳 Upgrade Now to Unlock All Features", key="upgrade_from_upload", use_container_width=True, type="primary"):
-        st.session_state.current_page = "upgrade"
-        st.rerun()
+    st.button("💳 Upgrade Now to Unlock All Features", key="upgrade_from_upload", use_container_width=True, type="primary", on_click=set_current_page, args=("upgrade",))
     
     st.markdown(f"""
     <p style="text-align: center; color: {COLORS['text_muted']}; margin-top: 1rem; font-size: 0.85rem;">
@@ -177,6 +172,9 @@ def render_user_documents_tab(email: str):
         if not valid:
             st.error(error_msg)
         else:
+            from utils.file_utils import get_file_type
+            file_type = get_file_type(uploaded_file.name)
+            
             st.markdown(f"""
             <div style="background: rgba(6, 182, 212, 0.1); padding: 1rem; border-radius: 12px;
                         border: 1px solid rgba(6, 182, 212, 0.3); margin: 1rem 0;">
@@ -192,14 +190,13 @@ def render_user_documents_tab(email: str):
                 
                 if upload_submit:
                     with st.spinner("Processing document..."):
-                        from services.document_processor import extract_text_from_file
+                        from services.document_processor import extract_text_from_bytes
                         from database.queries import save_user_document
                         from database.cached_queries import invalidate_user_docs_cache
                         
-                        success, extracted_text = extract_text_from_file(uploaded_file)
+                        success, extracted_text = extract_text_from_bytes(uploaded_file.getvalue(), file_type)
                     
                     # Always try to save the document, even if text extraction had issues
-                    file_type = uploaded_file.name.split('.')[-1].lower()
                     storage_path = f"@STAGE_USER_DOCS/{email}/{uploaded_file.name}"
                     
                     # Save with extracted text (may be placeholder text if extraction failed)
@@ -362,23 +359,23 @@ def render_admin_document_item(doc: dict, can_use: bool):
     if can_use and is_downloadable:
         col1, col2 = st.columns([3, 1])
         with col2:
-            # Only fetch content when download button is clicked
-            download_key = f"download_admin_{doc_id}"
-            if st.button("📥 Download", key=download_key, use_container_width=True):
+            # Only fetch content once download is requested; the bytes live in a
+            # shared cache, not in this session's state
+            ready_key = f"download_ready_{doc_id}"
+            if st.button("📥 Download", key=f"download_admin_{doc_id}", use_container_width=True):
+                st.session_state[ready_key] = True
+            
+            if st.session_state.get(ready_key):
                 from database.queries import get_admin_document_content
                 
                 with st.spinner("Preparing download..."):
                     doc_data = get_admin_document_content(doc_id)
                 
-                if doc_data and doc_data.get("content"):
-                    st.session_state[f"download_data_{doc_id}"] = doc_data
-                    st.rerun()
-                else:
+                if not doc_data or not doc_data.get("content"):
+                    st.session_state.pop(ready_key, None)
                     st.warning("File not available.")
-            
-            # Show actual download button if data is loaded
-            if f"download_data_{doc_id}" in st.session_state:
-                doc_data = st.session_state[f"download_data_{doc_id}"]
+                    return
+                
                 mime_types = {
                     "pdf": "application/pdf",
                     "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
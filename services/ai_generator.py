@@ -7,7 +7,7 @@ import json
 from typing import List, Dict, Optional
 import streamlit as st
 
-from config.settings import QUESTIONS_PER_BATCH, EXAM_COMPONENTS
+from config.settings import QUESTIONS_PER_BATCH, EXAM_COMPONENTS, AI_DOCUMENT_CONTEXT_CHARS
 
 
 # ============== LEPT BOARD EXAM FORMAT SPECIFICATIONS ==============
@@ -482,7 +482,7 @@ def generate_questions(
     doc_instruction = ""
     if document_text and len(document_text.strip()) > 200:
         from services.document_processor import truncate_text_for_ai
-        truncated = truncate_text_for_ai(document_text, max_chars=6000)
+        truncated = truncate_text_for_ai(document_text, max_chars=AI_DOCUMENT_CONTEXT_CHARS)
         doc_instruction = f"""
 UPLOADED DOCUMENT (Use ONLY if directly relevant to {exam_name}):
 {truncated}
@@ -9,6 +9,8 @@ from pathlib import Path
 
 import streamlit as st
 
+from utils.file_utils import get_file_type
+
 
 def extract_text_from_pdf(file_bytes: bytes) -> Tuple[bool, str]:
     """
@@ -195,18 +197,27 @@ def extract_text_from_file(uploaded_file) -> Tuple[bool, str]:
     if uploaded_file is None:
         return False, "No file provided"
     
-    filename = uploaded_file.name.lower()
-    file_bytes = uploaded_file.read()
-    
-    # Reset file pointer for potential reuse
-    uploaded_file.seek(0)
-    
-    if filename.endswith('.pdf'):
-        return extract_text_from_pdf(file_bytes)
-    elif filename.endswith('.docx'):
-        return extract_text_from_docx(file_bytes)
-    else:
+    # getvalue() returns the buffer without moving the read position
+    return extract_text_from_bytes(uploaded_file.getvalue(), get_file_type(uploaded_file.name))
+
+
+# file_type -> extractor; anything else is rejected before any parsing
+_EXTRACTORS = {
+    "pdf": extract_text_from_pdf,
+    "docx": extract_text_from_docx,
+}
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def extract_text_from_bytes(file_bytes: bytes, file_type: str) -> Tuple[bool, str]:
+    """
+    Extract text from PDF or DOCX bytes - CACHED by (content, file_type), so the
+    same file is parsed once even if the upload is submitted again.
+    """
+    extractor = _EXTRACTORS.get(file_type)
+    if extractor is None:
         return False, "Unsupported file format. Please upload a PDF or DOCX file."
+    return extractor(file_bytes)
 
 
 def clean_extracted_text(text: str) -> str:
@@ -10,7 +10,7 @@ from typing import Tuple, Optional
 import streamlit as st
 
 from config.settings import (
-    PLAN_PRO, PLAN_PREMIUM,
+    PLAN_PRO, PLAN_PREMIUM, PAID_PLANS,
     PRO_PRICE, PREMIUM_PRICE,
     PRO_QUESTION_BONUS, PREMIUM_DURATION_DAYS,
     PAYMENT_PENDING, PAYMENT_APPROVED, PAYMENT_REJECTED,
@@ -19,7 +19,7 @@ from config.settings import (
 from database.queries import (
     create_payment, get_user_payments, approve_payment, reject_payment,
     get_pending_payments, get_all_payments, update_user_plan,
-    log_admin_action, get_user_by_email
+    get_user_by_email
 )
 from utils.file_utils import encode_file_to_base64
 from utils.validators import validate_full_name, validate_email, validate_gcash_reference
@@ -59,7 +59,7 @@ def submit_payment_request(
         if not valid:
             return False, msg
     
-    if plan_requested not in [PLAN_PRO, PLAN_PREMIUM]:
+    if plan_requested not in PAID_PLANS:
         return False, "Invalid plan selected"
     
     # Process receipt file - store path for now (actual file storage in database)
@@ -118,11 +118,9 @@ def process_payment_approval(payment_id: int, payment_data: dict, admin_notes: s
         # Premium users get unlimited (high number for display)
         update_user_plan(email, PLAN_PREMIUM, 999999, new_expiry)
     
-    # Update payment status
-    approve_payment(payment_id, admin_notes, "admin")
-    
-    # Log action
-    log_admin_action("admin", ACTION_PAYMENT_APPROVED, f"Approved {plan_requested} for {email}")
+    # Update payment status - the audit row is written in the same statement
+    approve_payment(payment_id, admin_notes, "admin",
+                    audit=("admin", ACTION_PAYMENT_APPROVED, f"Approved {plan_requested} for {email}"))
     
     return True, f"Payment approved! User upgraded to {plan_requested}."
 
@@ -141,11 +139,9 @@ def process_payment_rejection(payment_id: int, payment_data: dict, admin_notes:
     """
     email = payment_data.get("email")
     
-    # Update payment status
-    reject_payment(payment_id, admin_notes, "admin")
-    
-    # Log action
-    log_admin_action("admin", ACTION_PAYMENT_REJECTED, f"Rejected payment for {email}: {admin_notes}")
+    # Update payment status - the audit row is written in the same statement
+    reject_payment(payment_id, admin_notes, "admin",
+                   audit=("admin", ACTION_PAYMENT_REJECTED, f"Rejected payment for {email}: {admin_notes}"))
     
     return True, "Payment rejected."
 
@@ -162,16 +158,18 @@ def get_user_payment_status(email: str) -> dict:
     """
     payments = get_user_payments(email)
     
-    pending = [p for p in payments if p.get("status") == PAYMENT_PENDING]
-    approved = [p for p in payments if p.get("status") == PAYMENT_APPROVED]
-    rejected = [p for p in payments if p.get("status") == PAYMENT_REJECTED]
+    # One pass over the payments instead of one filter per status
+    by_status = {PAYMENT_PENDING: [], PAYMENT_APPROVED: [], PAYMENT_REJECTED: []}
+    for p in payments:
+        by_status.setdefault(p.get("status"), []).append(p)
+    pending = by_status[PAYMENT_PENDING]
     
     return {
         "total_payments": len(payments),
         "pending_count": len(pending),
-        "approved_count": len(approved),
-        "rejected_count": len(rejected),
-        "has_pending": len(pending) > 0,
+        "approved_count": len(by_status[PAYMENT_APPROVED]),
+        "rejected_count": len(by_status[PAYMENT_REJECTED]),
+        "has_pending": bool(pending),
         "latest_pending": pending[0] if pending else None,
         "payments": payments
     }
@@ -9,13 +9,13 @@ from typing import Tuple, Optional
 import streamlit as st
 
 from config.settings import (
-    PLAN_FREE, PLAN_PRO, PLAN_PREMIUM,
+    PLAN_FREE, PLAN_PREMIUM, PAID_PLANS,
     FREE_QUESTION_LIMIT, PRO_QUESTION_BONUS, PREMIUM_DURATION_DAYS
 )
 from database.queries import (
-    get_user_by_email, get_fresh_user_by_email, create_user, update_user_ip,
-    decrement_user_questions, log_usage, check_premium_expiry,
-    update_user_plan, increment_ip_usage, is_ip_blocked
+    get_user_by_email, get_fresh_user_by_email, get_session_bootstrap, create_user, update_user_ip,
+    consume_user_questions, log_usage, check_premium_expiry,
+    update_user_plan, increment_ip_usage
 )
 from database.cached_queries import invalidate_user_cache
 from utils.ip_utils import get_client_ip
@@ -24,16 +24,21 @@ from utils.ip_utils import get_client_ip
 def get_or_create_user(email: str) -> Tuple[Optional[dict], str]:
     """
     Get existing user or create new one based on email and IP.
-    OPTIMIZED: Uses cached queries and stores result in session state.
+    OPTIMIZED: One bootstrap query (user + IP block + pending payment), stored in session state.
     """
     ip_address = get_client_ip()
     
-    # Check if IP is blocked (cached)
-    if is_ip_blocked(ip_address):
+    # User row, IP block flag and pending-payment flag in a single round-trip (cached)
+    bootstrap = get_session_bootstrap(email, ip_address)
+    
+    if bootstrap["ip_blocked"]:
         return None, "This IP address has been blocked. Please contact support."
     
-    # Check for existing user (cached)
-    existing_user = get_user_by_email(email)
+    # Home page reads this instead of querying payments on first load
+    st.session_state.has_pending_payment = bootstrap["has_pending_payment"]
+    st.session_state.payment_status_checked = True
+    
+    existing_user = bootstrap["user"]
     
     if existing_user:
         if existing_user.get("is_blocked"):
@@ -118,31 +123,26 @@ def use_questions(email: str, ip_address: str, count: int = 1,
     if not user:
         return False
     
-    # Log the usage
-    log_usage(email, ip_address, count, source_type, category, difficulty)
-    
-    # Increment IP usage
-    increment_ip_usage(ip_address, count)
-    
-    # Premium users don't decrement quota
+    # Premium users don't decrement quota - just log and count IP usage (queued)
     if user.get("plan_type") == PLAN_PREMIUM:
         expiry = user.get("premium_expiry")
         if expiry:
             if isinstance(expiry, str):
                 expiry = datetime.fromisoformat(expiry)
             if expiry > datetime.now():
+                log_usage(email, ip_address, count, source_type, category, difficulty)
+                increment_ip_usage(ip_address, count)
                 return True
     
-    # Decrement for Free and Pro users
-    result = decrement_user_questions(email, count)
+    # Free and Pro users: decrement, IP usage and usage log in one atomic statement
+    updated = consume_user_questions(email, ip_address, count, source_type, category, difficulty)
     
-    # Update session state with new questions remaining
-    if result and "user" in st.session_state:
-        current_remaining = st.session_state.user.get("questions_remaining", 0)
-        st.session_state.user["questions_remaining"] = max(0, current_remaining - count)
+    # Update session state with the quota the UPDATE returned
+    if updated and st.session_state.get("user"):
+        st.session_state.user.update(updated)
         st.session_state.user_status = get_user_status(st.session_state.user)
     
-    return result
+    return updated is not None
 
 
 def get_user_status(user: dict) -> dict:
@@ -192,17 +192,18 @@ def get_user_status(user: dict) -> dict:
         "questions_display": questions_display,
         "questions_used": questions_used,
         "expiry_display": expiry_display,
-        "can_use_admin_docs": plan_type in [PLAN_PRO, PLAN_PREMIUM]
+        "can_use_admin_docs": plan_type in PAID_PLANS
     }
 
 
 def get_cached_user_status() -> Optional[dict]:
     """
     Get user status from session state cache.
-    OPTIMIZED: No DB query, returns cached data.
+    OPTIMIZED: No DB query, computed at most once until the user changes.
     """
-    if "user_status" in st.session_state:
-        return st.session_state.user_status
+    status = st.session_state.get("user_status")
+    if status:
+        return status
     
     if "user" in st.session_state and st.session_state.user:
         status = get_user_status(st.session_state.user)
@@ -43,6 +43,11 @@ def get_file_extension(filename: str) -> str:
     return Path(filename).suffix.lower()
 
 
+def get_file_type(filename: str) -> str:
+    """Get the file type - the extension in lowercase, without the dot (e.g. "pdf")."""
+    return get_file_extension(filename).lstrip('.')
+
+
 def encode_file_to_base64(file_bytes: bytes) -> str:
     """Encode file bytes to base64 string for storage."""
     return base64.b64encode(file_bytes).decode('utf-8')